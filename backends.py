@@ -0,0 +1,50 @@
+"""
+File name: backends.py
+
+Description: Registry of language backends, keyed by file type ("py", "java", "xml").
+A backend is a function taking a file's SourceContext and returning
+(violations, function_count). Entries are "module:function" strings, imported when
+a file of that type is first checked, and each engine imports its rule set on first
+use. A pre-commit run over a single .py file therefore never loads the Java or XML
+engines, and starting the CLI loads no rules at all.
+"""
+
+import importlib
+from typing import Callable
+
+Backend = Callable[..., tuple[list[dict], int]]
+
+_BACKENDS: dict[str, str | Backend] = {
+    "py": "compliance_checker:python_backend",
+    "java": "compliance_checker:java_backend",
+    "xml": "compliance_checker:xml_backend",
+}
+_loaded: dict[str, Backend] = {}
+
+def register_backend(filetype: str, backend: str | Backend) -> None:
+    """
+    Register a backend for `filetype`, as a function or a lazily imported "module:function" string.
+    """
+    _BACKENDS[filetype] = backend
+    _loaded.pop(filetype, None)
+
+def get_backend(filetype: str) -> Backend | None:
+    """
+    The backend for `filetype`, importing it on first use, or None if the type is unsupported.
+    """
+    backend = _loaded.get(filetype)
+    if backend is None:
+        target = _BACKENDS.get(filetype)
+        if target is None:
+            return None
+        if isinstance(target, str):
+            module_name, _, function_name = target.partition(":")
+            target = getattr(importlib.import_module(module_name), function_name)
+        backend = _loaded[filetype] = target
+    return backend
+
+def loaded_backends() -> list[str]:
+    """
+    The file types whose backends have been imported so far.
+    """
+    return sorted(_loaded)
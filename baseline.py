@@ -0,0 +1,132 @@
+"""
+File name: baseline.py
+
+Description: Baseline (suppression) index for legacy violations.
+A baseline records a 64-bit fingerprint per known violation, hashed from its rule
+ID, its file path (relative to the baseline's directory) and the whitespace-
+normalized content of its line. Fingerprints do not include line numbers, so
+baselined violations stay suppressed when unrelated edits move them. Later runs look
+each violation up in O(1) and report only the ones that are new. The index is
+stored as a sorted array of fingerprints (8 bytes per violation), and a fingerprint
+appears once per occurrence, so a second copy of a baselined line is still reported.
+Lines that cannot be read back from disk (archive members such as "a.zip!x.py")
+are fingerprinted by line number instead. TIMEOUT results are never baselined.
+"""
+
+import hashlib
+import os
+import sys
+from array import array
+from collections import Counter
+
+from budget import TIMEOUT_ID
+
+MAGIC = b"CCBASELINE1\n"
+
+def normalize_line(text: str) -> str:
+    return " ".join(text.split())
+
+def fingerprint(rule_id: str, file_key: str, line_text: str) -> int:
+    data = f"{rule_id}\0{file_key}\0{normalize_line(line_text)}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+def _read_lines(file_path: str, wanted: set[int]) -> dict[int, str] | None:
+    """
+    Return {line number: text} for the `wanted` lines, reading the file only up to the last one,
+    or None if the file cannot be read.
+    """
+    found = {}
+    last = max(wanted, default=0)
+    if last < 1:
+        return found
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+            for lineno, text in enumerate(f, start=1):
+                if lineno in wanted:
+                    found[lineno] = text
+                if lineno >= last:
+                    break
+    except OSError:
+        return None
+    return found
+
+class BaselineIndex:
+    """
+    Fingerprint multiset for one baseline file. Paths are keyed relative to `root`
+    (the baseline file's directory), so the baseline is portable across checkouts.
+    With `record=True` every violation is added to the index and none are reported,
+    which is how a baseline is created or refreshed.
+    """
+
+    def __init__(self, root: str = ".", counts: Counter | None = None, record: bool = False):
+        self.root = os.path.abspath(root)
+        self.counts = counts if counts is not None else Counter()
+        self.record = record
+        self.suppressed = 0
+        self._remaining = Counter(self.counts)
+
+    @classmethod
+    def load(cls, path: str, record: bool = False) -> "BaselineIndex":
+        """
+        Load the baseline at `path`. A missing file gives an empty index; in record mode the old entries are dropped.
+        """
+        root = os.path.dirname(os.path.abspath(path))
+        if record or not os.path.exists(path):
+            return cls(root, record=record)
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not a compliance baseline file")
+        fingerprints = array("Q")
+        fingerprints.frombytes(data[len(MAGIC):])
+        if sys.byteorder == "big":
+            fingerprints.byteswap()
+        return cls(root, Counter(fingerprints))
+
+    def save(self, path: str) -> None:
+        fingerprints = array("Q", sorted(self.counts.elements()))
+        if sys.byteorder == "big":
+            fingerprints.byteswap()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(fingerprints.tobytes())
+        os.replace(tmp_path, path)
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def file_key(self, file_path: str) -> str:
+        return os.path.relpath(os.path.abspath(file_path), self.root).replace(os.sep, "/")
+
+    def filter_file(self, file_path: str, violations: list[dict]) -> list[dict]:
+        """
+        Return the violations of one file that are not in the baseline (none in record mode).
+        """
+        if not violations or (not self.record and not self._remaining):
+            return violations
+        key = self.file_key(file_path)
+        lines = _read_lines(file_path, {v.get("line", 0) for v in violations})
+
+        new = []
+        for v in violations:
+            if v["id"] == TIMEOUT_ID:
+                # A timeout says nothing about the code; recording it would hide later timeouts
+                if not self.record:
+                    new.append(v)
+                continue
+            line = v.get("line", 0)
+            if lines is None:
+                # Without the text, distinguish violations by line number rather than merge them all
+                text = f"\0line {line}" if line else ""
+            else:
+                text = lines.get(line, "")
+            fp = fingerprint(v["id"], key, text)
+            if self.record:
+                self.counts[fp] += 1
+            elif self._remaining[fp] > 0:
+                self._remaining[fp] -= 1
+                self.suppressed += 1
+            else:
+                new.append(v)
+        return new
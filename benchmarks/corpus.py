@@ -0,0 +1,131 @@
+"""
+File name: benchmarks/corpus.py
+
+Description: Deterministic synthetic corpora for the benchmark suite.
+Generates Python, Java and XML sources of a given size (files x lines) with a
+given violation density. The same seed always produces the same corpus, so
+timings from different runs are comparable.
+"""
+
+import os
+import random
+from dataclasses import asdict, dataclass
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """
+    files: files per language.
+    lines: approximate lines per file.
+    density: fraction (0-1) of generated units (functions, methods, dependencies) that break a rule.
+    seed: random seed; the same spec always yields the same corpus.
+    """
+    files: int = 20
+    lines: int = 300
+    density: float = 0.1
+    seed: int = 1234
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+def generate_python(rng: random.Random, lines: int, density: float) -> str:
+    out = ['"""Synthetic module."""', "import os", ""]
+    i = 0
+    while len(out) < lines:
+        bad = rng.random() < density
+        name = f"ComputeValue{i}" if bad and rng.random() < 0.5 else f"compute_value_{i}"
+        out.append(f"def {name}(a, b):")
+        if not (bad and rng.random() < 0.5):
+            out.append(f'    """Return a combination of a and b ({i})."""')
+        body = rng.randint(3, 12)
+        for j in range(body):
+            out.append(f"    a = a + b * {j}")
+        if bad:
+            out.append("    # TODO: tidy this up")
+            out.append("    print(a)")
+        out.append("    return a")
+        out.append("")
+        i += 1
+    out.append('if __name__ == "__main__":')
+    out.append("    compute_value_0(1, 2)")
+    return "\n".join(out) + "\n"
+
+def generate_java(rng: random.Random, lines: int, density: float, index: int = 0) -> str:
+    out = ["package com.example.synthetic;", ""]
+    out.append("import java.util.*;" if rng.random() < density else "import java.util.List;")
+    out.append("")
+    if rng.random() >= density:
+        out.append("/** Synthetic class. */")
+    out.append(f"public class Synthetic{index} {{")
+    i = 0
+    while len(out) < lines - 1:
+        bad = rng.random() < density
+        out.append("    /** Compute a value. */")
+        out.append(f"    public int compute{i}(int a, int b) {{")
+        for j in range(rng.randint(3, 12)):
+            out.append(f"        a = a + b * {j}; // step {j}")
+        if bad:
+            out.append('        System.out.println("value: " + a);')
+        out.append("        return a;")
+        out.append("    }")
+        out.append("")
+        i += 1
+    out.append("}")
+    return "\n".join(out) + "\n"
+
+def generate_xml(rng: random.Random, lines: int, density: float) -> str:
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        "<project>",
+        "  <groupId>com.example</groupId>",
+        "  <artifactId>synthetic</artifactId>",
+        "  <version>1.0.0</version>",
+        "  <name>Synthetic</name>",
+        "  <description>Synthetic benchmark project</description>",
+        "  <url>https://example.com/synthetic</url>",
+        "  <dependencies>",
+    ]
+    i = 0
+    previous = None
+    while len(out) < lines - 2:
+        bad = rng.random() < density
+        if bad and previous is not None and rng.random() < 0.5:
+            group, artifact = previous  # duplicate dependency
+        else:
+            group, artifact = f"org.example.lib{i % 7}", f"artifact-{i}"
+        version = "2.0-SNAPSHOT" if bad else f"1.{i % 10}.0"
+        out.append("    <dependency>")
+        out.append(f"      <groupId>{group}</groupId>")
+        out.append(f"      <artifactId>{artifact}</artifactId>")
+        out.append(f"      <version>{version}</version>")
+        out.append("    </dependency>")
+        previous = (group, artifact)
+        i += 1
+    out.append("  </dependencies>")
+    out.append("</project>")
+    return "\n".join(out) + "\n"
+
+def generate_corpus(spec: CorpusSpec) -> dict[str, list[str]]:
+    """
+    Return {"py": [...], "java": [...], "xml": [...]} source texts for `spec`.
+    """
+    rng = random.Random(spec.seed)
+    return {
+        "py": [generate_python(rng, spec.lines, spec.density) for _ in range(spec.files)],
+        "java": [generate_java(rng, spec.lines, spec.density, i) for i in range(spec.files)],
+        "xml": [generate_xml(rng, spec.lines, spec.density) for _ in range(spec.files)],
+    }
+
+def write_corpus(corpus: dict[str, list[str]], root: str) -> int:
+    """
+    Write `corpus` under `root` as one directory per language. Returns the number of files written.
+    """
+    written = 0
+    for filetype, sources in corpus.items():
+        directory = os.path.join(root, filetype)
+        os.makedirs(directory, exist_ok=True)
+        for i, source in enumerate(sources):
+            name = f"Synthetic{i}.java" if filetype == "java" else f"synthetic_{i}.{filetype}"
+            with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+                f.write(source)
+            written += 1
+    return written
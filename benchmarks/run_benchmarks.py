@@ -0,0 +1,166 @@
+"""
+File name: benchmarks/run_benchmarks.py
+
+Description: Performance regression suite for the rule engines.
+Times apply_python_compliance_rules, apply_java_compliance_rules,
+apply_xml_compliance_rules and the full check_compliance path over a synthetic
+corpus, records throughput (files/s, lines/s) and peak traced memory, and
+compares them against a JSON baseline. Exits with status 1 when any benchmark
+regresses beyond the threshold.
+
+    python benchmarks/run_benchmarks.py                    # compare with benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --update-baseline  # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.corpus import CorpusSpec, generate_corpus, write_corpus
+from compliance_checker import (apply_java_compliance_rules,
+                                apply_python_compliance_rules,
+                                apply_xml_compliance_rules)
+from main import check_compliance
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+RULE_ENGINES = {
+    "python_rules": ("py", apply_python_compliance_rules),
+    "java_rules": ("java", apply_java_compliance_rules),
+    "xml_rules": ("xml", apply_xml_compliance_rules),
+}
+
+def _measure(fn, repeat: int) -> tuple[float, int]:
+    """
+    Return the best wall time of `repeat` runs of `fn`, and its peak traced memory in bytes.
+    Memory is traced in a separate run so tracing does not slow the timed runs.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def _result(seconds: float, peak: int, files: int, lines: int) -> dict:
+    seconds = max(seconds, 1e-9)
+    return {
+        "seconds": round(seconds, 6),
+        "files_per_s": round(files / seconds, 2),
+        "lines_per_s": round(lines / seconds, 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+def run_benchmarks(spec: CorpusSpec, repeat: int = 3) -> dict:
+    """
+    Run every benchmark over the corpus for `spec` and return {"spec": ..., "results": {name: metrics}}.
+    """
+    corpus = generate_corpus(spec)
+    line_counts = {filetype: sum(s.count("\n") for s in sources) for filetype, sources in corpus.items()}
+    results = {}
+
+    for name, (filetype, engine) in RULE_ENGINES.items():
+        sources = corpus[filetype]
+        seconds, peak = _measure(lambda: [engine(source) for source in sources], repeat)
+        results[name] = _result(seconds, peak, len(sources), line_counts[filetype])
+
+    with tempfile.TemporaryDirectory() as root:
+        files = write_corpus(corpus, root)
+        seconds, peak = _measure(lambda: check_compliance(root, "summary"), repeat)
+        results["check_compliance"] = _result(seconds, peak, files, sum(line_counts.values()))
+
+    return {"spec": spec.to_dict(), "results": results}
+
+def compare_to_baseline(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """
+    Return a message for every metric that regressed by more than `threshold` (a fraction).
+    Throughput must not drop, and peak memory must not grow, beyond the threshold.
+    """
+    if current["spec"] != baseline["spec"]:
+        raise ValueError(
+            f"Corpus spec {current['spec']} does not match the baseline's {baseline['spec']}; "
+            "rerun with the baseline's settings or --update-baseline."
+        )
+
+    regressions = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        for metric in ("files_per_s", "lines_per_s"):
+            if now[metric] < base[metric] * (1 - threshold):
+                regressions.append(f"{name}: {metric} fell from {base[metric]} to {now[metric]}")
+        if now["peak_kb"] > base["peak_kb"] * (1 + threshold):
+            regressions.append(f"{name}: peak_kb grew from {base['peak_kb']} to {now['peak_kb']}")
+    return regressions
+
+def format_results(results: dict) -> str:
+    lines = [f"{'benchmark':<18} {'files/s':>12} {'lines/s':>14} {'peak KB':>10}"]
+    for name, r in results["results"].items():
+        lines.append(f"{name:<18} {r['files_per_s']:>12.1f} {r['lines_per_s']:>14.1f} {r['peak_kb']:>10.1f}")
+    return "\n".join(lines)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the compliance rule engines on a synthetic corpus.")
+    parser.add_argument("--files", type=int, default=CorpusSpec.files, help="Files per language")
+    parser.add_argument("--lines", type=int, default=CorpusSpec.lines, help="Approximate lines per file")
+    parser.add_argument("--density", type=float, default=CorpusSpec.density,
+                        help="Fraction of functions/methods/dependencies that violate a rule")
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed, help="Corpus random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (best is kept)")
+    parser.add_argument("--baseline", type=str, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed regression as a fraction. Default: {DEFAULT_THRESHOLD}")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--output", type=str, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(args.files, args.lines, args.density, args.seed)
+    current = run_benchmarks(spec, args.repeat)
+    print(format_results(current))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"\n✅ Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        # Recording a baseline here would let a fresh checkout pass without comparing anything
+        print(f"\n❌ No baseline at {args.baseline}; record one on this machine with --update-baseline")
+        return 1
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    try:
+        regressions = compare_to_baseline(current, baseline, args.threshold)
+    except ValueError as e:
+        parser.error(str(e))
+    if regressions:
+        print("\n❌ Performance regressions:")
+        for message in regressions:
+            print(f"- {message}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.threshold:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
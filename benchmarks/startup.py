@@ -0,0 +1,110 @@
+"""
+File name: benchmarks/startup.py
+
+Description: CLI startup-time benchmark.
+Imports main.py in fresh interpreters under `python -X importtime` and reports its
+cumulative import time (best of several runs), the slowest direct imports, and any
+module that should only be loaded on demand (language backends and their rule sets,
+asyncio, archive and process-pool modules) but was imported at startup. Exits with
+status 1 when startup exceeds the fixed budget or a lazy module is loaded eagerly.
+
+    python benchmarks/startup.py                  # check against STARTUP_BUDGET_MS
+    python benchmarks/startup.py --runs 10 --budget-ms 60
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STARTUP_BUDGET_MS = 90.0
+
+# Modules the CLI must not import before it sees a file that needs them
+LAZY_MODULES = (
+    "compliance_checker",
+    "config.python_guidelines",
+    "config.java_guidelines",
+    "config.xml_guidelines",
+    "rule_compiler",
+    "java_parser",
+    "asyncio",
+    "zipfile",
+    "tarfile",
+    "concurrent.futures",
+)
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """
+    Parse `-X importtime` output into (module, depth, self µs, cumulative µs) rows, in output order.
+    Depth 0 is a module imported directly by the -c code.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+def measure_startup(module: str = "main", runs: int = 5) -> dict:
+    """
+    Import `module` in `runs` fresh interpreters and return the best run as
+    {"module", "cumulative_ms", "slowest": [(name, ms), ...], "eager": [lazy modules imported]}.
+    """
+    best = None
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        rows = parse_importtime(completed.stderr)
+        total = next(cumulative for name, depth, _, cumulative in rows if name == module and depth == 0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+
+    total, rows = best
+    imported = {name for name, _, _, _ in rows}
+    children = sorted((row for row in rows if row[1] == 1), key=lambda row: row[3], reverse=True)
+    return {
+        "module": module,
+        "cumulative_ms": round(total / 1000, 2),
+        "slowest": [(name, round(cumulative / 1000, 2)) for name, _, _, cumulative in children[:10]],
+        "eager": [name for name in LAZY_MODULES if name in imported],
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure CLI startup (import) time with -X importtime.")
+    parser.add_argument("--module", type=str, default="main", help="Module to import. Default: main")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to run (best is kept)")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help=f"Maximum cumulative import time. Default: {STARTUP_BUDGET_MS}")
+    args = parser.parse_args()
+
+    result = measure_startup(args.module, args.runs)
+    print(f"import {result['module']}: {result['cumulative_ms']:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    print(f"\n{'slowest imports':<28} {'ms':>8}")
+    for name, ms in result["slowest"]:
+        print(f"{name:<28} {ms:>8.1f}")
+
+    failed = False
+    if result["eager"]:
+        print(f"\n❌ Imported at startup, should be lazy: {', '.join(result['eager'])}")
+        failed = True
+    if result["cumulative_ms"] > args.budget_ms:
+        print(f"\n❌ Startup {result['cumulative_ms']:.1f} ms exceeds the {args.budget_ms:.1f} ms budget")
+        failed = True
+    if failed:
+        return 1
+    print("\n✅ Startup within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
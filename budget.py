@@ -0,0 +1,100 @@
+"""
+File name: budget.py
+
+Description: Early-exit and per-file time budgets for CI gating.
+A CheckBudget stops a scan once `max_violations` have been reported (1 for
+--fail-fast), and `file_timeout` bounds the time spent evaluating rules on any
+one file. A file that runs over its budget is reported as a TIMEOUT violation and
+the scan moves on. The budget records what happened, so callers can turn it into
+an exit status.
+"""
+
+import signal
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+TIMEOUT_ID = "TIMEOUT"
+
+EXIT_OK = 0
+EXIT_VIOLATIONS = 1
+EXIT_TIMEOUT = 3
+
+class FileTimeout(Exception):
+    """
+    Rule evaluation for one file ran past its time budget.
+    """
+
+@dataclass
+class CheckBudget:
+    """
+    max_violations: stop the scan once this many violations have been reported (None = no limit).
+    file_timeout: seconds allowed for evaluating rules on one file (None = no limit).
+    The remaining fields are filled in as the scan runs.
+    """
+    max_violations: int | None = None
+    file_timeout: float | None = None
+    violations: int = 0
+    stopped: bool = False
+    timed_out: list[str] = field(default_factory=list)
+
+    def spend(self, file_path: str, violations: list[dict]) -> list[dict]:
+        """
+        Account for one file's violations and return the ones that fit in the remaining budget.
+        Sets `stopped` once `max_violations` is reached. TIMEOUT entries are recorded, not counted.
+        """
+        if any(v["id"] == TIMEOUT_ID for v in violations):
+            self.timed_out.append(file_path)
+        if self.max_violations is not None:
+            kept, counted = [], 0
+            for v in violations:
+                if v["id"] != TIMEOUT_ID:
+                    if self.violations + counted >= self.max_violations:
+                        break
+                    counted += 1
+                kept.append(v)
+            violations = kept
+        else:
+            counted = sum(v["id"] != TIMEOUT_ID for v in violations)
+        self.violations += counted
+        if self.max_violations is not None and self.violations >= self.max_violations:
+            self.stopped = True
+        return violations
+
+    def exit_code(self) -> int:
+        """
+        1 if any violation was found, else 3 if a file could not be checked in time, else 0.
+        """
+        if self.violations:
+            return EXIT_VIOLATIONS
+        if self.timed_out:
+            return EXIT_TIMEOUT
+        return EXIT_OK
+
+def timeout_violation(timeout: float) -> dict:
+    return {
+        "id": TIMEOUT_ID,
+        "message": f"Checking stopped after the {timeout:g}s --file-timeout; the file was not fully checked.",
+        "line": 0,
+    }
+
+def _raise_timeout(signum, frame):
+    raise FileTimeout()
+
+@contextmanager
+def time_limit(seconds: float | None):
+    """
+    Raise FileTimeout in the block after `seconds`, using SIGALRM.
+    The limit only applies on platforms with setitimer and in a process's main thread
+    (serial runs and --jobs workers); elsewhere the block runs unbounded.
+    """
+    if not seconds or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -0,0 +1,211 @@
+"""
+File name: cache.py
+
+Description: Persistent on-disk cache of per-file check results.
+Results are keyed by the file content hash, the rule-set version and a fingerprint
+of the rule sources, so unchanged files are never re-checked between runs.
+The cache is a single SQLite file with size-bounded LRU eviction.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+RULESET_VERSION = "1"
+DEFAULT_CACHE_DIR = ".compliance_cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_FILENAME = "results.sqlite"
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_rules_fingerprint = None
+
+def rules_fingerprint() -> str:
+    """
+    Hash of the rule-set version, the source of every checker module and the declarative rule files.
+    Editing a rule or the engines invalidates all cached results.
+    """
+    global _rules_fingerprint
+    if _rules_fingerprint is None:
+        digest = hashlib.sha256(RULESET_VERSION.encode())
+        sources = sorted(glob.glob(os.path.join(_BASE_DIR, "*.py")))
+        sources += sorted(glob.glob(os.path.join(_BASE_DIR, "config", "*.py")))
+        sources += sorted(glob.glob(os.path.join(_BASE_DIR, "config", "*.json")))
+        for source in sources:
+            digest.update(os.path.relpath(source, _BASE_DIR).encode())
+            with open(source, "rb") as f:
+                digest.update(f.read())
+        _rules_fingerprint = digest.hexdigest()
+    return _rules_fingerprint
+
+def _key_digest(filetype: str):
+    digest = hashlib.sha256(rules_fingerprint().encode())
+    digest.update(filetype.encode())
+    digest.update(b"\0")
+    return digest
+
+def make_cache_key(content: bytes, filetype: str) -> str:
+    digest = _key_digest(filetype)
+    digest.update(content)
+    return digest.hexdigest()
+
+def make_file_cache_key(file_path: str, filetype: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Same key as make_cache_key() on the file's bytes, hashed in chunks.
+    """
+    digest = _key_digest(filetype)
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ResultCache:
+    """
+    SQLite-backed map of cache key -> (violations, function_count).
+    Safe to open from several worker processes at once.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, CACHE_FILENAME)
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used)")
+
+    def get(self, key: str) -> tuple[list[dict], int] | None:
+        row = self._conn.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        payload = json.loads(row[0])
+        return payload["violations"], payload["function_count"]
+
+    def put(self, key: str, violations: list[dict], function_count: int) -> None:
+        payload = json.dumps({"violations": violations, "function_count": function_count})
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (key, payload, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, payload, len(payload), time.time()),
+        )
+
+    def evict(self) -> int:
+        """
+        Drop least recently used entries until the stored payloads fit in max_bytes.
+        Returns the number of entries removed.
+        """
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM results WHERE key = ?", stale)
+        return len(stale)
+
+    def close(self) -> None:
+        self._conn.close()
+
+_open_caches = threading.local()
+
+def get_cache(cache_dir: str) -> ResultCache:
+    """
+    Return this thread's connection to the cache in `cache_dir`, opening it on first use.
+    SQLite connections cannot be shared between threads, so each thread gets its own.
+    """
+    caches = getattr(_open_caches, "by_dir", None)
+    if caches is None:
+        caches = _open_caches.by_dir = {}
+    cache = caches.get(cache_dir)
+    if cache is None:
+        cache = caches[cache_dir] = ResultCache(cache_dir)
+    return cache
+
+def close_thread_caches() -> None:
+    """
+    Close this thread's cache connections, e.g. at the end of a server request thread.
+    """
+    caches = getattr(_open_caches, "by_dir", None) or {}
+    for cache in caches.values():
+        cache.close()
+    caches.clear()
+
+class MemoryResultCache:
+    """
+    Bounded, thread-safe in-process LRU of results for long-running processes.
+    Entries are keyed by content cache key; a per-path (mtime, size) index lets
+    unchanged files be answered without even reading them.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._results: OrderedDict[str, tuple[tuple[dict, ...], int]] = OrderedDict()
+        self._stats: OrderedDict[str, tuple[tuple[int, int], str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def stat_key(file_path: str) -> tuple[int, int] | None:
+        """
+        The (mtime, size) key of `file_path`. Take it before reading the file, so a save during
+        the check leaves the entry pointing at the older stat.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def get(self, key: str) -> tuple[list[dict], int] | None:
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+            self._results.move_to_end(key)
+        violations, function_count = entry
+        # Copies, since callers tag violations with their own file path
+        return [dict(v) for v in violations], function_count
+
+    def get_by_stat(self, file_path: str, stat_key: tuple[int, int] | None) -> tuple[list[dict], int] | None:
+        with self._lock:
+            entry = self._stats.get(file_path)
+        if stat_key is None or entry is None or entry[0] != stat_key:
+            return None
+        return self.get(entry[1])
+
+    def put(
+        self,
+        key: str,
+        violations: list[dict],
+        function_count: int,
+        file_path: str | None = None,
+        stat_key: tuple[int, int] | None = None,
+    ) -> None:
+        """
+        Store a result under its content `key`; with `file_path` and the `stat_key` taken before
+        the file was read, also answer get_by_stat for that path until the file changes.
+        """
+        stored = tuple({k: v for k, v in violation.items() if k != "file"} for violation in violations)
+        if file_path is None:
+            stat_key = None
+        with self._lock:
+            self._results[key] = (stored, function_count)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+            if stat_key is not None:
+                self._stats[file_path] = (stat_key, key)
+                self._stats.move_to_end(file_path)
+                while len(self._stats) > self.max_entries:
+                    self._stats.popitem(last=False)
@@ -1,103 +1,231 @@
 import ast
-import xml.etree.ElementTree as ET
-from config.python_guidelines import NODE_LEVEL_RULES, TREE_LEVEL_RULES
-from config.java_guidelines import JAVA_NODE_LEVEL_RULES, JAVA_TREE_LEVEL_RULES
-from config.xml_guidelines import XML_TREE_LEVEL_RULES, XML_NODE_LEVEL_RULES
+import time
+from functools import lru_cache
+from xml.parsers.expat import ExpatError
+import profiling
+from prefilter import Prefilter, selected
+from source_context import SourceContext, as_source_context
+from xml_stream import scan_xml
 
-def apply_python_compliance_rules(code: str) -> list[dict]:
+def _build_node_dispatch(rules: list[dict]) -> tuple[dict[type, list[dict]], list[dict]]:
+    """
+    Index node-level rules by the AST node types they declare.
+    Rules without "node_types" are returned separately and see every node.
+    """
+    dispatch: dict[type, list[dict]] = {}
+    catch_all = []
+    for rule in rules:
+        node_types = rule.get("node_types")
+        if not node_types:
+            catch_all.append(rule)
+            continue
+        for node_type in node_types:
+            dispatch.setdefault(node_type, []).append(rule)
+    return dispatch, catch_all
+
+# Each language's rule set is imported on first use (see backends.py)
+
+@lru_cache(maxsize=None)
+def _python_rules() -> tuple[list[dict], list[dict], Prefilter]:
+    from config.python_guidelines import NODE_LEVEL_RULES, TREE_LEVEL_RULES
+    return TREE_LEVEL_RULES, NODE_LEVEL_RULES, Prefilter(TREE_LEVEL_RULES + NODE_LEVEL_RULES)
+
+@lru_cache(maxsize=None)
+def _java_rules() -> tuple[list, Prefilter]:
+    from config.java_guidelines import JAVA_RULES
+    return JAVA_RULES, Prefilter(JAVA_RULES)
+
+@lru_cache(maxsize=None)
+def _xml_rules() -> tuple[list, Prefilter]:
+    from config.xml_guidelines import XML_RULES
+    return XML_RULES, Prefilter(XML_RULES)
+
+@lru_cache(maxsize=128)
+def _python_plan(found: frozenset) -> tuple[list[dict], dict[type, list[dict]], list[dict]]:
+    """
+    (tree-level rules, node dispatch, catch-all node rules) for a file containing the triggers in `found`.
+    """
+    tree_rules, node_rules, _ = _python_rules()
+    selected_tree_rules = [rule for rule in tree_rules if selected(rule, found)]
+    return (selected_tree_rules, *_build_node_dispatch([rule for rule in node_rules if selected(rule, found)]))
+
+def _collect_rule_results(rule: dict, raw_results, violations: list[dict]) -> None:
+    for res in raw_results:
+        rule_id = rule["id"]
+        if isinstance(res, tuple):
+            line, message = res
+        elif isinstance(res, dict):
+            # Compiled pattern rules report several rule ids through one checker
+            line = res.get("line", 0)
+            message = res.get("message", rule["description"])
+            rule_id = res.get("id", rule["id"])
+        else:
+            continue
+
+        violations.append({
+            "id": rule_id,
+            "message": message,
+            "line": line,
+        })
+
+def _run_rule(rule: dict, target: ast.AST, ctx: SourceContext, violations: list[dict], timings: profiling.RuleTimings | None) -> None:
+    # ctx is keyword-only in rule signatures so rule-specific options can stay positional
+    if timings is None:
+        _collect_rule_results(rule, rule["check"](target, ctx=ctx), violations)
+        return
+    before = len(violations)
+    wall, cpu = time.perf_counter(), time.thread_time()
+    _collect_rule_results(rule, rule["check"](target, ctx=ctx), violations)
+    timings.add(rule["id"], time.perf_counter() - wall, time.thread_time() - cpu, len(violations) - before)
+
+def apply_python_compliance_rules(code: str | SourceContext) -> list[dict]:
+    ctx = as_source_context(code, "py")
     try:
-        tree = ast.parse(code)
+        tree = ctx.tree
     except SyntaxError as e:
         return [{"id": "SYNTAX", "message": f"SyntaxError: {e}", "line": 0}]
 
     violations = []
+    timings = None
+    if profiling.enabled():
+        timings = profiling.RuleTimings(ctx.path)
+        ctx.tokens  # tokenize up front so comment rules are not charged for it
+
+    # Only the rules whose trigger bytes occur in the file can report anything
+    tree_rules, node_dispatch, catch_all = _python_plan(_python_rules()[2].scan(ctx.raw))
 
     # Tree-level rules
-    for rule in TREE_LEVEL_RULES:
-        raw_results = rule["check"](tree)
-        for res in raw_results:
-            if isinstance(res, tuple):
-                line, message = res
-            elif isinstance(res, dict):
-                line = res.get("line", 0)
-                message = res.get("message", rule["description"])
-            else:
-                continue
-
-            violations.append({
-                "id": rule["id"],
-                "message": message,
-                "line": line,
-            })
-
-    # Node-level rules
-    for node in ast.walk(tree):
-        for rule in NODE_LEVEL_RULES:
-            raw_results = rule["check"](node)
-            for res in raw_results:
-                if isinstance(res, tuple):
-                    line, message = res
-                elif isinstance(res, dict):
-                    line = res.get("line", 0)
-                    message = res.get("message", rule["description"])
-                else:
-                    continue
-
-                violations.append({
-                    "id": rule["id"],
-                    "message": message,
-                    "line": line,
-                })
-                
+    for rule in tree_rules:
+        _run_rule(rule, tree, ctx, violations, timings)
+
+    # Node-level rules: a single walk, each node only goes to the rules registered for its type
+    if node_dispatch or catch_all:
+        for node in ast.walk(tree):
+            for rule in node_dispatch.get(type(node), ()):
+                _run_rule(rule, node, ctx, violations, timings)
+            for rule in catch_all:
+                _run_rule(rule, node, ctx, violations, timings)
+
+    if timings is not None:
+        timings.emit()
     return violations
 
-def apply_java_compliance_rules(code: str) -> list[dict]:
+def apply_java_compliance_rules(code: str | SourceContext) -> list[dict]:
+    # Every rule reads the same memoized token stream and index
+    ctx = as_source_context(code, "java")
     violations = []
+    if profiling.enabled():
+        ctx.java_index  # parse up front so the first rule is not charged for it
 
-    for rule_fn in JAVA_TREE_LEVEL_RULES:
-        results = rule_fn(code)
-        for line, message in results:
-            violations.append({
-                "id": rule_fn.__name__,
-                "message": message,
-                "line": line,
-            })
-
-    for rule_fn in JAVA_NODE_LEVEL_RULES:
-        results = rule_fn(code)
-        for line, message in results:
-            violations.append({
-                "id": rule_fn.__name__,
-                "message": message,
-                "line": line,
-            })
+    _, prefilter = _java_rules()
+    for rule_fn in prefilter.select(prefilter.scan(ctx.raw)):
+        # Java rules are plain functions; the function name is the rule id
+        rule = {"id": rule_fn.__name__, "description": rule_fn.__doc__ or ""}
+        with profiling.timed(ctx.path, "rule", rule["id"]) as timer:
+            before = len(violations)
+            _collect_rule_results(rule, rule_fn(ctx), violations)
+            if timer is not None:
+                timer.violations = len(violations) - before
 
     return violations
 
-def apply_xml_compliance_rules(code: str) -> list[dict]:
+def apply_xml_compliance_rules(code: str | SourceContext) -> list[dict]:
+    ctx = as_source_context(code, "xml")
+    _, prefilter = _xml_rules()
+    # Streamed documents are searched through a memory map instead of being read into memory
+    if ctx.path is not None and "text" not in ctx.__dict__ and "raw" not in ctx.__dict__:
+        found = prefilter.scan_file(ctx.path)
+    else:
+        found = prefilter.scan(ctx.raw)
+    return apply_xml_compliance_rules_stream(ctx.iter_chunks(), ctx.path, prefilter.select(found))
+
+class _TimedXmlRule:
+    """
+    Forwards expat callbacks to an XmlRule, adding the time spent in it to `timings`.
+    """
+
+    def __init__(self, rule, timings: profiling.RuleTimings):
+        self.rule = rule
+        self.timings = timings
+
+    def _call(self, method: str, *args):
+        wall, cpu = time.perf_counter(), time.thread_time()
+        results = getattr(self.rule, method)(*args)
+        self.timings.add(self.rule.id, time.perf_counter() - wall, time.thread_time() - cpu, len(results))
+        return results
+
+    def start(self, path, attrs, line):
+        return self._call("start", path, attrs, line)
+
+    def end(self, path, text, line):
+        return self._call("end", path, text, line)
+
+    def check_line(self, lineno, line):
+        return self._call("check_line", lineno, line)
+
+    def finish(self):
+        return self._call("finish")
+
+def _timed_chunks(chunks, timings: profiling.RuleTimings):
+    chunks = iter(chunks)
+    while True:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        chunk = next(chunks, None)
+        timings.add("read", time.perf_counter() - wall, time.thread_time() - cpu, 0, kind="io")
+        if chunk is None:
+            return
+        yield chunk
+
+def _scan_xml_profiled(chunks, rules, file_path: str | None):
+    """
+    scan_xml with rule callbacks and chunk reads timed; the remainder is charged to expat parsing.
+    """
+    timings = profiling.RuleTimings(file_path)
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        return scan_xml(_timed_chunks(chunks, timings), [_TimedXmlRule(rule, timings) for rule in rules])
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+        for _, rule_wall, rule_cpu, _ in timings.totals.values():
+            wall -= rule_wall
+            cpu -= rule_cpu
+        timings.add("expat", wall, cpu, 0, kind="parse")
+        timings.emit()
+
+def apply_xml_compliance_rules_stream(chunks, file_path: str | None = None, rule_classes=None) -> list[dict]:
+    """
+    Check an XML document given as an iterable of text chunks, in constant memory.
+    `rule_classes` defaults to every XML rule; the document is still parsed to report syntax errors.
+    """
+    rules = [rule_cls() for rule_cls in (_xml_rules()[0] if rule_classes is None else rule_classes)]
+    try:
+        if profiling.enabled():
+            results = _scan_xml_profiled(chunks, rules, file_path)
+        else:
+            results = scan_xml(chunks, rules)
+    except ExpatError as e:
+        return [{"id": "XML_SYNTAX", "message": f"XML ParseError: {e}", "line": e.lineno}]
+
     violations = []
+    for rule, rule_results in zip(rules, results):
+        _collect_rule_results({"id": rule.id, "description": rule.description}, rule_results, violations)
+
+    return violations
 
+def _count_python_functions(ctx: SourceContext) -> int:
     try:
-        tree = ET.ElementTree(ET.fromstring(code))
-    except ET.ParseError as e:
-        return [{"id": "XML_SYNTAX", "message": f"XML ParseError: {e}", "line": 0}]
-
-    for rule_fn in XML_TREE_LEVEL_RULES:
-        results = rule_fn(tree)
-        for line, message in results:
-            violations.append({
-                "id": rule_fn.__name__,
-                "message": message,
-                "line": line,
-            })
-
-    for rule_fn in XML_NODE_LEVEL_RULES:
-        results = rule_fn(code)
-        for line, message in results:
-            violations.append({
-                "id": rule_fn.__name__,
-                "message": message,
-                "line": line,
-            })
-
-    return violations
\ No newline at end of file
+        tree = ctx.tree
+    except SyntaxError:
+        return ctx.text.count("def ")
+    return sum(isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) for node in ast.walk(tree))
+
+# Language backends, registered by name in backends.py: (violations, function count) per file
+
+def python_backend(ctx: SourceContext) -> tuple[list[dict], int]:
+    return apply_python_compliance_rules(ctx), _count_python_functions(ctx)
+
+def java_backend(ctx: SourceContext) -> tuple[list[dict], int]:
+    return apply_java_compliance_rules(ctx), len(ctx.java_index.methods)
+
+def xml_backend(ctx: SourceContext) -> tuple[list[dict], int]:
+    return apply_xml_compliance_rules(ctx), 1
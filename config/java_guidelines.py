@@ -2,91 +2,104 @@
 File name: config/java_guidelines.py
 
 Description: Defines compliance rules for internal coding standards.
-Each rule is a dictionary containing an ID, description, and AST-based checker function.
+Each rule is a function over the file's SourceContext: the engine in
+compliance_checker.py passes one context per file, whose memoized java_index
+(java_parser.parse_java()) holds the token stream and structural index (package,
+imports, classes, methods), so rules never rescan the raw text.
+Rules also accept raw source or a JavaIndex for convenience.
+Rules decorated with @triggers only run on files containing one of the given
+byte strings (see prefilter.py).
 """
 
-JAVA_TREE_LEVEL_RULES = []
-JAVA_NODE_LEVEL_RULES = []
+from config.pattern_rules import PATTERN_RULES
+from java_parser import JavaIndex, parse_java
+from prefilter import triggers
+from source_context import SourceContext
 
-def java_rule_uses_logger(java_code: str) -> list[tuple[int, str]]:
+JAVA_RULES = []
+
+JavaSource = str | JavaIndex | SourceContext
+
+def _as_index(source: JavaSource) -> JavaIndex:
+    if isinstance(source, SourceContext):
+        return source.java_index
+    return source if isinstance(source, JavaIndex) else parse_java(source)
+
+@triggers(b"println")
+def java_rule_uses_logger(source: JavaSource) -> list[tuple[int, str]]:
     """
     Ensure that the code uses a logger instead of System.out.println().
     """
+    tokens = _as_index(source).code_tokens
     violations = []
-    for i, line in enumerate(java_code.splitlines(), 1):
-        if "System.out.println" in line:
-            violations.append((i, "Avoid using System.out.println(); use a logger instead."))
+    for i in range(len(tokens) - 4):
+        if (
+            tokens[i].value == "System"
+            and tokens[i + 1].value == "."
+            and tokens[i + 2].value == "out"
+            and tokens[i + 3].value == "."
+            and tokens[i + 4].value == "println"
+        ):
+            violations.append((tokens[i].line, "Avoid using System.out.println(); use a logger instead."))
     return violations
 
-def java_rule_class_javadoc(java_code: str) -> list[tuple[int, str]]:
+@triggers(b"class")
+def java_rule_class_javadoc(source: JavaSource) -> list[tuple[int, str]]:
     """
-    Ensure every class has a Javadoc comment within the 3 lines above it.
+    Ensure every class has a Javadoc comment before its declaration.
     """
-    violations = []
-    lines = java_code.splitlines()
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped.startswith("public class") or stripped.startswith("class"):
-            has_javadoc = False
-            # Look back up to 3 lines before class
-            for j in range(max(i - 3, 0), i):
-                if lines[j].strip().startswith("/**"):
-                    has_javadoc = True
-                    break
-            if not has_javadoc:
-                violations.append((i + 1, "Missing Javadoc comment before class declaration."))
-    return violations
+    return [
+        (cls.line, "Missing Javadoc comment before class declaration.")
+        for cls in _as_index(source).classes
+        if cls.kind == "class" and not cls.has_javadoc
+    ]
 
-def java_rule_no_wildcard_imports(java_code: str) -> list[tuple[int, str]]:
+@triggers(b"import")
+def java_rule_no_wildcard_imports(source: JavaSource) -> list[tuple[int, str]]:
     """
     Disallow wildcard imports like import java.util.*;
     """
-    violations = []
-    for i, line in enumerate(java_code.splitlines(), 1):
-        if "import " in line and "*" in line:
-            violations.append((i, "Avoid using wildcard imports."))
-    return violations
+    return [(imp.line, "Avoid using wildcard imports.") for imp in _as_index(source).imports if imp.wildcard]
 
-def java_rule_package_declaration_present(java_code: str) -> list[tuple[int, str]]:
+def java_rule_package_declaration_present(source: JavaSource) -> list[tuple[int, str]]:
     """
     Ensure that the package declaration is present.
     """
-    if not any(line.strip().startswith("package ") for line in java_code.splitlines()):
+    if _as_index(source).package is None:
         return [(1, "Missing package declaration.")]
     return []
 
-def java_rule_method_length_limit(java_code: str) -> list[tuple[int, str]]:
+def java_rule_method_length_limit(source: JavaSource, max_lines: int = 50) -> list[tuple[int, str]]:
     """
-    Warn if any method is longer than 50 lines.
+    Warn if any method or constructor is longer than 50 lines.
     """
-    violations = []
-    lines = java_code.splitlines()
-    in_method = False
-    start_line = 0
-    brace_count = 0
-
-    for i, line in enumerate(lines):
-        if (" void " in line or " int " in line or " String " in line) and ("(" in line and ")" in line) and "{" in line:
-            in_method = True
-            start_line = i
-            brace_count = line.count("{") - line.count("}")
+    return [
+        (method.line, f"Method exceeds {max_lines} lines. Consider refactoring.")
+        for method in _as_index(source).methods
+        if method.end_line - method.line > max_lines
+    ]
 
-        elif in_method:
-            brace_count += line.count("{") - line.count("}")
-            if brace_count <= 0:
-                in_method = False
-                if i - start_line > 50:
-                    violations.append((start_line + 1, "Method exceeds 50 lines. Consider refactoring."))
+def java_pattern_rules(source: JavaSource) -> list[dict]:
+    """
+    Declarative forbidden-call, naming and forbidden-line rules from config/pattern_rules.json.
+    """
+    if isinstance(source, SourceContext):
+        lines = source.lines
+    elif isinstance(source, str):
+        lines = source.splitlines()
+    else:
+        lines = ()  # a bare JavaIndex has no text for line rules
+    return PATTERN_RULES.check_java(_as_index(source), lines)
 
-    return violations
+java_pattern_rules.triggers = PATTERN_RULES.triggers("java")
 
-JAVA_NODE_LEVEL_RULES.extend([
+# Register rules (file-level rules first, matching the report order)
+JAVA_RULES.extend([
+    java_rule_package_declaration_present,
+    java_rule_method_length_limit,
     java_rule_uses_logger,
     java_rule_no_wildcard_imports,
     java_rule_class_javadoc,
 ])
-
-JAVA_TREE_LEVEL_RULES.extend([
-    java_rule_package_declaration_present,
-    java_rule_method_length_limit,
-])
\ No newline at end of file
+if PATTERN_RULES.has_rules("java"):
+    JAVA_RULES.append(java_pattern_rules)
@@ -0,0 +1,18 @@
+"""
+File name: config/pattern_rules.py
+
+Description: Loads the declarative pattern rules in config/pattern_rules.json and
+compiles them once at import. python_guidelines.py, java_guidelines.py and
+xml_guidelines.py register the compiled checkers alongside their hand-written rules.
+The file ships empty; config/pattern_rules.example.json holds sample rules (eval/exec,
+os.system, hard-coded credentials, System.exit, ...) to copy into it. It is never loaded.
+"""
+
+import os
+
+from rule_compiler import compile_rules, load_rules
+
+PATTERN_RULES_PATH = os.path.join(os.path.dirname(__file__), "pattern_rules.json")
+EXAMPLE_RULES_PATH = os.path.join(os.path.dirname(__file__), "pattern_rules.example.json")
+
+PATTERN_RULES = compile_rules(load_rules(PATTERN_RULES_PATH))
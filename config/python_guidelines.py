@@ -3,24 +3,39 @@ File name: config/python_guidelines.py
 
 Description: Defines compliance rules for internal coding standards.
 Each rule is a dictionary containing an ID, description, and AST-based checker function.
+
+Tree-level rules receive the parsed module once. Node-level rules receive a single
+node and declare the node types they care about under "node_types"; the engine in
+compliance_checker.py walks the tree once and only dispatches matching nodes to them.
+A node-level rule without "node_types" is called for every node.
+
+Every rule is also passed the file's SourceContext as `ctx`, for memoized views such
+as lines, tokens and comments that the AST does not carry.
+
+A rule may list "triggers", byte strings one of which must occur in the file for the
+rule to fire; files without any of them skip the rule (see prefilter.py).
 """
 
 import ast
 from typing import Callable
 
+from config.pattern_rules import PATTERN_RULES
+from source_context import SourceContext
+
 TREE_LEVEL_RULES = []
 NODE_LEVEL_RULES = []
 
 ComplianceRule = dict[str, str | Callable[[ast.FunctionDef], list[str]]]
 
-def rule_no_print_statements(tree: ast.AST) -> list[tuple[int, str]]:
-    violations = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'print':
-            violations.append((node.lineno, "Avoid using print statements."))
-    return violations
+def rule_no_print_statements(node: ast.AST, *, ctx: SourceContext | None = None) -> list[tuple[int, str]]:
+    """
+    Flags calls to the builtin print().
+    """
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'print':
+        return [(node.lineno, "Avoid using print statements.")]
+    return []
 
-def rule_has_main_check(tree: ast.AST) -> list[tuple[int, str]]:
+def rule_has_main_check(tree: ast.AST, *, ctx: SourceContext | None = None) -> list[tuple[int, str]]:
     """
     Ensures that the script has an `if __name__ == '__main__'` guard.
     """
@@ -31,14 +46,20 @@ def rule_has_main_check(tree: ast.AST) -> list[tuple[int, str]]:
                 return []
     return [(0, "Missing 'if __name__ == \"__main__\"' guard.")]
 
-def rule_todo_comments(_: ast.AST) -> list[tuple[int, str]]:
+def rule_todo_comments(tree: ast.AST, *, ctx: SourceContext | None = None) -> list[tuple[int, str]]:
     """
-    Placeholder rule: AST doesn't preserve comments.
-    Needs implementation via raw source inspection.
+    Flags TODO comments. The AST doesn't preserve comments, so this reads the
+    comment list from the shared SourceContext token stream.
     """
-    return []
+    if ctx is None:
+        return []
+    return [
+        (line, "Avoid TODO comments; track the work in an issue instead.")
+        for line, comment in ctx.comments
+        if "TODO" in comment
+    ]
 
-def rule_function_names_snake_case(node: ast.AST) -> list[tuple[int, str]]:
+def rule_function_names_snake_case(node: ast.AST, *, ctx: SourceContext | None = None) -> list[tuple[int, str]]:
     """
     Ensures that function names are written in snake_case.
     """
@@ -48,28 +69,27 @@ def rule_function_names_snake_case(node: ast.AST) -> list[tuple[int, str]]:
             return [(node.lineno, f"Function '{name}' should be in snake_case.")]
     return []
 
-def rule_limit_function_length(tree: ast.AST, max_lines: int = 50) -> list[tuple[int, str]]:
+def rule_limit_function_length(node: ast.AST, max_lines: int = 50, *, ctx: SourceContext | None = None) -> list[tuple[int, str]]:
     """
     Ensures that functions do not exceed a specified number of lines.
 
     Args:
-        tree (ast.AST): The abstract syntax tree of the code.
+        node (ast.AST): A function definition node.
+        ctx (SourceContext | None): The file's shared source views (unused).
         max_lines (int): Maximum allowed lines per function.
 
     Returns:
-        list[str]: List of violation messages, if any.
+        list[tuple[int, str]]: List of (line, message) violations, if any.
     """
-    violations = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            start_line = node.lineno
-            end_line = getattr(node, 'end_lineno', start_line + 1)
-            length = end_line - start_line + 1
-            if length > max_lines:
-                violations.append((node.lineno, f"Function '{node.name}' is too long ({length} lines > {max_lines})."))
-    return violations
-
-def rule_function_missing_docstring(node: ast.AST) -> list[tuple[int, str]]:
+    if isinstance(node, ast.FunctionDef):
+        start_line = node.lineno
+        end_line = getattr(node, 'end_lineno', start_line + 1)
+        length = end_line - start_line + 1
+        if length > max_lines:
+            return [(node.lineno, f"Function '{node.name}' is too long ({length} lines > {max_lines}).")]
+    return []
+
+def rule_function_missing_docstring(node: ast.AST, *, ctx: SourceContext | None = None) -> list[tuple[int, str]]:
     if isinstance(node, ast.FunctionDef):
         if not ast.get_docstring(node):
             return [(node.lineno, f"Function '{node.name}' is missing a docstring.")]
@@ -82,6 +102,12 @@ TREE_LEVEL_RULES = [
         "description": "Ensure script has an if __name__ == '__main__' guard.",
         "check": rule_has_main_check,
     },
+    {
+        "id": "R005",
+        "description": "Avoid TODO comments in code.",
+        "check": rule_todo_comments,
+        "triggers": (b"TODO",),
+    },
 ]
 
 NODE_LEVEL_RULES: list[ComplianceRule] = [
@@ -89,25 +115,34 @@ NODE_LEVEL_RULES: list[ComplianceRule] = [
         "id": "R001",
         "description": "Avoid using print statements in production code.",
         "check": rule_no_print_statements,
+        "node_types": (ast.Call,),
+        "triggers": (b"print",),
     },
     {
         "id": "R003",
         "description": "Function names should follow snake_case style.",
         "check": rule_function_names_snake_case,
+        "node_types": (ast.FunctionDef,),
+        "triggers": (b"def",),
     },
     {
         "id": "R004",
         "description": "Limit function length to a maintainable number of lines.",
         "check": rule_limit_function_length,
+        "node_types": (ast.FunctionDef,),
+        "triggers": (b"def",),
     },
     {
-        "id": "R005",
-        "description": "Avoid TODO comments in code. (Not yet enforced)",
-        "check": rule_todo_comments,
-    },
-        {
         "id": "R006",
         "description": "Avoid missing docstrings in functions",
         "check": rule_function_missing_docstring,
+        "node_types": (ast.FunctionDef,),
+        "triggers": (b"def",),
     }
-]
\ No newline at end of file
+]
+
+# Declarative pattern rules (config/pattern_rules.json), compiled into one line
+# scan and one node-type dispatch entry however many rules are declared
+_pattern_tree_rules, _pattern_node_rules = PATTERN_RULES.python_rules()
+TREE_LEVEL_RULES.extend(_pattern_tree_rules)
+NODE_LEVEL_RULES.extend(_pattern_node_rules)
@@ -2,79 +2,144 @@
 File name: config/xml_guidelines.py
 
 Description: Defines compliance rules for internal coding standards.
-Each rule is a dictionary containing an ID, description, and AST-based checker function.
+Each rule is an XmlRule subclass with an ID and description. The engine in
+xml_stream.py streams the document once and sends element start/end events (with
+line numbers) and raw source lines to a fresh instance of every rule, so even very
+large generated XML files are checked in constant memory.
+A rule's `triggers` lists byte strings one of which must occur in the document for
+the rule to fire; documents without any of them skip the rule (see prefilter.py).
 """
 
-import xml.etree.ElementTree as ET
+from config.pattern_rules import PATTERN_RULES
+from xml_stream import XmlRule, iter_text_chunks, scan_xml
 
-XML_TREE_LEVEL_RULES = []
-XML_NODE_LEVEL_RULES = []
+XML_RULES = []
 
-def xml_rule_no_duplicate_dependencies(tree: ET.ElementTree) -> list[tuple[int, str]]:
+def _scan(rule_cls: type[XmlRule], xml_text: str) -> list[tuple[int, str]]:
+    return scan_xml(iter_text_chunks(xml_text), [rule_cls()])[0]
+
+class NoDuplicateDependenciesRule(XmlRule):
     """
     Ensure there are no duplicate dependencies in pom.xml.
     """
-    violations = []
-    seen = set()
-    for dep in tree.findall(".//{*}dependency"):
-        group_id = dep.findtext("{*}groupId", default="").strip()
-        artifact_id = dep.findtext("{*}artifactId", default="").strip()
-        line_number = dep.sourceline if hasattr(dep, 'sourceline') else 0
-        key = (group_id, artifact_id)
-        if key in seen:
-            violations.append((line_number, f"Duplicate dependency: {group_id}:{artifact_id}"))
-        else:
-            seen.add(key)
-    return violations
-
-def xml_rule_has_project_metadata(tree: ET.ElementTree) -> list[tuple[int, str]]:
+    id = "xml_rule_no_duplicate_dependencies"
+    description = "No duplicate dependencies."
+    triggers = (b"dependency",)
+
+    def __init__(self):
+        self.seen = set()
+        self.current = None
+
+    def start(self, path, attrs, line):
+        if path[-1] == "dependency":
+            self.current = {"line": line, "groupId": "", "artifactId": ""}
+        return []
+
+    def end(self, path, text, line):
+        if self.current is None:
+            return []
+        if len(path) > 1 and path[-2] == "dependency" and path[-1] in ("groupId", "artifactId"):
+            self.current[path[-1]] = text.strip()
+        elif path[-1] == "dependency":
+            dep, self.current = self.current, None
+            key = (dep["groupId"], dep["artifactId"])
+            if key in self.seen:
+                return [(dep["line"], f"Duplicate dependency: {key[0]}:{key[1]}")]
+            self.seen.add(key)
+        return []
+
+class ProjectMetadataRule(XmlRule):
     """
     Ensure Maven-style <project> files contain basic metadata like <name>, <description>, <url>.
     Only applies to Maven POM-style XML.
     """
-    violations = []
-    root = tree.getroot()
+    id = "xml_rule_has_project_metadata"
+    description = "Maven projects need name, description and url."
+    triggers = (b"project",)
+
+    required_tags = ("name", "description", "url")
 
-    if root.tag != "project":
-        return []  # Skip non-Maven-style XML
+    def __init__(self):
+        self.project_line = None
+        self.found = set()
 
-    required_tags = ["name", "description", "url"]
-    for tag in required_tags:
-        if root.find(tag) is None:
-            line = 1  # ET doesn’t preserve line numbers
-            violations.append((line, f"Missing <{tag}> tag in project metadata."))
+    def start(self, path, attrs, line):
+        if len(path) == 1 and path[0] == "project":
+            self.project_line = line
+        elif len(path) == 2 and self.project_line is not None:
+            self.found.add(path[1])
+        return []
 
-    return violations
+    def finish(self):
+        if self.project_line is None:
+            return []  # Skip non-Maven-style XML
+        return [
+            (self.project_line, f"Missing <{tag}> tag in project metadata.")
+            for tag in self.required_tags
+            if tag not in self.found
+        ]
 
-def xml_rule_no_snapshot_versions(tree: ET.ElementTree) -> list[tuple[int, str]]:
+class NoSnapshotVersionsRule(XmlRule):
     """
     Ensure that no dependencies use SNAPSHOT versions.
     """
-    violations = []
-    for dep in tree.findall(".//{*}dependency"):
-        version = dep.findtext("{*}version", default="")
-        line_number = dep.sourceline if hasattr(dep, 'sourceline') else 0
-        if version.endswith("SNAPSHOT"):
-            violations.append((line_number, f"Dependency uses SNAPSHOT version: {version}"))
-    return violations
+    id = "xml_rule_no_snapshot_versions"
+    description = "Dependencies must not use SNAPSHOT versions."
+    triggers = (b"SNAPSHOT",)
 
-def xml_node_level_line_rules(xml_text: str) -> list[tuple[int, str]]:
+    def __init__(self):
+        self.dependency_line = 0
+
+    def start(self, path, attrs, line):
+        if path[-1] == "dependency":
+            self.dependency_line = line
+        return []
+
+    def end(self, path, text, line):
+        if len(path) > 1 and path[-2] == "dependency" and path[-1] == "version":
+            version = text.strip()
+            if version.endswith("SNAPSHOT"):
+                return [(self.dependency_line, f"Dependency uses SNAPSHOT version: {version}")]
+        return []
+
+class LineFormattingRule(XmlRule):
     """
     Basic formatting rules at line level (e.g., indentation, spacing).
     """
-    violations = []
-    for i, line in enumerate(xml_text.splitlines(), 1):
+    id = "xml_node_level_line_rules"
+    description = "Line-level formatting."
+    triggers = (b"\t", b"<!--")
+
+    def check_line(self, lineno, line):
+        violations = []
         if "\t" in line:
-            violations.append((i, "Avoid using tabs; use spaces for indentation."))
-        if line.strip().startswith("<!--") and not line.strip().endswith("-->"):
-            violations.append((i, "Multiline comments should be closed properly."))
-    return violations
+            violations.append((lineno, "Avoid using tabs; use spaces for indentation."))
+        stripped = line.strip()
+        if stripped.startswith("<!--") and not stripped.endswith("-->"):
+            violations.append((lineno, "Multiline comments should be closed properly."))
+        return violations
+
+def xml_rule_no_duplicate_dependencies(xml_text: str) -> list[tuple[int, str]]:
+    return _scan(NoDuplicateDependenciesRule, xml_text)
+
+def xml_rule_has_project_metadata(xml_text: str) -> list[tuple[int, str]]:
+    return _scan(ProjectMetadataRule, xml_text)
+
+def xml_rule_no_snapshot_versions(xml_text: str) -> list[tuple[int, str]]:
+    return _scan(NoSnapshotVersionsRule, xml_text)
+
+def xml_node_level_line_rules(xml_text: str) -> list[tuple[int, str]]:
+    return _scan(LineFormattingRule, xml_text)
 
 # Register rules
-XML_TREE_LEVEL_RULES.extend([
-    xml_rule_no_duplicate_dependencies,
-    xml_rule_has_project_metadata,
-    xml_rule_no_snapshot_versions,
+XML_RULES.extend([
+    NoDuplicateDependenciesRule,
+    ProjectMetadataRule,
+    NoSnapshotVersionsRule,
+    LineFormattingRule,
 ])
 
-XML_NODE_LEVEL_RULES.append(xml_node_level_line_rules)
\ No newline at end of file
+# Declarative forbidden-line rules, compiled into one streaming line check
+_pattern_rule = PATTERN_RULES.xml_rule_class()
+if _pattern_rule is not None:
+    XML_RULES.append(_pattern_rule)
@@ -0,0 +1,120 @@
+"""
+File name: git_diff.py
+
+Description: Helpers for incremental checking against a git revision.
+A single `git diff -U0` call yields both the changed files and the line ranges
+added or modified in each, so callers can check only what a change touched.
+"""
+
+import bisect
+import os
+import re
+import subprocess
+
+_HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+_ESCAPES = {"a": 7, "b": 8, "t": 9, "n": 10, "v": 11, "f": 12, "r": 13, '"': 34, "\\": 92}
+
+def _run_git(args: list[str], cwd: str) -> str:
+    try:
+        completed = subprocess.run(
+            ["git", "-c", "core.quotepath=off", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            # Hunks and paths may hold non-UTF-8 bytes; keep them round-trippable for os paths
+            errors="surrogateescape",
+        )
+    except FileNotFoundError:
+        raise RuntimeError("git executable not found; --changed-since needs a local git install")
+    if completed.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {completed.stderr.strip()}")
+    return completed.stdout
+
+def _unquote_path(name: str) -> str:
+    """
+    Undo git's C-style quoting of a path ("dir/a\\tb.py", "\\303\\251.py").
+    """
+    if not (len(name) >= 2 and name[0] == name[-1] == '"'):
+        return name
+    out = bytearray()
+    body = name[1:-1]
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == "\\" and i + 1 < len(body):
+            escape = body[i + 1]
+            if escape in "01234567":
+                out.append(int(body[i + 1:i + 4], 8))
+                i += 4
+                continue
+            out.append(_ESCAPES.get(escape, ord(escape)))
+            i += 2
+            continue
+        out.extend(char.encode("utf-8"))
+        i += 1
+    return out.decode("utf-8", errors="surrogateescape")
+
+def changed_line_ranges(
+    rev: str,
+    path: str = ".",
+    extensions: tuple[str, ...] = (".py", ".java", ".xml"),
+) -> dict[str, list[tuple[int, int]]]:
+    """
+    Map each supported file under `path` changed since `rev` (committed or not)
+    to the sorted, inclusive (start, end) line ranges it added or modified.
+    Deleted files and untracked files are not included.
+    """
+    cwd = path if os.path.isdir(path) else (os.path.dirname(path) or ".")
+    toplevel = _run_git(["rev-parse", "--show-toplevel"], cwd).strip()
+    diff = _run_git(
+        [
+            "diff", "-U0", "--no-color", "--no-ext-diff", "--diff-filter=ACMR",
+            # Fixed prefixes whatever diff.noprefix / diff.mnemonicPrefix say
+            "--src-prefix=a/", "--dst-prefix=b/",
+            rev, "--", os.path.abspath(path),
+        ],
+        cwd,
+    )
+
+    ranges: dict[str, list[tuple[int, int]]] = {}
+    current = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            # git appends a tab to names containing spaces and quotes unusual ones
+            name = _unquote_path(line[4:].rstrip("\t"))
+            if not name.startswith("b/"):
+                current = None  # /dev/null
+                continue
+            name = name[2:]
+            current = None
+            if name.endswith(extensions):
+                file_path = os.path.join(toplevel, name)
+                if not os.path.isabs(path):
+                    file_path = os.path.relpath(file_path)
+                current = ranges.setdefault(file_path, [])
+        elif current is not None and line.startswith("@@"):
+            match = _HUNK_RE.match(line)
+            if not match:
+                continue
+            start = int(match.group(1))
+            count = int(match.group(2)) if match.group(2) is not None else 1
+            if count:  # count == 0 is a pure deletion
+                current.append((start, start + count - 1))
+
+    for file_ranges in ranges.values():
+        file_ranges.sort()
+    return ranges
+
+def line_in_ranges(line: int, ranges: list[tuple[int, int]]) -> bool:
+    """
+    True if `line` falls inside one of the sorted, non-overlapping `ranges`.
+    """
+    i = bisect.bisect_right(ranges, (line, float("inf"))) - 1
+    return i >= 0 and ranges[i][0] <= line <= ranges[i][1]
+
+def filter_to_changed_lines(violations: list[dict], ranges: list[tuple[int, int]]) -> list[dict]:
+    """
+    Keep violations on changed lines. File-level violations (line 0) are always kept.
+    """
+    return [v for v in violations if not v.get("line") or line_in_ranges(v["line"], ranges)]
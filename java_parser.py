@@ -0,0 +1,239 @@
+"""
+File name: java_parser.py
+
+Description: Lightweight pure-Python Java lexer and structural index.
+A file is tokenized once (comments, string/char literals and text blocks are
+recognized, so braces or keywords inside them are ignored) and a compact index of
+the package, imports, classes and methods is built from the token stream.
+Java rules in config/java_guidelines.py query the index instead of rescanning text.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+    |(?P<doc>/\*\*(?!/).*?(?:\*/|\Z))
+    |(?P<comment>/\*.*?(?:\*/|\Z)|//[^\r\n]*)
+    |(?P<string>\"\"\"(?:[^\\]|\\.)*?(?:\"\"\"|\Z)|"(?:[^"\\\r\n]|\\.)*"?)
+    |(?P<char>'(?:[^'\\\r\n]|\\.)*'?)
+    |(?P<ident>[^\W\d][\w$]*|\$[\w$]*)
+    |(?P<number>\.?\d(?:[\w.]|(?<=[eEpP])[+-])*)
+    |(?P<op>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+COMMENT_KINDS = ("comment", "doc")
+
+MODIFIERS = frozenset({
+    "public", "protected", "private", "static", "final", "abstract",
+    "sealed", "non", "strictfp", "synchronized", "native", "transient", "volatile", "default",
+})
+
+TYPE_KEYWORDS = frozenset({"class", "interface", "enum"})
+
+# Tokens that may directly precede a method or constructor name in a class body
+_METHOD_PREFIX_OPS = frozenset({">", "]", "{", "}", ";", ")"})
+_NOT_METHOD_PREFIX = frozenset({"new", "return", "throw", "else", "case"})
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    line: int
+
+class ImportInfo(NamedTuple):
+    name: str
+    line: int
+    static: bool
+    wildcard: bool
+
+@dataclass
+class ClassInfo:
+    name: str
+    kind: str
+    line: int
+    end_line: int = 0
+    has_javadoc: bool = False
+
+@dataclass
+class MethodInfo:
+    name: str
+    line: int
+    class_name: str
+    end_line: int = 0
+
+@dataclass
+class JavaIndex:
+    tokens: list[Token]
+    code_tokens: list[Token]
+    package: str | None = None
+    package_line: int = 0
+    imports: list[ImportInfo] = field(default_factory=list)
+    classes: list[ClassInfo] = field(default_factory=list)
+    methods: list[MethodInfo] = field(default_factory=list)
+
+def tokenize_java(code: str) -> list[Token]:
+    """
+    Split Java source into tokens, dropping whitespace. Comments are kept as
+    "comment"/"doc" tokens so rules can still see them.
+    """
+    tokens = []
+    line = 1
+    for match in _TOKEN_RE.finditer(code):
+        kind = match.lastgroup
+        value = match.group()
+        if kind != "ws":
+            tokens.append(Token(kind, value, line))
+        line += value.count("\n")
+    return tokens
+
+def _has_javadoc(tokens: list[Token], i: int) -> bool:
+    """
+    True if the declaration keyword at tokens[i] is preceded by a Javadoc comment,
+    allowing modifiers, annotations and ordinary comments in between.
+    """
+    j = i - 1
+    while j >= 0:
+        token = tokens[j]
+        if token.kind == "doc":
+            return True
+        if token.kind == "comment" or token.value in MODIFIERS or token.value in ("@", ".", "-"):
+            j -= 1
+        elif token.value == ")":
+            # Skip annotation arguments back to the opening parenthesis
+            depth = 0
+            while j >= 0:
+                if tokens[j].value == ")":
+                    depth += 1
+                elif tokens[j].value == "(":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                j -= 1
+            j -= 1
+        elif token.kind == "ident" and j > 0 and tokens[j - 1].value in ("@", "."):
+            j -= 1
+        else:
+            return False
+    return False
+
+def _read_name(code_tokens: list[Token], i: int) -> tuple[str, int]:
+    """
+    Read a dotted name (e.g. a package or import) up to the terminating ';'.
+    Returns the name and the index of the ';'.
+    """
+    parts = []
+    while i < len(code_tokens) and code_tokens[i].value != ";":
+        parts.append(code_tokens[i].value)
+        i += 1
+    return "".join(parts), i
+
+def parse_java(code: str) -> JavaIndex:
+    """
+    Tokenize `code` once and build its structural index.
+    """
+    tokens = tokenize_java(code)
+    positions = [i for i, t in enumerate(tokens) if t.kind not in COMMENT_KINDS]
+    code_tokens = [tokens[i] for i in positions]
+    index = JavaIndex(tokens=tokens, code_tokens=code_tokens)
+
+    # Each frame is [kind, info, in_enum_constants]; kind is "class", "method" or "block"
+    stack = []
+    pending_type = None
+    pending_method = None
+    n = len(code_tokens)
+    i = 0
+    while i < n:
+        token = code_tokens[i]
+        value = token.value
+        prev = code_tokens[i - 1] if i else None
+        top = stack[-1] if stack else None
+
+        if not stack and value in ("package", "import") and token.kind == "ident":
+            if value == "package":
+                index.package, i = _read_name(code_tokens, i + 1)
+                index.package_line = token.line
+            else:
+                static = i + 1 < n and code_tokens[i + 1].value == "static"
+                name, end = _read_name(code_tokens, i + (2 if static else 1))
+                index.imports.append(ImportInfo(name, token.line, static, name.endswith("*")))
+                i = end
+            i += 1
+            continue
+
+        is_type_keyword = token.kind == "ident" and (
+            value in TYPE_KEYWORDS
+            or (
+                value == "record"
+                and i + 2 < n
+                and code_tokens[i + 1].kind == "ident"
+                and code_tokens[i + 2].value in ("(", "<")
+            )
+        )
+        if is_type_keyword and (prev is None or prev.value != ".") and i + 1 < n and code_tokens[i + 1].kind == "ident":
+            kind = "interface" if prev is not None and prev.value == "@" else value
+            pending_type = ClassInfo(
+                name=code_tokens[i + 1].value,
+                kind=kind,
+                line=token.line,
+                has_javadoc=_has_javadoc(tokens, positions[i]),
+            )
+            index.classes.append(pending_type)
+            pending_method = None
+            i += 2
+            continue
+
+        if value == "{":
+            if pending_type is not None:
+                stack.append(["class", pending_type, pending_type.kind == "enum"])
+                pending_type = None
+            elif pending_method is not None:
+                stack.append(["method", pending_method, False])
+                index.methods.append(pending_method)
+                pending_method = None
+            else:
+                stack.append(["block", None, False])
+        elif value == "}":
+            if stack:
+                _, info, _ = stack.pop()
+                if info is not None:
+                    info.end_line = token.line
+            pending_method = None
+        elif pending_type is not None:
+            pass  # extends/implements/type parameters of a pending declaration
+        elif (
+            top is not None
+            and top[0] == "class"
+            and not top[2]
+            and token.kind == "ident"
+            and i + 1 < n
+            and code_tokens[i + 1].value == "("
+            and prev is not None
+            and prev.value not in _NOT_METHOD_PREFIX
+            and (prev.kind == "ident" or prev.value in _METHOD_PREFIX_OPS)
+        ):
+            # Candidate method or constructor: skip the parameter list
+            depth = 0
+            j = i + 1
+            while j < n:
+                if code_tokens[j].value == "(":
+                    depth += 1
+                elif code_tokens[j].value == ")":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                j += 1
+            pending_method = MethodInfo(name=value, line=token.line, class_name=top[1].name)
+            i = j + 1
+            continue
+        elif pending_method is not None and not (token.kind == "ident" or value in (".", ",", "<", ">", "[", "]")):
+            pending_method = None  # e.g. ';' after an abstract method
+        elif value == ";" and top is not None and top[2]:
+            top[2] = False  # end of enum constants
+
+        i += 1
+
+    return index
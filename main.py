@@ -1,69 +1,479 @@
 import argparse
 import json
 import os
+import shutil
+import sys
+import tempfile
 from datetime import datetime
+from io import StringIO
 
+from archives import ArchiveMembers, is_archive
+from baseline import BaselineIndex
+from budget import CheckBudget
+from cache import DEFAULT_CACHE_DIR, MemoryResultCache, get_cache
+import profiling
+from git_diff import changed_line_ranges, filter_to_changed_lines
+from pipeline import DEFAULT_PREFETCH, DEFAULT_READERS, aiter_file_results
+from sharding import merge_partials, parse_shard, select_shard, write_partial
+from traversal import DEFAULT_EXCLUDES, TraversalOptions, iter_supported_files
 from utils import (
-    apply_compliance_rules_with_count,
-    print_violations,
-    gather_supported_files,
-    generate_markdown_report,
+    SORT_KEYS,
+    check_file,
+    check_files,
+    iter_check_sources,
+    sort_within_files,
+    write_markdown_header,
+    write_markdown_rows,
+    write_text_report,
 )
+from violation_store import ViolationStore
+from watcher import watch_compliance
 
-def check_compliance(path: str, output_format: str = "text") -> str | list[dict]:
-    files = gather_supported_files(path)
-    if not files:
-        return f"No supported files (.py, .java, .xml) found at path: {path}"
+def select_files(
+    path: str,
+    changed_since: str | None = None,
+    traversal: TraversalOptions | None = None,
+):
+    """
+    Return the files to check and, in --changed-since mode, their changed line ranges.
+    Outside --changed-since mode the files are discovered lazily; an archive path
+    gives its members (see archives.py) instead of files on disk.
+    """
+    if changed_since is None:
+        if is_archive(path):
+            return ArchiveMembers(path, traversal), None
+        return iter_supported_files(path, options=traversal), None
+    changed_ranges = changed_line_ranges(changed_since, path)
+    return sorted(f for f in changed_ranges if os.path.isfile(f)), changed_ranges
 
-    all_violations = []
-    total_functions = 0
+def iter_file_results(
+    files,
+    jobs: int = 1,
+    cache_dir: str | None = None,
+    changed_ranges: dict | None = None,
+    changed_lines_only: bool = False,
+    memory_cache: MemoryResultCache | None = None,
+    readers: int = 0,
+    budget: CheckBudget | None = None,
+    baseline: BaselineIndex | None = None,
+):
+    """
+    Yield (file_path, violations, function_count) as each file finishes, in file order.
+    `files` may be ArchiveMembers, whose members are checked in memory as "archive!member".
+    With a `baseline`, violations recorded in it are dropped.
+    With a `budget`, stop (and cancel the remaining files) once its violation limit is reached.
+    """
+    file_timeout = budget.file_timeout if budget is not None else None
+    if isinstance(files, ArchiveMembers):
+        results = iter_check_sources(files, jobs, memory_cache=memory_cache, cache_dir=cache_dir, file_timeout=file_timeout)
+    else:
+        results = check_files(files, jobs, cache_dir, memory_cache, readers, file_timeout)
+    try:
+        for file_path, violations, function_count in results:
+            if changed_lines_only and changed_ranges is not None:
+                violations = filter_to_changed_lines(violations, changed_ranges[file_path])
+            if baseline is not None:
+                violations = baseline.filter_file(file_path, violations)
+            if budget is not None:
+                violations = budget.spend(file_path, violations)
+            yield file_path, violations, function_count
+            if budget is not None and budget.stopped:
+                break
+    finally:
+        results.close()
+
+    if cache_dir is not None:
+        get_cache(cache_dir).evict()
+
+def iter_compliance(
+    path: str,
+    jobs: int = 1,
+    cache_dir: str | None = None,
+    changed_since: str | None = None,
+    changed_lines_only: bool = False,
+    memory_cache: MemoryResultCache | None = None,
+    traversal: TraversalOptions | None = None,
+    readers: int = 0,
+    budget: CheckBudget | None = None,
+    baseline: BaselineIndex | None = None,
+):
+    """
+    Iterator form of check_compliance: yields violation dicts as each file is checked,
+    without holding the full report in memory.
+    """
+    files, changed_ranges = select_files(path, changed_since, traversal)
+    results = iter_file_results(
+        files, jobs, cache_dir, changed_ranges, changed_lines_only, memory_cache, readers, budget, baseline
+    )
+    for _, violations, _ in results:
+        yield from violations
+
+def _no_files_message(path: str, changed_since: str | None) -> str:
+    if changed_since is not None:
+        return f"No supported files (.py, .java, .xml) changed since {changed_since} at path: {path}"
+    return f"No supported files (.py, .java, .xml) found at path: {path}"
+
+def _select_results(
+    path: str,
+    changed_since: str | None = None,
+    traversal: TraversalOptions | None = None,
+    sort_by: str | None = None,
+    **options,
+):
+    """
+    Select the files for `path` and return the lazy per-file results.
+    With `sort_by`, files are visited in sorted order (archive members keep their archive order).
+    """
+    files, changed_ranges = select_files(path, changed_since, traversal)
+    if sort_by is not None and not isinstance(files, ArchiveMembers):
+        files = sorted(files)
+    return iter_file_results(files, changed_ranges=changed_ranges, **options)
+
+def _report_violations(results, totals: dict, sort_by: str | None = None):
+    """
+    Yield the violations from per-file `results`, counting checked files and functions in `totals`.
+    With `sort_by`, each file's violations are sorted.
+    """
+    def violations():
+        for _, file_violations, function_count in results:
+            totals["files"] += 1
+            totals["functions"] += function_count
+            yield from file_violations
+
+    if sort_by is not None:
+        return sort_within_files(violations(), sort_by)
+    return violations()
+
+def _write_report(
+    results,
+    output_format: str,
+    sink,
+    path: str,
+    changed_since: str | None = None,
+    sort_by: str | None = None,
+) -> int:
+    totals = {"files": 0, "functions": 0}
+    violations = _report_violations(results, totals, sort_by)
 
-    for file_path in files:
-        _, ext = os.path.splitext(file_path)
-        filetype = ext[1:]  # e.g. "py", "java", "xml"
+    if output_format == "markdown":
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024, mode="w+", encoding="utf-8") as rows:
+            count = write_markdown_rows(violations, rows)
+            if not totals["files"]:
+                sink.write(_no_files_message(path, changed_since) + "\n")
+                return 0
+            write_markdown_header(sink, totals["files"], totals["functions"], count)
+            rows.seek(0)
+            shutil.copyfileobj(rows, sink)
+        return count
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
+    count = write_text_report(violations, sink)
+    if not totals["files"]:
+        sink.write(_no_files_message(path, changed_since) + "\n")
+    elif not count:
+        sink.write("✅ All checks passed. No violations found.\n")
+    return count
 
-        violations, function_count = apply_compliance_rules_with_count(code, filetype)
-        for v in violations:
-            v["file"] = file_path
-        all_violations.extend(violations)
-        total_functions += function_count
+def _render_report(
+    results,
+    output_format: str,
+    path: str,
+    changed_since: str | None = None,
+    sort_by: str | None = None,
+) -> str | list[dict] | ViolationStore:
+    """
+    Format per-file `results` the way check_compliance returns them.
+    Violations are held in a compact ViolationStore; "store" returns it as is.
+    """
+    if output_format in ("markdown", "text"):
+        buffer = StringIO()
+        _write_report(results, output_format, buffer, path, changed_since, sort_by)
+        return buffer.getvalue()
 
+    totals = {"files": 0, "functions": 0}
+    violations = _report_violations(results, totals, sort_by)
+
+    if output_format in ("json", "store"):
+        store = ViolationStore(violations)
+    else:  # summary
+        violation_count = sum(1 for _ in violations)
+
+    if not totals["files"]:
+        return _no_files_message(path, changed_since)
+    if output_format == "store":
+        return store
     if output_format == "json":
-        return all_violations
+        return store.to_dicts()
+    return (
+        f"Files checked: {totals['files']}\n"
+        f"Functions/configs checked: {totals['functions']}\n"
+        f"Violations found: {violation_count}"
+    )
 
-    elif output_format == "summary":
-        return (
-            f"Files checked: {len(files)}\n"
-            f"Functions/configs checked: {total_functions}\n"
-            f"Violations found: {len(all_violations)}"
-        )
+def write_compliance_report(
+    path: str,
+    output_format: str,
+    sink,
+    jobs: int = 1,
+    cache_dir: str | None = None,
+    changed_since: str | None = None,
+    changed_lines_only: bool = False,
+    sort_by: str | None = None,
+    memory_cache: MemoryResultCache | None = None,
+    traversal: TraversalOptions | None = None,
+    readers: int = 0,
+    budget: CheckBudget | None = None,
+    baseline: BaselineIndex | None = None,
+) -> int:
+    """
+    Stream a "text" or "markdown" report for `path` into the file-like `sink`.
+    Only one file's violations are in memory at a time; Markdown rows are spooled
+    to a temporary file until the header totals are known.
+    Returns the number of violation rows written.
+    """
+    results = _select_results(
+        path,
+        changed_since,
+        traversal,
+        sort_by,
+        jobs=jobs,
+        cache_dir=cache_dir,
+        changed_lines_only=changed_lines_only,
+        memory_cache=memory_cache,
+        readers=readers,
+        budget=budget,
+        baseline=baseline,
+    )
+    return _write_report(results, output_format, sink, path, changed_since, sort_by)
+
+def check_compliance(
+    path: str,
+    output_format: str = "text",
+    jobs: int = 1,
+    cache_dir: str | None = None,
+    changed_since: str | None = None,
+    changed_lines_only: bool = False,
+    sort_by: str | None = None,
+    memory_cache: MemoryResultCache | None = None,
+    traversal: TraversalOptions | None = None,
+    readers: int = 0,
+    budget: CheckBudget | None = None,
+    baseline: BaselineIndex | None = None,
+) -> str | list[dict] | ViolationStore:
+    results = _select_results(
+        path,
+        changed_since,
+        traversal,
+        sort_by,
+        jobs=jobs,
+        cache_dir=cache_dir,
+        changed_lines_only=changed_lines_only,
+        memory_cache=memory_cache,
+        readers=readers,
+        budget=budget,
+        baseline=baseline,
+    )
+    return _render_report(results, output_format, path, changed_since, sort_by)
+
+def check_sources(
+    items,
+    jobs: int = 1,
+    batch_size: int = 256,
+    memory_cache: MemoryResultCache | None = None,
+) -> list[dict]:
+    """
+    Check in-memory sources without touching the filesystem.
+    `items` is an iterable of (virtual path, language, content) where language is
+    "py", "java", "xml" or None (inferred from the path) and content is str, bytes or
+    memoryview. Returns one {"path", "violations", "function_count"} dict per item, in order.
+    """
+    return [
+        {"path": virtual_path, "violations": violations, "function_count": function_count}
+        for virtual_path, violations, function_count in iter_check_sources(items, jobs, batch_size, memory_cache)
+    ]
+
+def check_shard(
+    path: str,
+    shard: str | tuple[int, int],
+    sink_path: str,
+    jobs: int = 1,
+    cache_dir: str | None = None,
+    changed_since: str | None = None,
+    changed_lines_only: bool = False,
+    traversal: TraversalOptions | None = None,
+    readers: int = 0,
+    budget: CheckBudget | None = None,
+    baseline: BaselineIndex | None = None,
+) -> tuple[int, int]:
+    """
+    Check shard `shard` ("i/N" or (i, N)) of the files under `path` and write its
+    partial result file to `sink_path` for merge_reports. Every shard enumerates the
+    same files and keeps those whose relative path hashes to it (see sharding.py).
+    A `budget` may only set a file timeout, not a violation limit, and a `baseline` can only filter.
+    Returns (files checked, violations found).
+    """
+    index, count = parse_shard(shard) if isinstance(shard, str) else shard
+    if budget is not None and budget.max_violations is not None:
+        # Each shard would stop on its own count, so the merged totals would match no single run
+        raise ValueError("A violation limit cannot be applied per shard; only file_timeout is supported")
+    if baseline is not None and baseline.record:
+        raise ValueError("A baseline cannot be recorded from one shard; record it with a full run")
+    files, changed_ranges = select_files(path, changed_since, traversal)
+    if isinstance(files, ArchiveMembers):
+        raise ValueError("Archives cannot be sharded; shard the directory that contains them")
+    selected = select_shard(files, path, index, count)
+    results = iter_file_results(
+        [file_path for _, file_path in selected],
+        jobs,
+        cache_dir,
+        changed_ranges,
+        changed_lines_only,
+        readers=readers,
+        budget=budget,
+        baseline=baseline,
+    )
+    return write_partial(
+        sink_path,
+        path,
+        (index, count),
+        ((order, *result) for (order, _), result in zip(selected, results)),
+    )
+
+def _merged_results(partials, sort_by: str | None = None) -> tuple[str, list]:
+    root, results = merge_partials(partials)
+    if sort_by is not None:
+        results.sort(key=lambda result: result[0])
+    return root, results
 
-    elif output_format == "markdown":
-        return generate_markdown_report(all_violations, files, total_functions)
+def merge_reports(partials, output_format: str = "text", sort_by: str | None = None) -> str | list[dict] | ViolationStore:
+    """
+    Merge the partial result files of all N shards of a scan into the report
+    check_compliance would return for the whole scan, with the same totals.
+    """
+    root, results = _merged_results(partials, sort_by)
+    return _render_report(results, output_format, root, sort_by=sort_by)
 
-    else:  # default to human-readable text
-        if all_violations:
-            from io import StringIO
-            buffer = StringIO()
-            print_violations(all_violations, file=buffer)
-            return buffer.getvalue()
-        else:
-            return "✅ All checks passed. No violations found."
+async def check_compliance_async(
+    path: str,
+    output_format: str = "text",
+    readers: int = DEFAULT_READERS,
+    prefetch: int = DEFAULT_PREFETCH,
+    cache_dir: str | None = None,
+    changed_since: str | None = None,
+    changed_lines_only: bool = False,
+    sort_by: str | None = None,
+    traversal: TraversalOptions | None = None,
+    budget: CheckBudget | None = None,
+    baseline: BaselineIndex | None = None,
+) -> str | list[dict]:
+    """
+    Async form of check_compliance with the same result.
+    Up to `prefetch` files are read ahead by `readers` concurrent readers while the
+    checker works in a thread, so read latency (e.g. on NFS) overlaps rule evaluation.
+    A `budget` stops the scan early; its file timeout is not enforced here, since rules run in worker threads.
+    """
+    import asyncio  # already loaded by the running event loop; not imported at CLI startup
+
+    files, changed_ranges = await asyncio.to_thread(select_files, path, changed_since, traversal)
+    if isinstance(files, ArchiveMembers):
+        # Members are decompressed as one forward stream, so there is no read-ahead to overlap
+        members = iter_file_results(files, cache_dir=cache_dir, budget=budget, baseline=baseline)
+        results = await asyncio.to_thread(list, members)
+        return _render_report(results, output_format, path, changed_since, sort_by)
+    if sort_by is not None:
+        files = sorted(files)
+
+    def check(file_path: str, raw: bytes | None):
+        return check_file(file_path, cache_dir, raw=raw)
+
+    results = []
+    pipeline = aiter_file_results(files, check, readers, prefetch)
+    try:
+        async for file_path, violations, function_count in pipeline:
+            if changed_lines_only and changed_ranges is not None:
+                violations = filter_to_changed_lines(violations, changed_ranges[file_path])
+            if baseline is not None:
+                violations = baseline.filter_file(file_path, violations)
+            if budget is not None:
+                violations = budget.spend(file_path, violations)
+            results.append((file_path, violations, function_count))
+            if budget is not None and budget.stopped:
+                break
+    finally:
+        await pipeline.aclose()
+
+    if cache_dir is not None:
+        await asyncio.to_thread(lambda: get_cache(cache_dir).evict())
+    return _render_report(results, output_format, path, changed_since, sort_by)
 
 def main():
     parser = argparse.ArgumentParser(description="Check internal guideline compliance for Python, Java, or XML files.")
-    parser.add_argument("path", type=str, help="Path to Python file or directory to check.")
+    parser.add_argument("path", type=str, nargs="?",
+                        help="Path to a file, directory or archive (.zip, .jar, .tar.gz, ...) to check.")
     parser.add_argument("--json", "-j", action="store_true", help="Output violations as JSON")
     parser.add_argument("--summary", "-s", action="store_true", help="Output a summary only")
     parser.add_argument("--md", "-m", action="store_true", help="Output a Markdown report")
-
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Stream violations as JSON Lines, one object per line, as each file is checked")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="Number of worker processes (0 = one per CPU). Default: 1")
+    parser.add_argument("--readers", type=int, default=0, metavar="N",
+                        help="With --jobs 1, prefetch file contents on N reader threads (for slow or network filesystems)")
+    parser.add_argument("--cache-dir", type=str, default=DEFAULT_CACHE_DIR,
+                        help=f"Directory for the result cache. Default: {DEFAULT_CACHE_DIR}")
+    parser.add_argument("--changed-since", type=str, metavar="REV",
+                        help="Only check files changed since the given git revision")
+    parser.add_argument("--changed-lines-only", action="store_true",
+                        help="With --changed-since, only report violations on changed lines")
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every file; do not read or write the result cache")
+    parser.add_argument("--watch", action="store_true",
+                        help="After a full scan, keep polling and re-check only files that change")
+    parser.add_argument("--interval", type=float, default=1.0, metavar="SECONDS",
+                        help="Polling interval for --watch. Default: 1.0")
+    parser.add_argument("--exclude", action="append", default=[], metavar="PATTERN",
+                        help="Skip paths matching this .gitignore-style pattern (repeatable)")
+    parser.add_argument("--max-file-size", type=int, metavar="BYTES",
+                        help="Skip files larger than this many bytes")
+    parser.add_argument("--no-gitignore", action="store_true", help="Do not honour .gitignore files")
+    parser.add_argument("--no-default-excludes", action="store_true",
+                        help=f"Also descend into {', '.join(p.rstrip('/') for p in DEFAULT_EXCLUDES[:6])}, ...")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="Stop at the first violation and cancel the remaining files")
+    parser.add_argument("--max-violations", type=int, metavar="N",
+                        help="Stop once N violations have been reported")
+    parser.add_argument("--file-timeout", type=float, metavar="SECONDS",
+                        help="Give up on a file whose rules run longer than this and report it as TIMEOUT")
+    parser.add_argument("--baseline", type=str, metavar="FILE",
+                        help="Only report violations that are not recorded in this baseline file")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record every current violation in the --baseline file instead of reporting")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time every rule, parse and read per file; print a table and save reports/profile_*.json")
+    parser.add_argument("--profile-sort", choices=profiling.SORT_FIELDS, default="wall",
+                        help="Sort the --profile table and JSON by this field. Default: wall")
+    parser.add_argument("--sort", choices=sorted(SORT_KEYS), dest="sort_by",
+                        help="Group violations by file (in path order) and sort each file's violations by line or rule")
+    parser.add_argument("--shard", type=str, metavar="I/N",
+                        help="Only check shard I of N (a stable, hash-based subset of the files) "
+                             "and write a partial result file for --merge")
+    parser.add_argument("--shard-output", type=str, metavar="FILE",
+                        help="Where --shard writes its partial results. Default: reports/shard_I_of_N.json.gz")
+    parser.add_argument("--merge", nargs="+", metavar="PARTIAL",
+                        help="Instead of checking a path, merge the --shard partial result files of every shard "
+                             "into one report (with --json/--summary/--md and --sort)")
     args = parser.parse_args()
 
+    if args.merge:
+        if args.path is not None:
+            parser.error("--merge combines partial result files and does not take a path")
+        _merge_main(parser, args)
+        return
+    if args.path is None:
+        parser.error("the following arguments are required: path")
+
     # Determine output format
-    if args.json:
+    if args.jsonl:
+        output_format = "jsonl"
+    elif args.json:
         output_format = "json"
     elif args.summary:
         output_format = "summary"
@@ -72,37 +482,287 @@ def main():
     else:
         output_format = "text"
 
-    # Run compliance check
-    result = check_compliance(args.path, output_format)
+    cache_dir = None if args.no_cache else args.cache_dir
+    if args.changed_lines_only and not args.changed_since:
+        parser.error("--changed-lines-only requires --changed-since")
+
+    traversal = TraversalOptions(
+        exclude=tuple(args.exclude),
+        max_file_size=args.max_file_size,
+        use_gitignore=not args.no_gitignore,
+        default_excludes=() if args.no_default_excludes else DEFAULT_EXCLUDES,
+    )
+
+    if args.max_violations is not None and args.max_violations < 1:
+        parser.error("--max-violations must be at least 1")
+    if args.file_timeout is not None and args.file_timeout <= 0:
+        parser.error("--file-timeout must be positive")
+    budget = None
+    if args.fail_fast or args.max_violations is not None or args.file_timeout is not None:
+        budget = CheckBudget(max_violations=1 if args.fail_fast else args.max_violations, file_timeout=args.file_timeout)
+
+    if args.shard is not None:
+        try:
+            args.shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+        if output_format != "text" or args.sort_by or args.watch:
+            parser.error("--shard writes a partial result file; choose the report format and --sort when merging")
+        if budget is not None and budget.max_violations is not None:
+            parser.error("--fail-fast and --max-violations would stop each shard on its own count; "
+                         "they cannot be combined with --shard")
+        if args.update_baseline:
+            parser.error("--update-baseline would save only this shard's violations; record the baseline with a full run")
+    elif args.shard_output:
+        parser.error("--shard-output requires --shard")
+
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline requires --baseline")
+    if args.update_baseline:
+        # Fingerprints carry no file name, so a narrowed run cannot keep the entries of files it skipped
+        narrowing = [
+            flag for flag, is_set in (
+                ("--changed-since", args.changed_since is not None),
+                ("--exclude", bool(args.exclude)),
+                ("--max-file-size", args.max_file_size is not None),
+                ("--fail-fast/--max-violations", budget is not None and budget.max_violations is not None),
+            ) if is_set
+        ]
+        if narrowing:
+            parser.error(f"--update-baseline rewrites the whole baseline and cannot be combined with "
+                         f"{', '.join(narrowing)}, which narrow the checked files or violations")
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = BaselineIndex.load(args.baseline, record=args.update_baseline)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    if args.watch:
+        if is_archive(args.path):
+            parser.error("--watch does not support archives")
+        # Watch mode prints text diagnostics per change; these flags only apply to a one-off report
+        ignored = [
+            flag for flag, is_set in (
+                ("--json/--summary/--md/--jsonl", output_format != "text"),
+                ("--jobs", args.jobs != 1),
+                ("--readers", args.readers != 0),
+                ("--sort", args.sort_by is not None),
+                ("--changed-since", args.changed_since is not None),
+                ("--fail-fast/--max-violations/--file-timeout", budget is not None),
+                ("--baseline", baseline is not None),
+                ("--profile", args.profile),
+            ) if is_set
+        ]
+        if ignored:
+            parser.error(f"--watch cannot be combined with {', '.join(ignored)}")
+        watch_compliance(args.path, interval=args.interval, cache_dir=cache_dir, traversal=traversal)
+        return
 
     # Create reports folder and base filename
     os.makedirs("reports", exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     base_path = f"reports/report_{timestamp}"
 
+    if not args.profile:
+        _run_report(parser, args, output_format, cache_dir, traversal, base_path, budget, baseline)
+        _finish_baseline(args, baseline)
+        _exit_for_budget(budget)
+        return
+
+    # Rules only run in this process for files that are not cached, so profile a serial, uncached scan
+    args.jobs = 1
+    args.readers = 0
+    collector = profiling.ProfileCollector()
+    with profiling.hooked(collector):
+        _run_report(parser, args, output_format, None, traversal, base_path, budget, baseline)
+    print("\n" + collector.format_table(args.profile_sort), file=sys.stderr)
+    profile_path = f"reports/profile_{timestamp}.json"
+    with open(profile_path, "w", encoding="utf-8") as f:
+        json.dump(collector.to_dict(args.profile_sort), f, indent=2)
+    print(f"\n✅ Profile saved to {profile_path}", file=sys.stderr)
+    _finish_baseline(args, baseline)
+    _exit_for_budget(budget)
+
+def _merge_main(parser: argparse.ArgumentParser, args) -> None:
+    """
+    `main.py --merge PARTIAL...`: combine the --shard partial result files into one report.
+    """
+    # Only the report format and --sort apply to a merge; every other option belongs to the shard runs
+    report_options = {"merge", "path", "json", "summary", "md", "sort_by"}
+    scan_flags = [
+        "--" + dest.replace("_", "-")
+        for dest, value in vars(args).items()
+        if dest not in report_options and value != parser.get_default(dest)
+    ]
+    if scan_flags:
+        parser.error(f"--merge cannot be combined with {', '.join(scan_flags)}; apply them to the shard runs")
+
+    if args.json:
+        output_format = "json"
+    elif args.summary:
+        output_format = "summary"
+    elif args.md:
+        output_format = "markdown"
+    else:
+        output_format = "text"
+
+    try:
+        root, results = _merged_results(args.merge, args.sort_by)
+    except ValueError as e:
+        parser.error(str(e))
+
+    os.makedirs("reports", exist_ok=True)
+    base_path = f"reports/report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    _print_report(
+        output_format,
+        base_path,
+        lambda fmt, sink: _write_report(iter(results), fmt, sink, root, sort_by=args.sort_by),
+        lambda fmt: _render_report(results, fmt, root, sort_by=args.sort_by),
+    )
+
+def _finish_baseline(args, baseline: BaselineIndex | None) -> None:
+    if baseline is None:
+        return
+    if args.update_baseline:
+        baseline.save(args.baseline)
+        print(f"\n✅ Baseline with {len(baseline)} violation(s) saved to {args.baseline}", file=sys.stderr)
+    elif baseline.suppressed:
+        print(f"\nℹ️ {baseline.suppressed} baseline violation(s) suppressed", file=sys.stderr)
+
+def _exit_for_budget(budget: CheckBudget | None) -> None:
+    """
+    With --fail-fast, --max-violations or --file-timeout, exit 1 if violations were found,
+    3 if a file timed out, and 0 otherwise.
+    """
+    if budget is None:
+        return
+    if budget.stopped:
+        print(f"\n⚠️ Stopped after {budget.violations} violation(s); remaining files were not checked.", file=sys.stderr)
+    if budget.timed_out:
+        print(f"\n⚠️ {len(budget.timed_out)} file(s) exceeded --file-timeout.", file=sys.stderr)
+    sys.exit(budget.exit_code())
+
+def _run_report(
+    parser,
+    args,
+    output_format: str,
+    cache_dir: str | None,
+    traversal: TraversalOptions,
+    base_path: str,
+    budget: CheckBudget | None = None,
+    baseline: BaselineIndex | None = None,
+):
+    """
+    Run the check for parsed CLI `args`, print the report and save it under `base_path`.
+    """
+    if args.shard is not None:
+        index, count = args.shard
+        sink_path = args.shard_output or f"reports/shard_{index}_of_{count}.json.gz"
+        try:
+            files, violations = check_shard(
+                args.path,
+                args.shard,
+                sink_path,
+                jobs=args.jobs,
+                cache_dir=cache_dir,
+                changed_since=args.changed_since,
+                changed_lines_only=args.changed_lines_only,
+                traversal=traversal,
+                readers=args.readers,
+                budget=budget,
+                baseline=baseline,
+            )
+        except (RuntimeError, ValueError) as e:
+            parser.error(str(e))
+        print(f"✅ Shard {index}/{count}: {files} file(s), {violations} violation(s) saved to {sink_path}")
+        return
+
+    if output_format == "jsonl":
+        # Stream each violation to stdout and the report file as soon as its file is checked
+        violations = iter_compliance(
+            args.path,
+            jobs=args.jobs,
+            cache_dir=cache_dir,
+            changed_since=args.changed_since,
+            changed_lines_only=args.changed_lines_only,
+            traversal=traversal,
+            readers=args.readers,
+            budget=budget,
+            baseline=baseline,
+        )
+        try:
+            with open(base_path + ".jsonl", "w", encoding="utf-8") as f:
+                for v in violations:
+                    line = json.dumps(v)
+                    print(line, flush=True)
+                    f.write(line + "\n")
+        except RuntimeError as e:
+            parser.error(str(e))
+        print(f"\n✅ JSON Lines report saved to {base_path}.jsonl", file=sys.stderr)
+        return
+
+    options = {
+        "jobs": args.jobs,
+        "cache_dir": cache_dir,
+        "changed_since": args.changed_since,
+        "changed_lines_only": args.changed_lines_only,
+        "sort_by": args.sort_by,
+        "traversal": traversal,
+        "readers": args.readers,
+        "budget": budget,
+        "baseline": baseline,
+    }
+
+    try:
+        _print_report(
+            output_format,
+            base_path,
+            lambda fmt, sink: write_compliance_report(args.path, fmt, sink, **options),
+            # JSON is serialized straight from the compact store
+            lambda fmt: check_compliance(args.path, fmt, **options),
+        )
+    except RuntimeError as e:
+        parser.error(str(e))
+
+def _print_report(output_format: str, base_path: str, write, render) -> None:
+    """
+    Print a "text", "markdown", "json" or "summary" report and save it under `base_path`.
+    `write(format, sink)` streams a text or Markdown report; `render(format)` returns the
+    "store" or "summary" result.
+    """
+    if output_format == "markdown":
+        # Stream rows into the report file, then echo it to the console
+        with open(base_path + ".md", "w", encoding="utf-8") as f:
+            write("markdown", f)
+        with open(base_path + ".md", "r", encoding="utf-8") as f:
+            shutil.copyfileobj(f, sys.stdout)
+        print(f"\n✅ Markdown report saved to {base_path}.md")
+        return
+
+    if output_format == "text":
+        write("text", sys.stdout)
+        return
+
+    result = render("store" if output_format == "json" else output_format)
+
     # Output handling
     if output_format == "json":
-        output = json.dumps(result, indent=2)
-        print(output)
         with open(base_path + ".json", "w", encoding="utf-8") as f:
-            f.write(output)
+            if isinstance(result, ViolationStore):
+                result.write_json(f)
+            else:
+                f.write(json.dumps(result, indent=2))
+        with open(base_path + ".json", "r", encoding="utf-8") as f:
+            shutil.copyfileobj(f, sys.stdout)
+        print()
         print(f"\n✅ JSON report saved to {base_path}.json")
 
-    elif output_format == "markdown":
-        print(result)
-        with open(base_path + ".md", "w", encoding="utf-8") as f:
-            f.write(result)
-        print(f"\n✅ Markdown report saved to {base_path}.md")
-
     elif output_format == "summary":
         print(result)
         with open(base_path + "_summary.txt", "w", encoding="utf-8") as f:
             f.write(result)
         print(f"\n✅ Summary report saved to {base_path}_summary.txt")
 
-    else:  # text
-        print(result)
-
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
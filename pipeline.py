@@ -0,0 +1,92 @@
+"""
+File name: pipeline.py
+
+Description: Pipelined reading for slow (e.g. NFS-mounted) filesystems.
+Reader threads prefetch file contents a bounded number of files ahead of the
+checker, so read latency overlaps with rule evaluation. The bound gives
+backpressure: readers stop when the checker falls behind. Both a synchronous
+generator and an asyncio variant are provided; both keep file order.
+"""
+
+from collections import deque
+
+DEFAULT_READERS = 4
+DEFAULT_PREFETCH = 16
+
+def read_source(file_path: str) -> bytes | None:
+    """
+    Read a file's bytes. XML is left for the checker to stream in constant memory.
+    """
+    if file_path.endswith(".xml"):
+        return None
+    with open(file_path, "rb") as f:
+        return f.read()
+
+def iter_prefetched(files, readers: int = DEFAULT_READERS, prefetch: int = DEFAULT_PREFETCH):
+    """
+    Yield (file_path, raw) in file order while up to `prefetch` reads run ahead on `readers` threads.
+    """
+    prefetch = max(prefetch, readers)
+    from concurrent.futures import ThreadPoolExecutor  # deferred: only needed with --readers
+
+    pool = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="reader")
+    try:
+        window = deque()
+        for file_path in files:
+            window.append((file_path, pool.submit(read_source, file_path)))
+            if len(window) >= prefetch:
+                file_path, future = window.popleft()
+                yield file_path, future.result()
+        while window:
+            file_path, future = window.popleft()
+            yield file_path, future.result()
+    finally:
+        # On an early exit (fail-fast, a consumer that breaks), drop the reads that have not started
+        pool.shutdown(wait=True, cancel_futures=True)
+
+async def aiter_file_results(
+    files,
+    check,
+    readers: int = DEFAULT_READERS,
+    prefetch: int = DEFAULT_PREFETCH,
+):
+    """
+    Async generator of (file_path, violations, function_count) in file order.
+    File discovery and reads run in threads, at most `readers` reads at a time and
+    at most `prefetch` files ahead of the checker (a bounded asyncio.Queue).
+    `check(file_path, raw)` runs in a worker thread so the event loop keeps reading.
+    """
+    import asyncio  # already loaded by the running event loop; not imported at CLI startup
+
+    queue = asyncio.Queue(maxsize=max(1, prefetch))
+    semaphore = asyncio.Semaphore(max(1, readers))
+    done = object()
+    files = iter(files)
+
+    async def read(file_path):
+        async with semaphore:
+            return await asyncio.to_thread(read_source, file_path)
+
+    async def produce():
+        while (file_path := await asyncio.to_thread(next, files, done)) is not done:
+            await queue.put((file_path, asyncio.create_task(read(file_path))))
+        await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (item := await queue.get()) is not None:
+            file_path, read_task = item
+            raw = await read_task
+            violations, function_count = await asyncio.to_thread(check, file_path, raw)
+            yield file_path, violations, function_count
+        await producer
+    finally:
+        # On an early exit, stop discovery and cancel the reads still queued or waiting for a reader
+        producer.cancel()
+        pending = [producer]
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not None:
+                item[1].cancel()
+                pending.append(item[1])
+        await asyncio.gather(*pending, return_exceptions=True)
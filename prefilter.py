@@ -0,0 +1,90 @@
+"""
+File name: prefilter.py
+
+Description: Byte-level trigger prefilter for the rule engines.
+A rule may declare "triggers": literal byte strings, at least one of which must
+appear in a file for the rule to possibly report anything there (b"print" for the
+print() rule, b"SNAPSHOT" for the SNAPSHOT version rule). Rules without triggers are
+unconditional. Before a file is parsed, one search over its raw bytes (memory-mapped
+when the file is streamed from disk) finds which triggers occur, and the engines
+only dispatch the rules that can fire. Triggers are matched against the raw bytes,
+so a rule must only declare literals that appear verbatim whenever it could fire.
+"""
+
+import mmap
+import re
+from functools import lru_cache
+
+def triggers(*patterns: bytes):
+    """
+    Decorator declaring the trigger byte patterns of a function rule.
+    """
+    def decorate(rule_fn):
+        rule_fn.triggers = patterns
+        return rule_fn
+    return decorate
+
+def rule_triggers(rule) -> tuple[bytes, ...] | None:
+    """
+    The triggers of a dict, function or XmlRule rule, or None if it is unconditional.
+    """
+    found = rule.get("triggers") if isinstance(rule, dict) else getattr(rule, "triggers", None)
+    return tuple(found) if found else None
+
+@lru_cache(maxsize=256)
+def _trigger_regex(patterns: frozenset) -> re.Pattern:
+    # Longest first, so a trigger that is a prefix of another does not hide it
+    ordered = sorted(patterns, key=lambda p: (-len(p), p))
+    return re.compile(b"|".join(re.escape(p) for p in ordered))
+
+class Prefilter:
+    """
+    The combined triggers of a list of rules, searched for in one pass.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.triggers = frozenset(p for rule in self.rules for p in rule_triggers(rule) or ())
+
+    def scan(self, data) -> frozenset:
+        """
+        Return the triggers that occur in `data` (bytes, memoryview or mmap).
+        Each hit removes its trigger from the search, so the data is scanned about
+        once however often the triggers occur.
+        """
+        remaining = self.triggers
+        found = set()
+        pos = 0
+        while remaining:
+            match = _trigger_regex(remaining).search(data, pos)
+            if match is None:
+                break
+            hit = match.group()
+            found.add(hit)
+            remaining = remaining - {hit}
+            pos = match.start()  # another trigger may start at the same offset
+        return frozenset(found)
+
+    def scan_file(self, file_path: str) -> frozenset:
+        """
+        scan() over a memory-mapped file, without reading it into memory.
+        """
+        if not self.triggers:
+            return frozenset()
+        with open(file_path, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files cannot be mapped
+                return frozenset()
+            with data:
+                return self.scan(data)
+
+    def select(self, found: frozenset) -> list:
+        """
+        The rules, in order, that are unconditional or have a trigger in `found`.
+        """
+        return [rule for rule in self.rules if selected(rule, found)]
+
+def selected(rule, found: frozenset) -> bool:
+    patterns = rule_triggers(rule)
+    return patterns is None or not found.isdisjoint(patterns)
@@ -0,0 +1,428 @@
+"""
+File name: rule_compiler.py
+
+Description: Declarative pattern rules and their compiler.
+Pattern-style rules (forbidden calls, forbidden line regexes and naming patterns)
+are declared as data in config/pattern_rules.json instead of as hand-written
+checkers. At load time they are compiled per language into:
+  - one dict from callee name to rules, consulted once per call site,
+  - one table from AST node type (or Java declaration kind) to naming regexes,
+  - one merged regex alternation used as a per-line prefilter, so a line is only
+    tested against the individual patterns when at least one of them matches.
+Adding more declarative rules therefore adds table entries, not passes over the file.
+
+A rule file looks like:
+
+    {"rules": [
+        {"id": "R007", "kind": "forbidden_call", "languages": ["py"],
+         "calls": ["eval", "exec"], "message": "Avoid {name}()."},
+        {"id": "R009", "kind": "forbidden_line", "languages": ["py", "java"],
+         "pattern": "(?i)password\\s*=\\s*\\"", "message": "Possible hard-coded password."},
+        {"id": "R010", "kind": "naming", "languages": ["py"], "target": "class",
+         "pattern": "[A-Z][A-Za-z0-9]*", "message": "Class '{name}' should be in CapWords."}
+    ]}
+
+Calls are dotted names ("os.system"); a leading "*." matches the method on any
+receiver ("*.printStackTrace"). Messages may use {name} for the matched call or name.
+A rule may list "triggers", literal strings one of which must occur in a file for
+the rule to fire (see prefilter.py). Forbidden calls and Python naming rules derive
+them (the called name, "class" or "def"); other rules without triggers always run.
+"""
+
+import ast
+import json
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from xml_stream import XmlRule
+
+if TYPE_CHECKING:
+    from java_parser import JavaIndex
+
+RULE_KINDS = ("forbidden_call", "forbidden_line", "naming")
+LANGUAGES = ("py", "java", "xml")
+
+# Which kinds each language supports, and the naming targets per language
+_LANGUAGE_KINDS = {
+    "py": ("forbidden_call", "forbidden_line", "naming"),
+    "java": ("forbidden_call", "forbidden_line", "naming"),
+    "xml": ("forbidden_line",),
+}
+_PY_NAMING_TARGETS = {
+    "function": (ast.FunctionDef, ast.AsyncFunctionDef),
+    "class": (ast.ClassDef,),
+}
+_JAVA_NAMING_TARGETS = ("class", "method")
+
+_GLOBAL_FLAGS_RE = re.compile(r"^\(\?([aiLmsux]+)\)")
+# \1 or (?(1)...) after an even number of backslashes: group numbers shift once patterns are merged
+_NUMBERED_GROUP_REF_RE = re.compile(r"(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?\(\d)")
+
+class RuleDefinitionError(ValueError):
+    """
+    A declarative rule is malformed.
+    """
+
+@dataclass(frozen=True)
+class PatternRule:
+    id: str
+    kind: str
+    languages: tuple[str, ...]
+    message: str
+    description: str = ""
+    calls: tuple[str, ...] = ()
+    pattern: str | None = None
+    target: str | None = None
+    triggers: tuple[bytes, ...] | None = None
+
+    def violation(self, line: int, name: str = "") -> dict:
+        return {"id": self.id, "line": line, "message": self.message.format(name=name)}
+
+def parse_rule(spec: dict) -> PatternRule:
+    """
+    Validate one rule declaration and return it as a PatternRule.
+    """
+    if not isinstance(spec, dict):
+        raise RuleDefinitionError(f"Rule must be an object, got {spec!r}")
+    rule_id = spec.get("id")
+    if not rule_id:
+        raise RuleDefinitionError(f"Rule is missing an 'id': {spec!r}")
+    kind = spec.get("kind")
+    if kind not in RULE_KINDS:
+        raise RuleDefinitionError(f"{rule_id}: 'kind' must be one of {', '.join(RULE_KINDS)}")
+    languages = tuple(spec.get("languages") or ())
+    if not languages:
+        raise RuleDefinitionError(f"{rule_id}: 'languages' must list at least one of {', '.join(LANGUAGES)}")
+    for language in languages:
+        if language not in LANGUAGES:
+            raise RuleDefinitionError(f"{rule_id}: unknown language '{language}'")
+        if kind not in _LANGUAGE_KINDS[language]:
+            raise RuleDefinitionError(f"{rule_id}: '{kind}' rules are not supported for {language}")
+    if not spec.get("message"):
+        raise RuleDefinitionError(f"{rule_id}: 'message' is required")
+
+    rule = PatternRule(
+        id=rule_id,
+        kind=kind,
+        languages=languages,
+        message=spec["message"],
+        description=spec.get("description", ""),
+        calls=tuple(spec.get("calls") or ()),
+        pattern=spec.get("pattern"),
+        target=spec.get("target"),
+        triggers=_parse_triggers(rule_id, spec.get("triggers")),
+    )
+    if kind == "forbidden_call" and not rule.calls:
+        raise RuleDefinitionError(f"{rule_id}: 'calls' must list at least one name")
+    if kind in ("forbidden_line", "naming"):
+        if not rule.pattern:
+            raise RuleDefinitionError(f"{rule_id}: 'pattern' is required")
+        try:
+            re.compile(rule.pattern)
+        except re.error as e:
+            raise RuleDefinitionError(f"{rule_id}: invalid pattern: {e}") from e
+    if kind == "forbidden_line" and _NUMBERED_GROUP_REF_RE.search(rule.pattern):
+        raise RuleDefinitionError(
+            f"{rule_id}: numbered group references are not supported in forbidden_line patterns, "
+            "which are merged into one alternation; use (?P<name>...) and (?P=name)"
+        )
+    if kind == "naming":
+        for language in languages:
+            targets = tuple(_PY_NAMING_TARGETS) if language == "py" else _JAVA_NAMING_TARGETS
+            if rule.target not in targets:
+                raise RuleDefinitionError(f"{rule_id}: 'target' for {language} must be one of {', '.join(targets)}")
+    return rule
+
+def _parse_triggers(rule_id: str, values) -> tuple[bytes, ...] | None:
+    if values is None:
+        return None
+    if not isinstance(values, list) or not values or not all(isinstance(v, str) and v for v in values):
+        raise RuleDefinitionError(f"{rule_id}: 'triggers' must be a list of non-empty strings")
+    return tuple(v.encode("utf-8") for v in values)
+
+def load_rules(path: str) -> list[PatternRule]:
+    """
+    Read and validate the rules in a JSON rule file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise RuleDefinitionError(f"{path}: invalid JSON: {e}") from e
+    specs = data.get("rules", []) if isinstance(data, dict) else data
+    rules = [parse_rule(spec) for spec in specs]
+    seen = set()
+    for rule in rules:
+        if rule.id in seen:
+            raise RuleDefinitionError(f"{path}: duplicate rule id '{rule.id}'")
+        seen.add(rule.id)
+    return rules
+
+def _scoped(pattern: str) -> str:
+    """
+    Wrap a pattern for use inside an alternation, turning leading global flags such as (?i) into a scoped group.
+    """
+    match = _GLOBAL_FLAGS_RE.match(pattern)
+    if match:
+        return f"(?{match.group(1)}:{pattern[match.end():]})"
+    return f"(?:{pattern})"
+
+class LineMatcher:
+    """
+    Forbidden-line rules for one language. The merged alternation rejects most lines
+    with a single search; only lines it accepts are tested against each rule.
+    """
+
+    def __init__(self, rules: list[PatternRule]):
+        self.rules = [(rule, re.compile(rule.pattern)) for rule in rules]
+        self.combined = None
+        if rules:
+            try:
+                self.combined = re.compile("|".join(_scoped(rule.pattern) for rule in rules))
+            except re.error as e:  # e.g. two rules defining the same group name
+                ids = ", ".join(rule.id for rule in rules)
+                raise RuleDefinitionError(f"Forbidden-line rules {ids} cannot be merged: {e}") from e
+
+    def __bool__(self) -> bool:
+        return self.combined is not None
+
+    def match(self, lineno: int, line: str) -> list[dict]:
+        if self.combined is None or self.combined.search(line) is None:
+            return []
+        return [rule.violation(lineno) for rule, regex in self.rules if regex.search(line)]
+
+    def match_lines(self, lines) -> list[dict]:
+        if self.combined is None:
+            return []
+        search = self.combined.search
+        violations = []
+        for lineno, line in enumerate(lines, start=1):
+            if search(line) is not None:
+                violations.extend(rule.violation(lineno) for rule, regex in self.rules if regex.search(line))
+        return violations
+
+class CallTable:
+    """
+    Forbidden calls for one language, keyed by full dotted name and by method name for "*." entries.
+    """
+
+    def __init__(self, rules: list[PatternRule]):
+        self.exact: dict[str, list[PatternRule]] = {}
+        self.any_receiver: dict[str, list[PatternRule]] = {}
+        for rule in rules:
+            for call in rule.calls:
+                if call.startswith("*."):
+                    self.any_receiver.setdefault(call[2:], []).append(rule)
+                else:
+                    self.exact.setdefault(call, []).append(rule)
+
+    def __bool__(self) -> bool:
+        return bool(self.exact or self.any_receiver)
+
+    def lookup(self, dotted: str | None, method: str | None) -> list[tuple[PatternRule, str]]:
+        hits = [(rule, dotted) for rule in self.exact.get(dotted, ())] if dotted else []
+        if method is not None:
+            hits.extend((rule, dotted or method) for rule in self.any_receiver.get(method, ()))
+        return hits
+
+def _dotted_name(node: ast.AST) -> str | None:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _dotted_name(node.value)
+        return f"{base}.{node.attr}" if base is not None else None
+    return None
+
+def _rule_triggers(rule: PatternRule, language: str) -> tuple[bytes, ...] | None:
+    if rule.triggers is not None:
+        return rule.triggers
+    if rule.kind == "forbidden_call":
+        return tuple(call.rpartition(".")[2].encode("utf-8") for call in rule.calls)
+    if rule.kind == "naming" and language == "py":
+        return (b"class",) if rule.target == "class" else (b"def",)
+    return None
+
+class CompiledRules:
+    """
+    All declarative rules, compiled into per-language dispatch tables.
+    """
+
+    def __init__(self, rules: list[PatternRule]):
+        self.rules = rules
+
+        def select(language, kind):
+            return [rule for rule in rules if language in rule.languages and rule.kind == kind]
+
+        self.py_calls = CallTable(select("py", "forbidden_call"))
+        self.py_lines = LineMatcher(select("py", "forbidden_line"))
+        self.py_names: dict[type, list[tuple[PatternRule, re.Pattern]]] = {}
+        for rule in select("py", "naming"):
+            for node_type in _PY_NAMING_TARGETS[rule.target]:
+                self.py_names.setdefault(node_type, []).append((rule, re.compile(rule.pattern)))
+
+        self.java_calls = CallTable(select("java", "forbidden_call"))
+        self.java_lines = LineMatcher(select("java", "forbidden_line"))
+        self.java_names: dict[str, list[tuple[PatternRule, re.Pattern]]] = {}
+        for rule in select("java", "naming"):
+            self.java_names.setdefault(rule.target, []).append((rule, re.compile(rule.pattern)))
+
+        self.xml_lines = LineMatcher(select("xml", "forbidden_line"))
+
+    def has_rules(self, language: str) -> bool:
+        return any(language in rule.languages for rule in self.rules)
+
+    def triggers(self, language: str, kinds: tuple[str, ...] = RULE_KINDS) -> tuple[bytes, ...] | None:
+        """
+        The combined triggers of the `language` rules of `kinds`, or None if any of them is unconditional.
+        """
+        patterns = set()
+        for rule in self.rules:
+            if language not in rule.languages or rule.kind not in kinds:
+                continue
+            rule_patterns = _rule_triggers(rule, language)
+            if rule_patterns is None:
+                return None
+            patterns.update(rule_patterns)
+        return tuple(sorted(patterns)) or None
+
+    # Python
+
+    def python_node_types(self) -> tuple[type, ...]:
+        types = tuple(self.py_names)
+        return (ast.Call,) + types if self.py_calls else types
+
+    def check_python_node(self, node: ast.AST, *, ctx=None) -> list[dict]:
+        if isinstance(node, ast.Call):
+            func = node.func
+            method = func.attr if isinstance(func, ast.Attribute) else None
+            return [
+                rule.violation(node.lineno, name)
+                for rule, name in self.py_calls.lookup(_dotted_name(func), method)
+            ]
+        return [
+            rule.violation(node.lineno, node.name)
+            for rule, regex in self.py_names.get(type(node), ())
+            if not regex.fullmatch(node.name)
+        ]
+
+    def check_python_lines(self, tree: ast.AST, *, ctx=None) -> list[dict]:
+        if ctx is None:
+            return []
+        return self.py_lines.match_lines(ctx.lines)
+
+    def python_rules(self) -> tuple[list[dict], list[dict]]:
+        """
+        Return (tree-level, node-level) rule dicts for the Python engine.
+        """
+        tree_rules, node_rules = [], []
+        if self.py_lines:
+            tree_rules.append({
+                "id": "PATTERN_LINES",
+                "description": "Declarative forbidden-line rules.",
+                "check": self.check_python_lines,
+                "triggers": self.triggers("py", ("forbidden_line",)),
+            })
+        node_types = self.python_node_types()
+        if node_types:
+            node_rules.append({
+                "id": "PATTERN_NODES",
+                "description": "Declarative forbidden-call and naming rules.",
+                "check": self.check_python_node,
+                "node_types": node_types,
+                "triggers": self.triggers("py", ("forbidden_call", "naming")),
+            })
+        return tree_rules, node_rules
+
+    # Java
+
+    def check_java(self, index: "JavaIndex", lines=()) -> list[dict]:
+        violations = []
+        if self.java_calls:
+            violations.extend(self._java_calls(index))
+        for cls in index.classes:
+            for rule, regex in self.java_names.get("class", ()):
+                if not regex.fullmatch(cls.name):
+                    violations.append(rule.violation(cls.line, cls.name))
+        for method in index.methods:
+            if method.name == method.class_name:
+                continue  # constructors are named after their class
+            for rule, regex in self.java_names.get("method", ()):
+                if not regex.fullmatch(method.name):
+                    violations.append(rule.violation(method.line, method.name))
+        violations.extend(self.java_lines.match_lines(lines))
+        return violations
+
+    def _java_calls(self, index: "JavaIndex") -> list[dict]:
+        """
+        One pass over the code tokens: follow each dotted identifier chain and look it up when a "(" follows.
+        A chain continues through a call's argument list, so Runtime.getRuntime().exit(1) is looked up
+        as "Runtime.getRuntime.exit". A chain that starts after a constructor call, ")" of a parenthesized
+        expression or "]" (a method called on an expression) only matches "*." entries.
+        """
+        violations = []
+        chain: list[str] = []
+        start_line = 0
+        expect_ident = True
+        after_new = False
+        # One entry per open "(": the chain of the call it opened (None for grouping parentheses)
+        open_calls: list[tuple[list[str], int] | None] = []
+        for token in index.code_tokens:
+            if token.kind == "ident":
+                if not expect_ident or not chain:
+                    after_new = bool(chain) and chain[-1] == "new" and not expect_ident
+                    chain = []
+                    start_line = token.line
+                chain.append(token.value)
+                expect_ident = False
+            elif token.value == ".":
+                if not chain:
+                    chain = [None]
+                    start_line = token.line
+                expect_ident = True
+            elif token.value == "(":
+                if chain and not expect_ident:
+                    dotted = ".".join(chain) if chain[0] is not None else None
+                    method = chain[-1] if len(chain) > 1 else None
+                    violations.extend(
+                        rule.violation(start_line, name) for rule, name in self.java_calls.lookup(dotted, method)
+                    )
+                    open_calls.append(([None] if after_new else chain, start_line))
+                else:
+                    open_calls.append(None)
+                chain = []
+                expect_ident = True
+                after_new = False
+            elif token.value == ")" and open_calls:
+                # The call's result can be the receiver of the next ".name(...)"
+                call = open_calls.pop()
+                chain, start_line = call if call is not None else ([], 0)
+                expect_ident = False
+            else:
+                chain = []
+                expect_ident = True
+        return violations
+
+    # XML
+
+    def xml_rule_class(self) -> type[XmlRule] | None:
+        """
+        An XmlRule class checking every line against the XML forbidden-line rules, or None if there are none.
+        """
+        if not self.xml_lines:
+            return None
+        return type("XmlPatternRule", (XmlPatternRule,), {"matcher": self.xml_lines, "triggers": self.triggers("xml")})
+
+class XmlPatternRule(XmlRule):
+    """
+    Declarative forbidden-line rules applied while the XML document streams past.
+    """
+    id = "xml_pattern_rules"
+    description = "Declarative forbidden-line rules."
+    matcher: LineMatcher | None = None
+
+    def check_line(self, lineno: int, line: str) -> list[dict]:
+        return self.matcher.match(lineno, line)
+
+def compile_rules(rules: list[PatternRule]) -> CompiledRules:
+    return CompiledRules(rules)
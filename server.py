@@ -0,0 +1,158 @@
+"""
+File name: server.py
+
+Description: Long-running local compliance server.
+Keeps the rule registry imported and a bounded in-memory cache of per-file
+results (keyed by file stat and content hash), and answers check_compliance
+requests from editors and LLM orchestrators concurrently over localhost HTTP.
+
+    POST /check_compliance   {"path": "...", "output_format": "json", ...}
+    POST /check_sources      {"items": [{"path": "...", "language": "py", "content": "..."}]}
+    GET  /health
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cache import MemoryResultCache, close_thread_caches
+from main import check_compliance, check_sources
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Request fields forwarded to check_compliance and their accepted types; anything else is rejected
+REQUEST_FIELDS = {
+    "path": (str,),
+    "output_format": (str,),
+    "changed_since": (str, type(None)),
+    "changed_lines_only": (bool,),
+    "sort_by": (str, type(None)),
+}
+
+class ComplianceRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ComplianceServer/1.0"
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        # Each request runs in a new thread; close its SQLite connections before the client sees the reply
+        close_thread_caches()
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        try:
+            self._handle_post()
+        finally:
+            close_thread_caches()  # also when the handler raised before replying
+
+    def _handle_post(self):
+        if self.path not in ("/check_compliance", "/check_sources"):
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+
+        if self.path == "/check_sources":
+            self._check_sources(request)
+            return
+
+        if not isinstance(request, dict) or "path" not in request:
+            self._send_json(400, {"error": "Request must be a JSON object with a 'path'"})
+            return
+        unknown = sorted(set(request) - set(REQUEST_FIELDS))
+        if unknown:
+            self._send_json(400, {"error": f"Unknown fields: {', '.join(unknown)}"})
+            return
+        invalid = sorted(name for name, value in request.items() if not isinstance(value, REQUEST_FIELDS[name]))
+        if invalid:
+            self._send_json(400, {"error": f"Invalid types for fields: {', '.join(invalid)}"})
+            return
+
+        try:
+            result = check_compliance(
+                memory_cache=self.server.memory_cache,
+                cache_dir=self.server.cache_dir,
+                **request,
+            )
+        except (RuntimeError, OSError, ValueError) as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, {"result": result})
+
+    def _check_sources(self, request):
+        items = request.get("items") if isinstance(request, dict) else None
+        if not isinstance(items, list) or not all(
+            isinstance(item, dict)
+            and isinstance(item.get("path"), str)
+            and isinstance(item.get("content"), str)
+            and isinstance(item.get("language"), (str, type(None)))
+            for item in items
+        ):
+            self._send_json(400, {"error": "Request must be a JSON object with 'items': [{path, language, content}]"})
+            return
+
+        result = check_sources(
+            ((item["path"], item.get("language"), item["content"]) for item in items),
+            memory_cache=self.server.memory_cache,
+        )
+        self._send_json(200, {"result": result})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def make_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    cache_size: int = 10000,
+    cache_dir: str | None = None,
+    verbose: bool = False,
+) -> ThreadingHTTPServer:
+    """
+    Build (but do not start) a threaded server with its own in-memory result cache.
+    """
+    server = ThreadingHTTPServer((host, port), ComplianceRequestHandler)
+    server.daemon_threads = True
+    server.memory_cache = MemoryResultCache(cache_size)
+    server.cache_dir = cache_dir
+    server.verbose = verbose
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve check_compliance over localhost HTTP with warm caches.")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST, help=f"Interface to bind. Default: {DEFAULT_HOST}")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on. Default: {DEFAULT_PORT}")
+    parser.add_argument("--cache-size", type=int, default=10000,
+                        help="Maximum number of per-file results kept in memory. Default: 10000")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Also use the on-disk result cache in this directory")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.cache_size, args.cache_dir, args.verbose)
+    print(f"✅ Compliance server listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
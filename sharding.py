@@ -0,0 +1,140 @@
+"""
+File name: sharding.py
+
+Description: Splitting a scan across machines and merging the partial results.
+`--shard i/N` keeps the files whose path (relative to the scanned root) hashes to
+shard i, so every node picks a stable, disjoint subset with no coordination. Each
+node writes a partial result file: gzip-compressed JSON holding every checked file
+with its position in the full scan order and function count, plus its violations
+with rule IDs, messages and paths interned. Merging N partials restores the full
+scan order, so the merged report and totals match a single-machine run.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+FORMAT = "compliance-shard"
+VERSION = 1
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """
+    Parse "i/N" (1 <= i <= N) into (i, N).
+    """
+    index, sep, count = spec.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        index = count = 0
+    if not sep or count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {spec!r}; expected i/N with 1 <= i <= N, e.g. 2/8")
+    return index, count
+
+def shard_key(file_path: str, root: str) -> str:
+    """
+    The machine-independent name of `file_path` that is hashed: its "/"-separated path relative to `root`.
+    """
+    if os.path.isdir(root):
+        file_path = os.path.relpath(file_path, root)
+    else:
+        file_path = os.path.basename(file_path)
+    return file_path.replace(os.sep, "/")
+
+def shard_of(key: str, count: int) -> int:
+    """
+    The 1-based shard that owns `key` among `count` shards.
+    """
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % count + 1
+
+def select_shard(files, root: str, index: int, count: int) -> list[tuple[int, str]]:
+    """
+    (position in the full scan, file path) for the files of `files` that belong to shard `index` of `count`.
+    """
+    return [
+        (order, file_path)
+        for order, file_path in enumerate(files)
+        if shard_of(shard_key(file_path, root), count) == index
+    ]
+
+def write_partial(sink_path: str, root: str, shard: tuple[int, int], results) -> tuple[int, int]:
+    """
+    Write the partial result file for `shard` from (order, file_path, violations, function_count) results.
+    Returns (files written, violations written).
+    """
+    files, rules, messages, violations = [], {}, {}, []
+    for order, file_path, file_violations, function_count in results:
+        file_index = len(files)
+        files.append([order, file_path, function_count])
+        for v in file_violations:
+            rule = rules.setdefault(v["id"], len(rules))
+            message = messages.setdefault(v["message"], len(messages))
+            violations.append([file_index, rule, message, v.get("line", 0)])
+
+    data = {
+        "format": FORMAT,
+        "version": VERSION,
+        "root": root,
+        "shard": list(shard),
+        "files": files,
+        "rules": list(rules),
+        "messages": list(messages),
+        "violations": violations,
+    }
+    tmp_path = sink_path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, sink_path)
+    return len(files), len(violations)
+
+def read_partial(path: str) -> dict:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, EOFError, json.JSONDecodeError) as e:
+        raise ValueError(f"{path} is not a compliance shard file: {e}") from e
+    if not isinstance(data, dict) or data.get("format") != FORMAT:
+        raise ValueError(f"{path} is not a compliance shard file")
+    if data.get("version") != VERSION:
+        raise ValueError(f"{path} has shard format version {data.get('version')}, expected {VERSION}")
+    return data
+
+def _partial_results(data: dict):
+    """
+    Yield (order, file_path, violations, function_count) for one partial, in its file order.
+    """
+    rules, messages = data["rules"], data["messages"]
+    per_file = [[] for _ in data["files"]]
+    for file_index, rule, message, line in data["violations"]:
+        per_file[file_index].append({"id": rules[rule], "message": messages[message], "line": line})
+    for (order, file_path, function_count), violations in zip(data["files"], per_file):
+        for v in violations:
+            v["file"] = file_path
+        yield order, file_path, violations, function_count
+
+def merge_partials(paths) -> tuple[str, list[tuple[str, list[dict], int]]]:
+    """
+    Combine the partial result files of every shard of one scan.
+    Returns the scanned root and the (file_path, violations, function_count) results in full scan order.
+    Raises ValueError if the shard counts differ or a shard is missing or repeated.
+    """
+    partials = [read_partial(path) for path in paths]
+    if not partials:
+        raise ValueError("No shard files to merge")
+    root, count = partials[0]["root"], partials[0]["shard"][1]
+    seen = {}
+    for path, data in zip(paths, partials):
+        # Roots are not compared: nodes may check out the same tree at different paths
+        index, data_count = data["shard"]
+        if data_count != count:
+            raise ValueError(f"{path} is shard {index}/{data_count}, not part of a {count}-shard scan")
+        if index in seen:
+            raise ValueError(f"Shard {index}/{count} given twice: {seen[index]} and {path}")
+        seen[index] = path
+    missing = sorted(set(range(1, count + 1)) - set(seen))
+    if missing:
+        raise ValueError(f"Missing shard(s) {', '.join(f'{i}/{count}' for i in missing)}")
+
+    results = sorted((result for data in partials for result in _partial_results(data)), key=lambda r: r[0])
+    return root, [(file_path, violations, function_count) for _, file_path, violations, function_count in results]
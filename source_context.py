@@ -0,0 +1,110 @@
+"""
+File name: source_context.py
+
+Description: Per-file SourceContext shared by every rule.
+Each view of a file (raw bytes, decoded text, lines, line offsets, AST, token
+stream, comments, Java index) is computed lazily on first use and memoized, so no
+artifact is built more than once per file however many rules ask for it.
+"""
+
+import ast
+import io
+import tokenize
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+import profiling
+from xml_stream import iter_file_chunks, iter_text_chunks
+
+if TYPE_CHECKING:
+    from java_parser import JavaIndex
+
+class SourceContext:
+    """
+    Lazily computed, memoized views of one source file.
+    Build it from in-memory `text`/`raw` content or from a `path` on disk.
+    """
+
+    def __init__(self, text: str | None = None, raw: bytes | None = None, path: str | None = None, filetype: str = "py"):
+        if text is None and raw is None and path is None:
+            raise ValueError("SourceContext needs text, raw bytes or a path")
+        self.path = path
+        self.filetype = filetype
+        if text is not None:
+            self.text = text
+        if raw is not None:
+            self.raw = raw
+
+    @cached_property
+    def raw(self) -> bytes:
+        if "text" in self.__dict__:
+            return self.text.encode("utf-8")
+        with profiling.timed(self.path, "io", "read"), open(self.path, "rb") as f:
+            return f.read()
+
+    @cached_property
+    def text(self) -> str:
+        return self.raw.decode("utf-8")
+
+    @cached_property
+    def lines(self) -> list[str]:
+        return self.text.splitlines()
+
+    @cached_property
+    def line_offsets(self) -> list[int]:
+        """
+        Character offset of the start of each line; line N starts at line_offsets[N - 1].
+        """
+        offsets = [0]
+        for line in self.text.splitlines(keepends=True):
+            offsets.append(offsets[-1] + len(line))
+        return offsets[:-1] or [0]
+
+    @cached_property
+    def tree(self) -> ast.Module:
+        """
+        Python AST. Raises SyntaxError for invalid source.
+        """
+        text = self.text
+        with profiling.timed(self.path, "parse", "ast.parse"):
+            return ast.parse(text)
+
+    @cached_property
+    def tokens(self) -> list[tokenize.TokenInfo]:
+        """
+        Python token stream.
+        """
+        text = self.text
+        with profiling.timed(self.path, "parse", "tokenize"):
+            return list(tokenize.generate_tokens(io.StringIO(text).readline))
+
+    @cached_property
+    def java_index(self) -> "JavaIndex":
+        from java_parser import parse_java  # only Java files load the parser
+
+        text = self.text
+        with profiling.timed(self.path, "parse", "parse_java"):
+            return parse_java(text)
+
+    @cached_property
+    def comments(self) -> list[tuple[int, str]]:
+        """
+        (line, comment text) for every comment in the file.
+        """
+        if self.filetype == "java":
+            from java_parser import COMMENT_KINDS
+            return [(t.line, t.value) for t in self.java_index.tokens if t.kind in COMMENT_KINDS]
+        return [(t.start[0], t.string) for t in self.tokens if t.type == tokenize.COMMENT]
+
+    def iter_chunks(self):
+        """
+        Yield the decoded text in chunks, streaming from disk when the text is not loaded yet.
+        """
+        if "text" in self.__dict__ or "raw" in self.__dict__ or self.path is None:
+            return iter_text_chunks(self.text)
+        return iter_file_chunks(self.path)
+
+def as_source_context(source: "str | SourceContext", filetype: str) -> SourceContext:
+    if isinstance(source, SourceContext):
+        return source
+    return SourceContext(text=source, filetype=filetype)
@@ -0,0 +1,68 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import tarfile
+import zipfile
+import pytest
+from archives import ArchiveMembers, is_archive
+from main import check_compliance
+from traversal import TraversalOptions
+
+HERE = os.path.dirname(__file__)
+MEMBERS = {
+    "src/app/bad_example_script.py": "bad_example_script.py",
+    "src/Main.java": "bad_example.java",
+    "pom.xml": "bad_config.xml",
+    "build/generated.py": "bad_example_script.py",
+    "README.txt": "bad_example_script.py",
+}
+
+def _expected(archive_path, names):
+    expected = []
+    for member in names:
+        violations = check_compliance(os.path.join(HERE, MEMBERS[member]), "json")
+        expected.extend({**v, "file": f"{archive_path}!{member}"} for v in violations)
+    return expected
+
+@pytest.fixture
+def jar(tmp_path):
+    path = str(tmp_path / "release.jar")
+    with zipfile.ZipFile(path, "w") as archive:
+        for member, asset in MEMBERS.items():
+            archive.write(os.path.join(HERE, asset), member)
+    return path
+
+@pytest.fixture
+def sdist(tmp_path):
+    path = str(tmp_path / "release.tar.gz")
+    with tarfile.open(path, "w:gz") as archive:
+        for member, asset in MEMBERS.items():
+            archive.add(os.path.join(HERE, asset), "./" + member)
+    return path
+
+def test_zip_members_are_checked_in_name_order(jar):
+    assert is_archive(jar)
+    expected = _expected(jar, ["pom.xml", "src/Main.java", "src/app/bad_example_script.py"])
+    assert check_compliance(jar, "json") == expected
+    assert check_compliance(jar, "json", jobs=2) == expected
+
+def test_tar_members_stream_in_archive_order(sdist):
+    expected = _expected(sdist, ["src/app/bad_example_script.py", "src/Main.java", "pom.xml"])
+    assert check_compliance(sdist, "json") == expected
+
+def test_members_honour_traversal_options(jar):
+    options = TraversalOptions(exclude=("src/app/",), default_excludes=())
+    names = [path.partition("!")[2] for path, _, _ in ArchiveMembers(jar, options)]
+    assert names == ["build/generated.py", "pom.xml", "src/Main.java"]
+
+    limit = os.path.getsize(os.path.join(HERE, "bad_example.java"))
+    small = TraversalOptions(max_file_size=limit)
+    assert [path.partition("!")[2] for path, _, _ in ArchiveMembers(jar, small)] == [
+        member for member in ["pom.xml", "src/Main.java", "src/app/bad_example_script.py"]
+        if os.path.getsize(os.path.join(HERE, MEMBERS[member])) <= limit
+    ]
+
+def test_archive_summary_counts_members(jar):
+    assert check_compliance(jar, "summary").startswith("Files checked: 3\n")
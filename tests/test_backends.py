@@ -0,0 +1,35 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import subprocess
+import backends
+from backends import get_backend, register_backend
+from utils import apply_compliance_rules_with_count, check_file
+
+HERE = os.path.dirname(__file__)
+ROOT = os.path.abspath(os.path.join(HERE, ".."))
+
+def test_python_file_loads_only_the_python_backend():
+    code = (
+        "import sys, utils\n"
+        f"utils.check_file({os.path.join(HERE, 'bad_example_script.py')!r})\n"
+        "print(sorted(m for m in sys.modules if m.startswith('config.') or m == 'java_parser'))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == "['config.pattern_rules', 'config.python_guidelines']"
+
+def test_unknown_types_are_unsupported():
+    assert get_backend("rb") is None
+    violations, function_count = apply_compliance_rules_with_count("puts 1", "rb")
+    assert violations[0]["id"] == "UNSUPPORTED" and function_count == 0
+
+def test_registered_backend_is_used(monkeypatch, tmp_path):
+    monkeypatch.setattr(backends, "_BACKENDS", dict(backends._BACKENDS))
+    monkeypatch.setattr(backends, "_loaded", {})
+    register_backend("txt", lambda ctx: ([{"id": "T1", "message": ctx.text.strip(), "line": 1}], 0))
+    path = tmp_path / "notes.txt"
+    path.write_text("hello\n")
+    assert check_file(str(path)) == ([{"id": "T1", "message": "hello", "line": 1, "file": str(path)}], 0)
+    assert "txt" in backends.loaded_backends()
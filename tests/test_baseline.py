@@ -0,0 +1,80 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from baseline import BaselineIndex
+import main
+from main import check_compliance
+
+LEGACY = 'def f():\n    """Doc."""\n    print("a")\n\nif __name__ == "__main__":\n    f()\n'
+
+def _baseline(tmp_path, src):
+    path = str(tmp_path / "baseline.bin")
+    recorder = BaselineIndex.load(path, record=True)
+    assert check_compliance(src, "json", baseline=recorder) == []
+    recorder.save(path)
+    return path, len(recorder)
+
+def test_baselined_violations_are_suppressed_even_when_moved(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    module = src / "legacy.py"
+    module.write_text(LEGACY)
+    path, recorded = _baseline(tmp_path, str(src))
+    assert recorded == 1
+
+    index = BaselineIndex.load(path)
+    assert check_compliance(str(src), "json", baseline=index) == []
+    assert index.suppressed == 1
+
+    # Lines moved by an unrelated edit stay suppressed; a second copy of the line is new
+    module.write_text("import os\n\n" + LEGACY.replace('    print("a")\n', '    print("a")\n    print("a")\n'))
+    new = check_compliance(str(src), "json", baseline=BaselineIndex.load(path))
+    assert [(v["id"], v["line"]) for v in new] == [("R001", 6)]
+
+def test_save_load_round_trip_and_bad_file(tmp_path):
+    index = BaselineIndex(str(tmp_path), record=True)
+    index.filter_file(str(tmp_path / "a.py"), [{"id": "R002", "message": "m", "line": 0}] * 2)
+    path = str(tmp_path / "b.bin")
+    index.save(path)
+    loaded = BaselineIndex.load(path)
+    assert loaded.counts == index.counts and len(loaded) == 2
+    assert os.path.getsize(path) < 64
+
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"not a baseline")
+    with pytest.raises(ValueError):
+        BaselineIndex.load(str(bad))
+    assert len(BaselineIndex.load(str(tmp_path / "missing.bin"))) == 0
+
+def test_timeouts_are_never_baselined(tmp_path):
+    path = str(tmp_path / "baseline.bin")
+    timeout = {"id": "TIMEOUT", "message": "m", "line": 0}
+    recorder = BaselineIndex.load(path, record=True)
+    recorder.filter_file(str(tmp_path / "slow.py"), [timeout])
+    assert len(recorder) == 0
+    assert BaselineIndex(str(tmp_path), recorder.counts).filter_file(str(tmp_path / "slow.py"), [timeout]) == [timeout]
+
+def test_unreadable_paths_are_fingerprinted_by_line(tmp_path):
+    member = str(tmp_path / "a.zip") + "!pkg/x.py"
+    recorder = BaselineIndex(str(tmp_path), record=True)
+    recorder.filter_file(member, [{"id": "R001", "message": "m", "line": 3}])
+    index = BaselineIndex(str(tmp_path), recorder.counts)
+    on_other_line = {"id": "R001", "message": "m", "line": 7}
+    assert index.filter_file(member, [on_other_line, {"id": "R001", "message": "m", "line": 3}]) == [on_other_line]
+
+@pytest.mark.parametrize("flags", [["--changed-since", "HEAD"], ["--exclude", "*.java"], ["--max-violations", "2"]])
+def test_update_baseline_rejects_narrowed_runs(tmp_path, monkeypatch, flags):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "legacy.py").write_text(LEGACY)
+    path = tmp_path / "baseline.bin"
+    _baseline(tmp_path, str(src))
+    before = path.read_bytes()
+    monkeypatch.setattr(sys, "argv", ["main.py", str(src), "--baseline", str(path), "--update-baseline", *flags])
+    with pytest.raises(SystemExit) as excinfo:
+        main.main()
+    assert excinfo.value.code == 2
+    assert path.read_bytes() == before
@@ -0,0 +1,71 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.corpus import CorpusSpec, generate_corpus
+from benchmarks import run_benchmarks as run_benchmarks_cli
+from benchmarks.run_benchmarks import compare_to_baseline, run_benchmarks
+from benchmarks.startup import measure_startup, parse_importtime
+from compliance_checker import (apply_java_compliance_rules,
+                                apply_python_compliance_rules,
+                                apply_xml_compliance_rules)
+
+ENGINES = {
+    "py": apply_python_compliance_rules,
+    "java": apply_java_compliance_rules,
+    "xml": apply_xml_compliance_rules,
+}
+
+def test_corpus_is_deterministic_and_sized():
+    spec = CorpusSpec(files=2, lines=60, density=0.3)
+    corpus = generate_corpus(spec)
+    assert corpus == generate_corpus(spec)
+    assert corpus != generate_corpus(CorpusSpec(files=2, lines=60, density=0.3, seed=7))
+    for sources in corpus.values():
+        assert len(sources) == 2
+        assert all(55 <= s.count("\n") <= 80 for s in sources)
+
+def test_density_controls_violations():
+    clean = generate_corpus(CorpusSpec(files=2, lines=80, density=0.0))
+    dirty = generate_corpus(CorpusSpec(files=2, lines=80, density=0.5))
+    for filetype, engine in ENGINES.items():
+        assert not any(engine(s) for s in clean[filetype]), filetype
+        assert all(engine(s) for s in dirty[filetype]), filetype
+
+def test_compare_to_baseline_flags_regressions():
+    current = run_benchmarks(CorpusSpec(files=1, lines=30), repeat=1)
+    assert set(current["results"]) == {"python_rules", "java_rules", "xml_rules", "check_compliance"}
+    assert compare_to_baseline(current, current) == []
+
+    baseline = {"spec": current["spec"], "results": {
+        name: dict(r, files_per_s=r["files_per_s"] * 2, peak_kb=r["peak_kb"] / 2)
+        for name, r in current["results"].items()
+    }}
+    regressions = compare_to_baseline(current, baseline, threshold=0.25)
+    assert any("python_rules: files_per_s" in m for m in regressions)
+    assert any("xml_rules: peak_kb" in m for m in regressions)
+
+def test_missing_baseline_fails_instead_of_recording(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    argv = ["run_benchmarks.py", "--files", "1", "--lines", "20", "--repeat", "1", "--baseline", str(baseline)]
+    monkeypatch.setattr(sys, "argv", argv)
+    assert run_benchmarks_cli.main() == 1
+    assert not baseline.exists()
+    monkeypatch.setattr(sys, "argv", argv + ["--update-baseline"])
+    assert run_benchmarks_cli.main() == 0
+    assert baseline.exists()
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     _ast\n"
+        "import time:      1314 |       1434 |   ast\n"
+        "import time:       500 |       1934 | main\n"
+    )
+    assert parse_importtime(stderr) == [("_ast", 2, 120, 120), ("ast", 1, 1314, 1434), ("main", 0, 500, 1934)]
+
+def test_cli_startup_imports_no_lazy_modules():
+    # The time budget is machine-dependent and only enforced by benchmarks/startup.py
+    result = measure_startup("main", runs=1)
+    assert result["eager"] == []
@@ -0,0 +1,60 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import time
+import utils
+from budget import EXIT_OK, EXIT_TIMEOUT, EXIT_VIOLATIONS, TIMEOUT_ID, CheckBudget
+from main import check_compliance
+from utils import check_file
+
+TESTS_DIR = os.path.dirname(__file__)
+
+def _v(rule_id="R001"):
+    return {"id": rule_id, "message": "m", "line": 1}
+
+def test_spend_truncates_and_sets_exit_code():
+    budget = CheckBudget(max_violations=3)
+    assert budget.exit_code() == EXIT_OK
+    assert len(budget.spend("a.py", [_v(), _v()])) == 2 and not budget.stopped
+    kept = budget.spend("b.py", [_v(TIMEOUT_ID), _v(), _v()])
+    assert [v["id"] for v in kept] == [TIMEOUT_ID, "R001"]
+    assert budget.stopped and budget.violations == 3 and budget.timed_out == ["b.py"]
+    assert budget.exit_code() == EXIT_VIOLATIONS
+
+    timeouts_only = CheckBudget(file_timeout=1)
+    timeouts_only.spend("c.py", [_v(TIMEOUT_ID)])
+    assert timeouts_only.exit_code() == EXIT_TIMEOUT
+
+def test_max_violations_stops_serial_and_parallel_runs():
+    everything = check_compliance(TESTS_DIR, "json")
+    for jobs in (1, 2):
+        budget = CheckBudget(max_violations=2)
+        result = check_compliance(TESTS_DIR, "json", jobs=jobs, budget=budget)
+        assert result == everything[:2]
+        assert budget.stopped
+
+def test_fail_fast_summary_counts_only_checked_files():
+    budget = CheckBudget(max_violations=1)
+    summary = check_compliance(TESTS_DIR, "summary", budget=budget)
+    assert "Violations found: 1" in summary
+    assert budget.exit_code() == EXIT_VIOLATIONS
+
+def test_file_timeout_reports_and_is_not_cached(tmp_path, monkeypatch):
+    path = os.path.join(TESTS_DIR, "bad_example_script.py")
+    real = utils.apply_compliance_rules_with_count
+
+    def slow(ctx, filetype):
+        time.sleep(5)
+        return real(ctx, filetype)
+
+    monkeypatch.setattr(utils, "apply_compliance_rules_with_count", slow)
+    start = time.monotonic()
+    violations, count = check_file(path, str(tmp_path), timeout=0.05)
+    assert time.monotonic() - start < 2
+    assert [v["id"] for v in violations] == [TIMEOUT_ID] and count == 0
+
+    monkeypatch.setattr(utils, "apply_compliance_rules_with_count", real)
+    violations, _ = check_file(path, str(tmp_path), timeout=5)
+    assert violations and TIMEOUT_ID not in {v["id"] for v in violations}
@@ -0,0 +1,36 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import utils
+from cache import ResultCache, make_cache_key
+from main import check_compliance
+
+BAD_SCRIPT = os.path.join(os.path.dirname(__file__), "bad_example_script.py")
+
+def test_cache_hit_skips_rules(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    first = check_compliance(BAD_SCRIPT, "json", cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("rules should not run on a cache hit")
+
+    monkeypatch.setattr(utils, "apply_compliance_rules_with_count", fail)
+    second = check_compliance(BAD_SCRIPT, "json", cache_dir=cache_dir)
+    assert second == first
+
+def test_cache_key_depends_on_content_and_filetype():
+    assert make_cache_key(b"x = 1", "py") != make_cache_key(b"x = 2", "py")
+    assert make_cache_key(b"x = 1", "py") != make_cache_key(b"x = 1", "java")
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=100)
+    cache.put("old", [], 0)
+    cache.put("new", [], 0)
+    cache.get("old")
+    cache.put("newest", [], 0)
+    assert cache.evict() == 1
+    assert cache.get("new") is None
+    assert cache.get("old") is not None
+    cache.close()
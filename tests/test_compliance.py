@@ -72,4 +72,45 @@ def test_function_length_rule_over_limit():
     code = "def long_func():\n" + "\n".join(["    pass"] * 60)
     func_node = get_first_function_node(code)
     result = rule_limit_function_length(func_node)
-    assert any("is too long" in message for _, message in result)
\ No newline at end of file
+    assert any("is too long" in message for _, message in result)
+
+def test_function_length_limit_can_be_passed_positionally():
+    code = "def medium_func():\n" + "\n".join(["    pass"] * 20)
+    func_node = get_first_function_node(code)
+    assert rule_limit_function_length(func_node, 10)
+    assert not rule_limit_function_length(func_node, 30)
+
+# === Single-pass engine ===
+
+def test_print_violation_reported_once_per_call():
+    code = "def outer():\n    def inner():\n        print('x')\n"
+    violations = apply_python_compliance_rules(code)
+    prints = [v for v in violations if v["id"] == "R001"]
+    assert len(prints) == 1 and prints[0]["line"] == 3
+
+def test_long_function_reported_once():
+    body = "\n".join(["    x = 1"] * 60)
+    code = f"if True:\n  def long_func():\n{body.replace('    ', '      ')}"
+    violations = apply_python_compliance_rules(code)
+    assert sum(1 for v in violations if v["id"] == "R004") == 1
+
+
+# === Parallel scanning ===
+
+def test_parallel_check_matches_serial():
+    from main import check_compliance
+    tests_dir = os.path.dirname(__file__)
+    serial = check_compliance(tests_dir, "json")
+    parallel = check_compliance(tests_dir, "json", jobs=2)
+    assert parallel == serial
+
+
+# === Streaming API ===
+
+def test_iter_compliance_matches_check_compliance():
+    import types
+    from main import check_compliance, iter_compliance
+    tests_dir = os.path.dirname(__file__)
+    stream = iter_compliance(tests_dir)
+    assert isinstance(stream, types.GeneratorType)
+    assert list(stream) == check_compliance(tests_dir, "json")
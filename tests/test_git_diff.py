@@ -0,0 +1,69 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import shutil
+import subprocess
+import pytest
+from git_diff import changed_line_ranges, line_in_ranges
+from main import check_compliance
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo, check=True, capture_output=True,
+    )
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "old.py").write_text("def BadOld():\n    pass\n")
+    (tmp_path / "mod.py").write_text("def BadOne():\n    pass\n\n\ndef good_two():\n    pass\n")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-qm", "init")
+    (tmp_path / "mod.py").write_text(
+        "def BadOne():\n    pass\n\n\ndef good_two():\n    print('hi')\n"
+    )
+    return tmp_path
+
+def test_changed_line_ranges_only_lists_changed_files(repo):
+    ranges = changed_line_ranges("HEAD", str(repo))
+    assert list(ranges) == [str(repo / "mod.py")]
+    assert ranges[str(repo / "mod.py")] == [(6, 6)]
+
+def test_changed_lines_only_filters_violations(repo):
+    violations = check_compliance(str(repo), "json", changed_since="HEAD", changed_lines_only=True)
+    assert {v["id"] for v in violations if v["line"]} == {"R001"}
+    assert all(v["file"].endswith("mod.py") for v in violations)
+
+def test_line_in_ranges():
+    ranges = [(1, 2), (10, 12)]
+    assert line_in_ranges(11, ranges)
+    assert not line_in_ranges(5, ranges)
+    assert not line_in_ranges(13, ranges)
+
+@pytest.mark.parametrize("config", ["diff.noprefix", "diff.mnemonicPrefix"])
+def test_changed_line_ranges_handles_prefix_config_and_quoted_names(repo, config):
+    _git(repo, "config", config, "true")
+    names = ["naïve file.py", "tab\there.py", 'quote".py']
+    for name in names:
+        (repo / name).write_text("x = 1\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-qm", "names")
+    for name in names:
+        (repo / name).write_text("x = 1\nprint(x)\n")
+    ranges = changed_line_ranges("HEAD", str(repo))
+    assert sorted(ranges) == sorted(str(repo / name) for name in names)
+    assert all(ranges[str(repo / name)] == [(2, 2)] for name in names)
+
+def test_changed_line_ranges_survives_non_utf8_content_and_names(repo):
+    latin1 = os.fsdecode(b"caf\xe9.py")
+    (repo / latin1).write_bytes(b"# caf\xe9\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-qm", "latin-1")
+    (repo / latin1).write_bytes(b"# caf\xe9\nname = 'na\xefve'\n")
+    ranges = changed_line_ranges("HEAD", str(repo))
+    assert ranges[str(repo / latin1)] == [(2, 2)]
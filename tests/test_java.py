@@ -0,0 +1,101 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from compliance_checker import apply_java_compliance_rules
+from config.java_guidelines import (
+    java_rule_class_javadoc,
+    java_rule_method_length_limit,
+    java_rule_uses_logger,
+)
+from java_parser import parse_java
+
+TESTS_DIR = os.path.dirname(__file__)
+
+def _read(name: str) -> str:
+    with open(os.path.join(TESTS_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+def test_bad_example_violations():
+    violations = apply_java_compliance_rules(_read("bad_example.java"))
+    ids = {v["id"] for v in violations}
+    assert {
+        "java_rule_package_declaration_present",
+        "java_rule_uses_logger",
+        "java_rule_class_javadoc",
+    } <= ids
+
+def test_good_example_has_class_javadoc():
+    violations = apply_java_compliance_rules(_read("good_example.java"))
+    assert not any(v["id"] == "java_rule_class_javadoc" for v in violations)
+
+def test_class_javadoc_covers_every_class_declaration():
+    # Nested and modified classes are checked too; interfaces and enums are not
+    code = (
+        "/** Outer. */\n"
+        "public class Outer {\n"
+        "    private static class Hidden {}\n"
+        "    /** Documented. */\n"
+        "    protected final class Documented {}\n"
+        "    interface Callback {}\n"
+        "    enum Mode { A }\n"
+        "}\n"
+    )
+    assert java_rule_class_javadoc(code) == [(3, "Missing Javadoc comment before class declaration.")]
+
+def test_class_javadoc_attachment():
+    long_doc = "/**\n" + " * line\n" * 10 + " */\n"
+    assert java_rule_class_javadoc(long_doc + "@Deprecated\npublic final class A {}") == []
+    assert java_rule_class_javadoc("/** Doc */\nint x;\nclass A {}") == [
+        (3, "Missing Javadoc comment before class declaration.")
+    ]
+
+def test_method_length_limit():
+    body = "\n".join(["        x++;"] * 55)
+    code = f"class A {{\n    public void run() {{\n{body}\n    }}\n}}"
+    assert java_rule_method_length_limit(code) == [(2, "Method exceeds 50 lines. Consider refactoring.")]
+
+
+def test_logger_rule_ignores_comments_and_strings():
+    code = 'class A {\n  // System.out.println("x");\n  String s = "System.out.println";\n}'
+    assert java_rule_uses_logger(code) == []
+
+def test_parser_structural_index():
+    code = """package com.example;
+
+import java.util.*;
+import static java.lang.Math.max;
+
+/** Doc. */
+public class Outer<T> {
+    private String brace = "{";
+    /* } */
+    public Outer(int x) {
+        char c = '}';
+    }
+
+    List<String> names() throws java.io.IOException {
+        return new ArrayList<>() {{ add("a"); }};
+    }
+
+    abstract void pending();
+
+    enum Kind { A("x"), B("y"); Kind(String s) {} }
+}
+"""
+    index = parse_java(code)
+    assert index.package == "com.example"
+    assert [(i.name, i.static, i.wildcard) for i in index.imports] == [
+        ("java.util.*", False, True),
+        ("java.lang.Math.max", True, False),
+    ]
+    assert [(c.name, c.kind, c.line, c.end_line, c.has_javadoc) for c in index.classes] == [
+        ("Outer", "class", 7, 21, True),
+        ("Kind", "enum", 20, 20, False),
+    ]
+    assert [(m.name, m.line, m.end_line, m.class_name) for m in index.methods] == [
+        ("Outer", 10, 12, "Outer"),
+        ("names", 14, 16, "Outer"),
+        ("Kind", 20, 20, "Kind"),
+    ]
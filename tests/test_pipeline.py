@@ -0,0 +1,79 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import shutil
+import time
+import pipeline
+from main import check_compliance, check_compliance_async
+from pipeline import aiter_file_results, iter_prefetched
+
+TESTS_DIR = os.path.dirname(__file__)
+
+def _copy_examples(tmp_path):
+    for name in ("bad_example_script.py", "bad_example.java", "bad_config.xml", "good_example_script.py"):
+        shutil.copy(os.path.join(TESTS_DIR, name), tmp_path / name)
+    return str(tmp_path)
+
+def test_prefetch_preserves_order_and_leaves_xml_streamed(tmp_path):
+    files = []
+    for i in range(10):
+        path = tmp_path / f"m{i}.py"
+        path.write_text(f"x = {i}\n")
+        files.append(str(path))
+    xml = tmp_path / "pom.xml"
+    xml.write_text("<project/>")
+    files.append(str(xml))
+
+    results = list(iter_prefetched(iter(files), readers=3, prefetch=4))
+    assert [path for path, _ in results] == files
+    assert results[0][1] == b"x = 0\n"
+    assert results[-1][1] is None
+
+def test_async_matches_sync(tmp_path):
+    path = _copy_examples(tmp_path)
+    for output_format in ("json", "summary", "text", "markdown"):
+        expected = check_compliance(path, output_format)
+        result = asyncio.run(check_compliance_async(path, output_format, readers=2, prefetch=2))
+        assert result == expected
+
+def test_readers_option_matches_serial(tmp_path):
+    path = _copy_examples(tmp_path)
+    assert check_compliance(path, "json", readers=3) == check_compliance(path, "json")
+
+def test_async_no_files(tmp_path):
+    result = asyncio.run(check_compliance_async(str(tmp_path), "json"))
+    assert result.startswith("No supported files")
+
+def _slow_reads(monkeypatch, tmp_path, count=40):
+    started = []
+
+    def slow_read(file_path):
+        started.append(file_path)
+        time.sleep(0.02)
+        return b""
+
+    monkeypatch.setattr(pipeline, "read_source", slow_read)
+    return [str(tmp_path / f"m{i}.py") for i in range(count)], started
+
+def test_prefetch_cancels_queued_reads_on_early_exit(tmp_path, monkeypatch):
+    files, started = _slow_reads(monkeypatch, tmp_path)
+    reads = iter_prefetched(files, readers=1, prefetch=16)
+    next(reads)
+    reads.close()
+    assert len(started) < 16
+
+def test_async_pipeline_cancels_queued_reads_on_early_exit(tmp_path, monkeypatch):
+    files, started = _slow_reads(monkeypatch, tmp_path)
+
+    async def first_only():
+        results = aiter_file_results(files, lambda file_path, raw: ([], 0), readers=1, prefetch=16)
+        async for _ in results:
+            break
+        await results.aclose()
+        await asyncio.sleep(0.5)  # long enough for every leaked read to start
+
+    asyncio.run(first_only())
+    assert len(started) < 16
@@ -0,0 +1,78 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from compliance_checker import apply_python_compliance_rules, apply_xml_compliance_rules
+from config.python_guidelines import NODE_LEVEL_RULES
+from prefilter import Prefilter, rule_triggers, triggers
+from rule_compiler import RuleDefinitionError, compile_rules, parse_rule
+from source_context import SourceContext
+
+def _prefilter(*patterns):
+    return Prefilter([{"id": f"T{i}", "triggers": (p,)} for i, p in enumerate(patterns)] + [{"id": "ALWAYS"}])
+
+def test_scan_finds_overlapping_and_prefix_triggers():
+    prefilter = _prefilter(b"print", b"println", b"tln(", b"absent")
+    assert prefilter.scan(b"System.out.println(x);") == {b"print", b"println", b"tln("}
+    assert prefilter.scan(memoryview(b"nothing here")) == frozenset()
+
+def test_select_keeps_unconditional_rules_in_order():
+    prefilter = _prefilter(b"TODO", b"def")
+    assert [rule["id"] for rule in prefilter.select(frozenset({b"def"}))] == ["T1", "ALWAYS"]
+
+def test_scan_file_uses_a_memory_map(tmp_path):
+    prefilter = _prefilter(b"SNAPSHOT")
+    pom = tmp_path / "pom.xml"
+    pom.write_bytes(b"<version>1.0-SNAPSHOT</version>")
+    empty = tmp_path / "empty.xml"
+    empty.write_bytes(b"")
+    assert prefilter.scan_file(str(pom)) == {b"SNAPSHOT"}
+    assert prefilter.scan_file(str(empty)) == frozenset()
+
+def test_function_and_class_triggers():
+    @triggers(b"println")
+    def rule(source):
+        return []
+
+    class XmlLikeRule:
+        triggers = (b"a", b"b")
+
+    assert rule_triggers(rule) == (b"println",)
+    assert rule_triggers(XmlLikeRule) == (b"a", b"b")
+    assert rule_triggers({"id": "R"}) is None
+
+def test_declarative_rules_derive_triggers():
+    compiled = compile_rules([
+        parse_rule({"id": "C1", "kind": "forbidden_call", "languages": ["py", "java"], "calls": ["os.system", "*.printStackTrace"], "message": "m"}),
+        parse_rule({"id": "N1", "kind": "naming", "languages": ["py"], "target": "class", "pattern": "[A-Z]\\w*", "message": "m"}),
+        parse_rule({"id": "L1", "kind": "forbidden_line", "languages": ["py"], "pattern": "(?i)secret", "message": "m"}),
+        parse_rule({"id": "L2", "kind": "forbidden_line", "languages": ["xml"], "pattern": "<x>", "triggers": ["<x>"], "message": "m"}),
+    ])
+    assert compiled.triggers("py", ("forbidden_call", "naming")) == (b"class", b"printStackTrace", b"system")
+    assert compiled.triggers("py") is None  # L1 has no literal trigger
+    assert compiled.triggers("xml") == (b"<x>",)
+
+def test_invalid_triggers_are_rejected():
+    with pytest.raises(RuleDefinitionError):
+        parse_rule({"id": "L1", "kind": "forbidden_line", "languages": ["py"], "pattern": "x", "triggers": [""], "message": "m"})
+
+def test_rules_without_triggers_in_file_are_not_called(monkeypatch):
+    calls = []
+    rule = next(rule for rule in NODE_LEVEL_RULES if rule["id"] == "R001")
+    check = rule["check"]
+    monkeypatch.setitem(rule, "check", lambda node, *, ctx=None: calls.append(node) or check(node, ctx=ctx))
+
+    assert apply_python_compliance_rules(SourceContext(text="len([])\n")) == [
+        {"id": "R002", "message": "Missing 'if __name__ == \"__main__\"' guard.", "line": 0},
+    ]
+    assert calls == []
+    violations = apply_python_compliance_rules(SourceContext(text="print(1)\n"))
+    assert calls and ("R001", 1) in [(v["id"], v["line"]) for v in violations]
+
+def test_xml_without_triggers_still_reports_syntax_errors(tmp_path):
+    path = tmp_path / "broken.xml"
+    path.write_text("<a>\n<b></a>\n")
+    [violation] = apply_xml_compliance_rules(SourceContext(path=str(path), filetype="xml"))
+    assert violation["id"] == "XML_SYNTAX" and violation["line"] == 2
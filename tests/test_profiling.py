@@ -0,0 +1,63 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import profiling
+from compliance_checker import (apply_java_compliance_rules,
+                                apply_python_compliance_rules,
+                                apply_xml_compliance_rules)
+from source_context import SourceContext
+from utils import check_file
+
+TESTS_DIR = os.path.dirname(__file__)
+
+def test_no_events_without_hooks():
+    assert not profiling.enabled()
+    assert profiling.timed("f.py", "rule", "R001").__enter__() is None
+
+def test_python_rules_report_calls_and_violations():
+    events = []
+    path = os.path.join(TESTS_DIR, "bad_example_script.py")
+    with profiling.hooked(events.append):
+        violations, _ = check_file(path)
+
+    by_name = {(e["kind"], e["name"]): e for e in events}
+    assert all(e["file"] == path for e in events)
+    assert ("io", "read") in by_name
+    assert ("parse", "ast.parse") in by_name
+    for rule_id in {v["id"] for v in violations}:
+        event = by_name[("rule", rule_id)]
+        assert event["violations"] == sum(v["id"] == rule_id for v in violations)
+        assert event["calls"] >= 1 and event["wall"] >= 0
+    assert not profiling.enabled()
+
+def test_java_and_xml_rules_are_timed_separately_from_parsing():
+    collector = profiling.ProfileCollector()
+    with open(os.path.join(TESTS_DIR, "bad_example.java"), encoding="utf-8") as f:
+        java = f.read()
+    with open(os.path.join(TESTS_DIR, "bad_config.xml"), encoding="utf-8") as f:
+        xml = f.read()
+    with profiling.hooked(collector):
+        java_violations = apply_java_compliance_rules(SourceContext(text=java, path="A.java", filetype="java"))
+        xml_violations = apply_xml_compliance_rules(SourceContext(text=xml, path="pom.xml", filetype="xml"))
+
+    totals = {(r["kind"], r["name"]): r for r in collector.by_name()}
+    assert ("parse", "parse_java") in totals
+    assert ("parse", "expat") in totals
+    assert totals[("rule", "java_rule_uses_logger")]["violations"] == sum(
+        v["id"] == "java_rule_uses_logger" for v in java_violations)
+    assert sum(r["violations"] for r in collector.by_file() if r["file"] == "pom.xml") == len(xml_violations)
+
+def test_collector_aggregates_and_sorts():
+    collector = profiling.ProfileCollector()
+    with profiling.hooked(collector):
+        apply_python_compliance_rules(SourceContext(text="def Bad():\n    print(1)\n", path="a.py"))
+        apply_python_compliance_rules(SourceContext(text="print(2)\n", path="b.py"))
+
+    r001 = next(r for r in collector.by_name() if r["name"] == "R001")
+    assert r001["files"] == 2 and r001["violations"] == 2
+    by_calls = collector.by_name("calls")
+    assert [r["calls"] for r in by_calls] == sorted((r["calls"] for r in by_calls), reverse=True)
+    assert "R001" in collector.format_table()
+    assert set(collector.to_dict()) == {"totals", "files"}
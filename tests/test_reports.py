@@ -0,0 +1,50 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from io import StringIO
+from main import check_compliance
+from utils import generate_markdown_report, sort_within_files, write_text_report
+
+TESTS_DIR = os.path.dirname(__file__)
+
+def test_text_report_dedups_per_file_only():
+    violations = [
+        {"id": "R001", "message": "m", "line": 1, "file": "a.py"},
+        {"id": "R001", "message": "m", "line": 1, "file": "a.py"},
+        {"id": "R001", "message": "m", "line": 1, "file": "b.py"},
+    ]
+    sink = StringIO()
+    assert write_text_report(violations, sink) == 2
+    assert sink.getvalue() == "a.py\n- R001 (Line 1): m\nb.py\n- R001 (Line 1): m\n"
+
+def test_markdown_report_format():
+    violations = [{"id": "R001", "message": "m", "line": 3, "file": "a.py"}]
+    md = generate_markdown_report(violations, ["a.py"], 2)
+    assert md == (
+        "# Internal Guidelines Compliance Report\n\n"
+        "**Files checked:** 1\n\n"
+        "**Functions checked:** 2\n\n"
+        "**Violations found:** 1\n\n"
+        "| File | Line | Violation |\n"
+        "|------|------|-----------|\n"
+        "| a.py | 3 | m |\n"
+    )
+
+def test_sort_within_files_by_rule():
+    violations = [
+        {"id": "R003", "message": "m", "line": 1, "file": "a.py"},
+        {"id": "R001", "message": "m", "line": 5, "file": "a.py"},
+        {"id": "R002", "message": "m", "line": 0, "file": "b.py"},
+    ]
+    ordered = [(v["file"], v["id"]) for v in sort_within_files(violations, "rule")]
+    assert ordered == [("a.py", "R001"), ("a.py", "R003"), ("b.py", "R002")]
+
+def test_check_compliance_text_and_markdown():
+    text = check_compliance(TESTS_DIR, "text", sort_by="line")
+    assert "bad_example_script.py\n- R002 (Line 0)" in text
+    md = check_compliance(TESTS_DIR, "markdown")
+    violations = check_compliance(TESTS_DIR, "json")
+    assert f"**Violations found:** {len(violations)}" in md
+    assert md.count("\n| ") == len(violations) + 1
@@ -0,0 +1,152 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import ast
+import re
+import pytest
+from compliance_checker import (apply_java_compliance_rules,
+                                apply_python_compliance_rules,
+                                apply_xml_compliance_rules)
+from java_parser import parse_java
+from rule_compiler import RuleDefinitionError, compile_rules, load_rules, parse_rule
+from source_context import SourceContext
+
+def _rules(*specs):
+    return compile_rules([parse_rule(spec) for spec in specs])
+
+def _ids(violations):
+    return [(v["id"], v["line"]) for v in violations]
+
+def test_python_calls_and_names_use_one_dispatch_entry():
+    compiled = _rules(
+        {"id": "C1", "kind": "forbidden_call", "languages": ["py"], "calls": ["eval", "os.system"], "message": "no {name}"},
+        {"id": "C2", "kind": "forbidden_call", "languages": ["py"], "calls": ["*.unlink"], "message": "no {name}"},
+        {"id": "N1", "kind": "naming", "languages": ["py"], "target": "class", "pattern": "[A-Z]\\w*", "message": "{name}"},
+    )
+    tree_rules, node_rules = compiled.python_rules()
+    assert tree_rules == [] and len(node_rules) == 1
+    assert set(node_rules[0]["node_types"]) == {ast.Call, ast.ClassDef}
+
+    code = "import os\nclass bad: pass\neval('1')\nos.system('ls')\nget().unlink()\nmy.eval('x')\n"
+    found = []
+    for node in ast.walk(ast.parse(code)):
+        if isinstance(node, node_rules[0]["node_types"]):
+            found.extend(compiled.check_python_node(node))
+    assert sorted((v["id"], v["line"], v["message"]) for v in found) == [
+        ("C1", 3, "no eval"), ("C1", 4, "no os.system"), ("C2", 5, "no unlink"), ("N1", 2, "bad"),
+    ]
+
+def test_merged_line_alternation_matches_each_rule():
+    patterns = [f"forbidden_{i}\\b" for i in range(50)] + ["(?i)secret\\s*="]
+    compiled = _rules(*[
+        {"id": f"L{i}", "kind": "forbidden_line", "languages": ["py"], "pattern": p, "message": "m"}
+        for i, p in enumerate(patterns)
+    ])
+    lines = ["x = 1", "forbidden_7()", "SECRET = 2 # forbidden_49", "forbidden_700"]
+    expected = [
+        {"id": f"L{i}", "line": lineno, "message": "m"}
+        for lineno, line in enumerate(lines, start=1)
+        for i, p in enumerate(patterns) if re.search(p, line)
+    ]
+    assert compiled.py_lines.match_lines(lines) == expected
+    assert _ids(expected) == [("L7", 2), ("L49", 3), ("L50", 3)]
+
+def test_java_calls_names_and_lines():
+    compiled = _rules(
+        {"id": "J1", "kind": "forbidden_call", "languages": ["java"], "calls": ["System.exit"], "message": "m"},
+        {"id": "J2", "kind": "forbidden_call", "languages": ["java"], "calls": ["*.printStackTrace"], "message": "m"},
+        {"id": "J3", "kind": "naming", "languages": ["java"], "target": "method", "pattern": "[a-z]\\w*", "message": "m"},
+        {"id": "J4", "kind": "forbidden_line", "languages": ["java"], "pattern": "@SuppressWarnings", "message": "m"},
+    )
+    code = (
+        "class A {\n"
+        "  A() {}\n"
+        "  void Run() {\n"
+        "    // System.exit(1);\n"
+        "    String s = \"System.exit(1)\";\n"
+        "    System . exit(1);\n"
+        "    e.printStackTrace();\n"
+        "    get().printStackTrace();\n"
+        "  }\n"
+        "  @SuppressWarnings(\"x\") void ok() {}\n"
+        "}\n"
+    )
+    found = compiled.check_java(parse_java(code), code.splitlines())
+    assert sorted(_ids(found)) == [("J1", 6), ("J2", 7), ("J2", 8), ("J3", 3), ("J4", 10)]
+
+def test_java_call_chains_continue_through_argument_lists():
+    compiled = _rules(
+        {"id": "J1", "kind": "forbidden_call", "languages": ["java"],
+         "calls": ["System.exit", "Runtime.getRuntime.exit"], "message": "no {name}"},
+        {"id": "J2", "kind": "forbidden_call", "languages": ["java"], "calls": ["*.close"], "message": "no {name}"},
+    )
+    code = (
+        "class A {\n"
+        "  void f() {\n"
+        "    Runtime.getRuntime().exit(code(1));\n"
+        "    System.exit(Math.max(a(), b()));\n"
+        "    new Runtime().exit(1);\n"
+        "    ((Runtime) r).exit(1);\n"
+        "    factory.open(path).close();\n"
+        "  }\n"
+        "}\n"
+    )
+    found = compiled.check_java(parse_java(code))
+    assert sorted((v["id"], v["line"], v["message"]) for v in found) == [
+        ("J1", 3, "no Runtime.getRuntime.exit"), ("J1", 4, "no System.exit"), ("J2", 7, "no factory.open.close"),
+    ]
+
+def test_example_rules_compile_and_are_not_loaded_by_default():
+    from config.pattern_rules import EXAMPLE_RULES_PATH, PATTERN_RULES
+    example = compile_rules(load_rules(EXAMPLE_RULES_PATH))
+    example_ids = {rule.id for rule in example.rules}
+    assert not PATTERN_RULES.has_rules("py") and not PATTERN_RULES.has_rules("java")
+
+    py_code = "class lower:\n    pass\neval('1')\npassword = 'hunter2'\n"
+    tree = ast.parse(py_code)
+    found = [v for node in ast.walk(tree) if isinstance(node, example.python_node_types())
+             for v in example.check_python_node(node)]
+    found += example.py_lines.match_lines(py_code.splitlines())
+    assert {"R007", "R009", "SEC001"} <= {v["id"] for v in found}
+    assert not example_ids & {v["id"] for v in apply_python_compliance_rules(SourceContext(text=py_code))}
+
+    java_code = "package a;\nclass A {\n  void f() { Runtime.getRuntime().exit(1); }\n}\n"
+    assert ("java_rule_no_system_exit", 3) in _ids(example.check_java(parse_java(java_code)))
+    assert not example_ids & {v["id"] for v in apply_java_compliance_rules(java_code)}
+
+    xml_lines = ["<config>", "  <password>hunter2</password>", "  <password>${db}</password>", "</config>"]
+    assert _ids(example.xml_lines.match_lines(xml_lines)) == [("xml_rule_no_plaintext_passwords", 2)]
+    assert apply_xml_compliance_rules("\n".join(xml_lines)) == []
+
+@pytest.mark.parametrize("spec, error", [
+    ({"kind": "naming"}, "missing an 'id'"),
+    ({"id": "X", "kind": "regex", "languages": ["py"], "message": "m"}, "'kind' must be"),
+    ({"id": "X", "kind": "naming", "languages": ["xml"], "message": "m"}, "not supported for xml"),
+    ({"id": "X", "kind": "forbidden_line", "languages": ["py"], "pattern": "(", "message": "m"}, "invalid pattern"),
+    ({"id": "X", "kind": "naming", "languages": ["py"], "pattern": "a", "target": "method", "message": "m"}, "'target'"),
+    ({"id": "X", "kind": "forbidden_line", "languages": ["py"], "pattern": "(['\"]).*\\1", "message": "m"}, "numbered group"),
+])
+def test_invalid_rules_are_rejected(spec, error):
+    with pytest.raises(RuleDefinitionError, match=error):
+        parse_rule(spec)
+
+def test_line_rules_use_named_backreferences_and_merge_errors_are_wrapped():
+    compiled = _rules(
+        {"id": "L1", "kind": "forbidden_line", "languages": ["py"], "pattern": "(?P<q>['\"])x(?P=q)", "message": "m"},
+        {"id": "L2", "kind": "forbidden_line", "languages": ["py"], "pattern": "\\\\1", "message": "m"},
+    )
+    assert _ids(compiled.py_lines.match_lines(["'x'", "'x\"", "a\\1"])) == [("L1", 1), ("L2", 3)]
+    with pytest.raises(RuleDefinitionError, match="L1, L3 cannot be merged"):
+        _rules(
+            {"id": "L1", "kind": "forbidden_line", "languages": ["py"], "pattern": "(?P<q>a)", "message": "m"},
+            {"id": "L3", "kind": "forbidden_line", "languages": ["py"], "pattern": "(?P<q>b)", "message": "m"},
+        )
+
+def test_load_rules_rejects_duplicate_ids(tmp_path):
+    rule = '{"id": "X", "kind": "forbidden_call", "languages": ["py"], "calls": ["f"], "message": "m"}'
+    path = tmp_path / "rules.json"
+    path.write_text(f'{{"rules": [{rule}, {rule}]}}')
+    with pytest.raises(RuleDefinitionError, match="duplicate"):
+        load_rules(str(path))
@@ -0,0 +1,104 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import threading
+import urllib.request
+import pytest
+import utils
+import cache
+from cache import MemoryResultCache
+from main import check_compliance
+from server import make_server
+
+BAD_SCRIPT = os.path.join(os.path.dirname(__file__), "bad_example_script.py")
+
+@pytest.fixture
+def server():
+    srv = make_server(port=0)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def _post(srv, payload):
+    url = f"http://127.0.0.1:{srv.server_address[1]}/check_compliance"
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), method="POST")
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+def test_server_matches_direct_call_and_reuses_cache(server, monkeypatch):
+    expected = check_compliance(BAD_SCRIPT, "json")
+    assert _post(server, {"path": BAD_SCRIPT, "output_format": "json"})["result"] == expected
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged file should be served from memory")
+
+    monkeypatch.setattr(utils, "apply_compliance_rules_with_count", fail)
+    assert _post(server, {"path": BAD_SCRIPT, "output_format": "json"})["result"] == expected
+
+def test_server_rejects_unknown_fields(server):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _post(server, {"path": BAD_SCRIPT, "jobs": 8})
+    assert excinfo.value.code == 400
+
+@pytest.mark.parametrize("payload", [{"path": 5}, {"path": BAD_SCRIPT, "changed_lines_only": "yes"}])
+def test_server_rejects_wrong_field_types(server, payload):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _post(server, payload)
+    assert excinfo.value.code == 400
+
+def test_server_closes_request_cache_connections(server, tmp_path, monkeypatch):
+    closed = []
+    close = cache.ResultCache.close
+    monkeypatch.setattr(cache.ResultCache, "close", lambda self: closed.append(self.path) or close(self))
+    server.cache_dir = str(tmp_path)
+    _post(server, {"path": BAD_SCRIPT, "output_format": "json"})
+    assert closed == [os.path.join(str(tmp_path), cache.CACHE_FILENAME)]
+
+def test_memory_cache_is_bounded_and_stat_keyed(tmp_path):
+    cache = MemoryResultCache(max_entries=2)
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\n")
+    stat_key = cache.stat_key(str(path))
+    cache.put("k1", [{"id": "R1", "message": "m", "line": 1, "file": "a.py"}], 0, file_path=str(path), stat_key=stat_key)
+    assert cache.get_by_stat(str(path), cache.stat_key(str(path))) == ([{"id": "R1", "message": "m", "line": 1}], 0)
+    path.write_text("x = 22\n")
+    assert cache.get_by_stat(str(path), cache.stat_key(str(path))) is None
+    cache.put("k2", [], 0)
+    cache.put("k3", [], 0)
+    assert cache.get("k1") is None and cache.get("k3") is not None
+
+def test_server_check_sources(server):
+    url = f"http://127.0.0.1:{server.server_address[1]}/check_sources"
+    with open(BAD_SCRIPT, encoding="utf-8") as f:
+        content = f.read()
+    payload = {"items": [{"path": "snippet.py", "content": content}]}
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), method="POST")
+    with urllib.request.urlopen(request) as response:
+        [result] = json.loads(response.read())["result"]
+    violations, _ = utils.check_file(BAD_SCRIPT)
+    assert result["path"] == "snippet.py"
+    assert [(v["id"], v["line"]) for v in result["violations"]] == [(v["id"], v["line"]) for v in violations]
+
+def test_save_during_check_is_not_served_stale(tmp_path, monkeypatch):
+    path = tmp_path / "mod.py"
+    path.write_text('print("a")\n')
+    apply_rules = utils._apply_rules
+
+    def save_mid_check(ctx, filetype, timeout):
+        result = apply_rules(ctx, filetype, timeout)
+        path.write_text("def BadName():\n    pass\n")  # the editor saves while the old content is checked
+        return result
+
+    memory_cache = MemoryResultCache()
+    monkeypatch.setattr(utils, "_apply_rules", save_mid_check)
+    stale, _ = utils.check_file(str(path), memory_cache=memory_cache)
+    assert "R001" in {v["id"] for v in stale}
+    monkeypatch.setattr(utils, "_apply_rules", apply_rules)
+    fresh, _ = utils.check_file(str(path), memory_cache=memory_cache)
+    assert {v["id"] for v in fresh} == {v["id"] for v in utils.check_file(str(path))[0]}
+    assert "R001" not in {v["id"] for v in fresh}
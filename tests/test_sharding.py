@@ -0,0 +1,102 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import shutil
+import pytest
+import main
+from baseline import BaselineIndex
+from budget import CheckBudget
+from main import check_compliance, check_shard, merge_reports
+from sharding import parse_shard, select_shard, shard_key
+
+HERE = os.path.dirname(__file__)
+ASSETS = ["bad_example_script.py", "good_example_script.py", "bad_example.java", "bad_config.xml", "good_config.xml"]
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    for i in range(4):
+        directory = root / f"pkg{i}"
+        directory.mkdir(parents=True)
+        for name in ASSETS:
+            shutil.copy(os.path.join(HERE, name), directory / name)
+    return str(root)
+
+def _run_shards(project, tmp_path, count):
+    partials = []
+    for index in range(1, count + 1):
+        sink = str(tmp_path / f"shard{index}.json.gz")
+        check_shard(project, f"{index}/{count}", sink)
+        partials.append(sink)
+    return partials
+
+@pytest.mark.parametrize("output_format", ["json", "summary", "markdown", "text"])
+def test_merged_shards_match_single_run(project, tmp_path, output_format):
+    partials = _run_shards(project, tmp_path, 3)
+    assert merge_reports(list(reversed(partials)), output_format) == check_compliance(project, output_format)
+
+def test_shards_are_disjoint_and_cover_every_file(project):
+    files = [os.path.join(project, f"pkg{i}", name) for i in range(4) for name in ASSETS]
+    picked = [file_path for index in range(1, 4) for _, file_path in select_shard(files, project, index, 3)]
+    assert sorted(picked) == sorted(files)
+
+def test_shard_key_is_relative_to_the_root(project):
+    assert shard_key(os.path.join(project, "pkg1", "bad_config.xml"), project) == "pkg1/bad_config.xml"
+
+@pytest.mark.parametrize("spec", ["0/3", "4/3", "1", "a/b", "1/0"])
+def test_invalid_shard_specs(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
+
+def test_merge_rejects_missing_or_repeated_shards(project, tmp_path):
+    first, second = _run_shards(project, tmp_path, 2)
+    with pytest.raises(ValueError, match="Missing shard"):
+        merge_reports([first])
+    with pytest.raises(ValueError, match="given twice"):
+        merge_reports([first, first, second])
+
+def test_cli_scans_a_directory_named_merge_and_merges_with_a_flag(project, tmp_path, monkeypatch, capsys):
+    merge_dir = tmp_path / "merge"
+    shutil.copytree(os.path.join(project, "pkg0"), merge_dir)
+    partials = _run_shards(str(merge_dir), tmp_path, 2)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["main.py", "merge", "--summary"])
+    main.main()
+    scanned = capsys.readouterr().out
+    monkeypatch.setattr(sys, "argv", ["main.py", "--merge", *partials, "--summary"])
+    main.main()
+    merged = capsys.readouterr().out
+    # Both print the same totals; only the timestamped report path may differ
+    assert merged.split("✅")[0] == scanned.split("✅")[0]
+    assert "Files checked: 5" in merged
+
+def test_shards_reject_violation_limits(project, tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match="violation limit"):
+        check_shard(project, "1/2", str(tmp_path / "s.json.gz"), budget=CheckBudget(max_violations=5))
+    monkeypatch.setattr(sys, "argv", ["main.py", project, "--shard", "1/2", "--max-violations", "5"])
+    with pytest.raises(SystemExit) as excinfo:
+        main.main()
+    assert excinfo.value.code == 2
+
+def test_shards_reject_baseline_recording(project, tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.bin"
+    with pytest.raises(ValueError, match="full run"):
+        check_shard(project, "1/2", str(tmp_path / "s.json.gz"), baseline=BaselineIndex.load(str(baseline), record=True))
+    argv = ["main.py", project, "--shard", "1/2", "--baseline", str(baseline), "--update-baseline"]
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as excinfo:
+        main.main()
+    assert excinfo.value.code == 2
+    assert not baseline.exists()
+
+@pytest.mark.parametrize("flags", [["--update-baseline"], ["--no-cache"], ["--cache-dir", "c"], ["--no-gitignore"],
+                                   ["--no-default-excludes"], ["--changed-lines-only"], ["--interval", "5"]])
+def test_merge_rejects_options_that_have_no_effect(project, tmp_path, monkeypatch, capsys, flags):
+    partials = _run_shards(project, tmp_path, 2)
+    monkeypatch.setattr(sys, "argv", ["main.py", "--merge", *partials, *flags])
+    with pytest.raises(SystemExit) as excinfo:
+        main.main()
+    assert excinfo.value.code == 2
+    assert f"--merge cannot be combined with {flags[0]}" in capsys.readouterr().err
@@ -0,0 +1,44 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import source_context
+from compliance_checker import apply_python_compliance_rules
+from source_context import SourceContext
+from utils import apply_compliance_rules_with_count
+
+def test_artifacts_are_computed_once(monkeypatch):
+    calls = []
+    real_parse = source_context.ast.parse
+
+    def counting_parse(text):
+        calls.append(text)
+        return real_parse(text)
+
+    monkeypatch.setattr(source_context.ast, "parse", counting_parse)
+    ctx = SourceContext(text="def f():\n    pass  # TODO: later\n")
+    apply_compliance_rules_with_count(ctx, "py")
+    assert ctx.tokens is ctx.tokens
+    assert len(calls) == 1
+
+def test_line_offsets():
+    ctx = SourceContext(text="ab\ncd\n\nx")
+    assert ctx.line_offsets == [0, 3, 6, 7]
+    assert ctx.text[ctx.line_offsets[3]] == "x"
+
+def test_raw_and_text_views(tmp_path):
+    path = tmp_path / "m.py"
+    path.write_bytes("s = 'é'\n".encode("utf-8"))
+    ctx = SourceContext(path=str(path))
+    assert ctx.text == "s = 'é'\n"
+    assert ctx.raw == path.read_bytes()
+
+def test_todo_comment_rule():
+    violations = apply_python_compliance_rules("x = 1  # TODO remove\ns = '# TODO not a comment'\n")
+    todos = [v for v in violations if v["id"] == "R005"]
+    assert [v["line"] for v in todos] == [1]
+
+def test_java_comments():
+    ctx = SourceContext(text="/** Doc */\nclass A { // note\n}", filetype="java")
+    assert ctx.comments == [(1, "/** Doc */"), (2, "// note")]
@@ -0,0 +1,48 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from cache import MemoryResultCache
+from main import check_sources
+from utils import check_file
+
+HERE = os.path.dirname(__file__)
+ASSETS = ["bad_example_script.py", "bad_example.java", "bad_config.xml", "good_example_script.py"]
+
+def _expected(name, virtual_path):
+    violations, function_count = check_file(os.path.join(HERE, name))
+    for v in violations:
+        v["file"] = virtual_path
+    return {"path": virtual_path, "violations": violations, "function_count": function_count}
+
+def _read(name):
+    with open(os.path.join(HERE, name), "rb") as f:
+        return f.read()
+
+@pytest.mark.parametrize("convert", [lambda b: b.decode("utf-8"), bytes, memoryview])
+def test_check_sources_matches_check_file(convert):
+    items = [(f"virtual/{name}", None, convert(_read(name))) for name in ASSETS]
+    assert check_sources(items) == [_expected(name, f"virtual/{name}") for name in ASSETS]
+
+def test_explicit_language_overrides_extension():
+    [result] = check_sources([("snippet", "py", _read("bad_example_script.py"))])
+    assert result == _expected("bad_example_script.py", "snippet")
+
+def test_parallel_batches_match_serial():
+    items = [(f"v{i}/{name}", None, _read(name)) for i in range(3) for name in ASSETS]
+    assert check_sources(items, jobs=2, batch_size=5) == check_sources(items)
+
+def test_memory_cache_is_reused(monkeypatch):
+    import utils
+
+    cache = MemoryResultCache()
+    items = [("a.py", None, _read("bad_example_script.py"))]
+    expected = check_sources(items, memory_cache=cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("repeated content should be served from memory")
+
+    monkeypatch.setattr(utils, "apply_compliance_rules_with_count", fail)
+    assert check_sources(items, memory_cache=cache) == expected
@@ -0,0 +1,63 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import types
+import traversal
+from traversal import IgnorePattern, TraversalOptions, iter_supported_files
+
+def _touch(root, rel, content="x = 1\n"):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+def _rel(root, paths):
+    return [os.path.relpath(p, root) for p in paths]
+
+def test_default_excludes_are_pruned(tmp_path, monkeypatch):
+    _touch(tmp_path, "src/app.py")
+    _touch(tmp_path, "node_modules/pkg/index.py")
+    _touch(tmp_path, "target/classes/A.java")
+    _touch(tmp_path, ".git/hooks/hook.py")
+
+    scanned = []
+    real_scandir = os.scandir
+
+    def spy(path):
+        scanned.append(os.path.relpath(path, tmp_path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(traversal.os, "scandir", spy)
+    assert _rel(tmp_path, iter_supported_files(str(tmp_path))) == ["src/app.py"]
+    assert sorted(scanned) == [".", "src"]
+
+def test_gitignore_and_exclude_patterns(tmp_path):
+    _touch(tmp_path, ".gitignore", "gen/\n*.xml\n!keep.xml\n")
+    _touch(tmp_path, "a.py")
+    _touch(tmp_path, "drop.xml", "<a/>")
+    _touch(tmp_path, "keep.xml", "<a/>")
+    _touch(tmp_path, "gen/b.py")
+    _touch(tmp_path, "pkg/c.py")
+    _touch(tmp_path, "pkg/legacy/d.py")
+    _touch(tmp_path, "pkg/.gitignore", "legacy/\n")
+
+    files = iter_supported_files(str(tmp_path), options=TraversalOptions(exclude=("/a.py",)))
+    assert isinstance(files, types.GeneratorType)
+    assert _rel(tmp_path, files) == ["keep.xml", "pkg/c.py"]
+
+    no_gitignore = TraversalOptions(use_gitignore=False)
+    assert "gen/b.py" in _rel(tmp_path, iter_supported_files(str(tmp_path), options=no_gitignore))
+
+def test_max_file_size(tmp_path):
+    _touch(tmp_path, "small.py", "x = 1\n")
+    _touch(tmp_path, "big.py", "x = 1\n" * 100)
+    files = iter_supported_files(str(tmp_path), options=TraversalOptions(max_file_size=100))
+    assert _rel(tmp_path, files) == ["small.py"]
+
+def test_ignore_pattern_globs():
+    assert IgnorePattern("**/gen/*.py").matches("a/b/gen/x.py", "x.py", False)
+    assert not IgnorePattern("/gen/*.py").matches("a/gen/x.py", "x.py", False)
+    assert IgnorePattern("build/").matches("x/build", "build", True)
+    assert not IgnorePattern("build/").matches("x/build", "build", False)
@@ -0,0 +1,78 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import tracemalloc
+from io import StringIO
+from main import check_compliance
+from violation_store import ViolationStore
+
+TESTS_DIR = os.path.dirname(__file__)
+
+VIOLATIONS = [
+    {"id": "R001", "message": "Avoid using print statements.", "line": 3, "file": "a.py"},
+    {"id": "R006", "message": "Function 'f' is missing a docstring.", "line": 1, "file": "a.py"},
+    {"id": "R001", "message": "Avoid using print statements.", "line": 9, "file": "b.py"},
+    {"id": "XML_SYNTAX", "message": "XML ParseError", "line": 2, "file": "c.xml", "column": 4},
+]
+
+def test_round_trip_preserves_order_keys_and_extras():
+    store = ViolationStore(VIOLATIONS)
+    assert len(store) == 4
+    assert store.to_dicts() == VIOLATIONS
+    assert [list(v) for v in store] == [list(v) for v in VIOLATIONS]
+    assert store[-1] == VIOLATIONS[-1]
+    assert next(store.rows()) == ("R001", "Avoid using print statements.", 3, "a.py")
+
+    untagged = ViolationStore()
+    untagged.extend([{"id": "R002", "message": "m", "line": 0}])
+    untagged.extend([{"id": "R002", "message": "m", "line": 0}], file="x.py")
+    assert untagged.to_dicts() == [{"id": "R002", "message": "m", "line": 0},
+                                   {"id": "R002", "message": "m", "line": 0, "file": "x.py"}]
+
+def test_extras_are_kept_on_short_dicts():
+    store = ViolationStore()
+    store.extend([{"id": "X", "message": "m", "file": "a.py", "extra": 1}, {"id": "Y", "message": "m", "hint": "h"}])
+    assert store.to_dicts() == [{"id": "X", "message": "m", "line": 0, "file": "a.py", "extra": 1},
+                                {"id": "Y", "message": "m", "line": 0, "hint": "h"}]
+
+def test_filter_group_and_count():
+    store = ViolationStore(VIOLATIONS)
+    assert [v["line"] for v in store.filter(rule_ids={"R001"})] == [3, 9]
+    assert [v["id"] for v in store.filter(files=["a.py"], predicate=lambda r, m, line, f: line > 1)] == ["R001"]
+    assert len(store.filter(rule_ids={"missing"})) == 0
+    groups = store.group_by("file")
+    assert list(groups) == ["a.py", "b.py", "c.xml"]
+    assert groups["c.xml"].to_dicts() == [VIOLATIONS[-1]]
+    assert store.counts("id") == {"R001": 2, "R006": 1, "XML_SYNTAX": 1}
+
+def test_write_json_matches_json_dumps():
+    for violations in (VIOLATIONS, []):
+        buffer = StringIO()
+        ViolationStore(violations).write_json(buffer)
+        assert buffer.getvalue() == json.dumps(violations, indent=2)
+
+def test_check_compliance_store_matches_json():
+    store = check_compliance(TESTS_DIR, "store")
+    assert isinstance(store, ViolationStore)
+    assert store.to_dicts() == check_compliance(TESTS_DIR, "json")
+
+def test_store_is_smaller_than_dicts():
+    violations = [
+        {"id": "R001", "message": "Avoid using print statements.", "line": i, "file": f"src/module_{i % 50}.py"}
+        for i in range(20000)
+    ]
+    tracemalloc.start()
+    try:
+        store = ViolationStore(violations)
+        store_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        copies = [dict(v) for v in violations]
+        dict_bytes = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    assert len(store) == len(copies)
+    assert store_bytes * 4 < dict_bytes
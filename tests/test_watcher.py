@@ -0,0 +1,47 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import utils
+import pytest
+import main
+from watcher import ComplianceWatcher
+
+def test_poll_rechecks_only_changed_files(tmp_path, monkeypatch):
+    a = tmp_path / "a.py"
+    b = tmp_path / "b.py"
+    a.write_text("def BadA():\n    pass\n")
+    b.write_text("def BadB():\n    pass\n")
+
+    watcher = ComplianceWatcher(str(tmp_path))
+    first = watcher.poll()
+    assert set(first) == {str(a), str(b)}
+    assert watcher.poll() == {}
+
+    checked = []
+    real = utils.apply_compliance_rules_with_count
+
+    def spy(code, filetype="py"):
+        checked.append(code.path)
+        return real(code, filetype)
+
+    monkeypatch.setattr(utils, "apply_compliance_rules_with_count", spy)
+    a.write_text('def good_a():\n    """Doc."""\n\n\nif __name__ == "__main__":\n    good_a()\n')
+    changes = watcher.poll()
+    assert checked == [str(a)]
+    assert changes == {str(a): []}
+    assert watcher.violations[str(b)]
+
+    b.unlink()
+    assert watcher.poll() == {str(b): None}
+    assert set(watcher.violations) == {str(a)}
+
+@pytest.mark.parametrize("flags", [["--json"], ["--jobs", "4"], ["--sort", "line"], ["--max-violations", "3"]])
+def test_watch_rejects_report_flags(tmp_path, monkeypatch, capsys, flags):
+    monkeypatch.setattr(main, "watch_compliance", lambda *a, **k: pytest.fail("watch should not start"))
+    monkeypatch.setattr(sys, "argv", ["main.py", str(tmp_path), "--watch", *flags])
+    with pytest.raises(SystemExit) as excinfo:
+        main.main()
+    assert excinfo.value.code == 2
+    assert "--watch cannot be combined with" in capsys.readouterr().err
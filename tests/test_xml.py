@@ -0,0 +1,60 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from compliance_checker import apply_xml_compliance_rules, apply_xml_compliance_rules_stream
+from config.xml_guidelines import xml_rule_has_project_metadata
+from xml_stream import iter_text_chunks
+
+POM = """<?xml version="1.0"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <name>demo</name>
+  <dependencies>
+    <dependency>
+      <groupId>org.example</groupId>
+      <artifactId>lib</artifactId>
+      <version>1.0</version>
+    </dependency>
+    <dependency>
+      <groupId>org.example</groupId>
+      <artifactId>lib</artifactId>
+      <version>2.0-SNAPSHOT</version>
+    </dependency>
+  </dependencies>
+</project>
+"""
+
+def test_pom_rules_report_line_numbers():
+    violations = apply_xml_compliance_rules(POM)
+    found = {(v["id"], v["line"], v["message"]) for v in violations}
+    assert ("xml_rule_no_duplicate_dependencies", 10, "Duplicate dependency: org.example:lib") in found
+    assert ("xml_rule_no_snapshot_versions", 10, "Dependency uses SNAPSHOT version: 2.0-SNAPSHOT") in found
+    assert ("xml_rule_has_project_metadata", 2, "Missing <url> tag in project metadata.") in found
+    assert not any("<name>" in v["message"] for v in violations)
+
+def test_results_independent_of_chunk_size():
+    expected = apply_xml_compliance_rules(POM)
+    for size in (1, 7, 64):
+        assert apply_xml_compliance_rules_stream(iter_text_chunks(POM, size)) == expected
+
+def test_namespaced_pom_gets_metadata_checks():
+    # Real POMs declare the Maven namespace; elements are matched by local name
+    pom = (
+        '<project xmlns="http://maven.apache.org/POM/4.0.0"\n'
+        '         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n'
+        "  <name>app</name>\n"
+        "  <description>An app</description>\n"
+        "</project>\n"
+    )
+    assert xml_rule_has_project_metadata(pom) == [(1, "Missing <url> tag in project metadata.")]
+    complete = pom.replace("</project>", "  <url>https://example.com</url>\n</project>")
+    assert xml_rule_has_project_metadata(complete) == []
+
+def test_non_maven_xml_skips_metadata():
+    assert xml_rule_has_project_metadata("<config><entry/></config>") == []
+
+def test_syntax_error_has_line_number():
+    violations = apply_xml_compliance_rules("<a>\n<b>\n</a>")
+    assert len(violations) == 1
+    assert violations[0]["id"] == "XML_SYNTAX" and violations[0]["line"] == 3
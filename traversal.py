@@ -0,0 +1,188 @@
+"""
+File name: traversal.py
+
+Description: Fast, lazy discovery of files to check.
+Directories are walked with os.scandir in sorted order, and excluded directories
+(dependency, build and VCS trees by default, plus .gitignore and --exclude
+patterns) are pruned before they are entered. Paths are yielded as they are
+found, so checking can start while discovery is still running.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterator
+
+SUPPORTED_EXTENSIONS = (".py", ".java", ".xml")
+
+DEFAULT_EXCLUDES = (
+    ".git/", ".hg/", ".svn/",
+    "node_modules/", "target/", "build/", "dist/",
+    "venv/", ".venv/", ".tox/", ".nox/", "__pycache__/",
+    ".mypy_cache/", ".pytest_cache/", ".ruff_cache/",
+    "generated-sources/", "generated-test-sources/",
+)
+
+@dataclass(frozen=True)
+class TraversalOptions:
+    """
+    exclude: extra gitignore-style patterns, relative to the scanned path.
+    max_file_size: skip files larger than this many bytes (None = no limit).
+    use_gitignore: honour .gitignore files found while walking.
+    default_excludes: patterns pruned unless overridden (see DEFAULT_EXCLUDES).
+    """
+    exclude: tuple[str, ...] = ()
+    max_file_size: int | None = None
+    use_gitignore: bool = True
+    default_excludes: tuple[str, ...] = DEFAULT_EXCLUDES
+
+class IgnorePattern:
+    """
+    One gitignore-style pattern: `*`, `?`, `[...]` and `**` globs, leading `!` to
+    re-include, trailing `/` for directories only, and patterns containing a `/`
+    anchored to the directory that defines them.
+    """
+
+    def __init__(self, pattern: str):
+        self.negate = pattern.startswith("!")
+        if self.negate:
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        self.anchored = "/" in pattern
+        self.regex = re.compile(_glob_to_regex(pattern.lstrip("/")))
+
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        return bool(self.regex.fullmatch(rel_path if self.anchored else name))
+
+def _glob_to_regex(pattern: str) -> str:
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+def parse_ignore_lines(lines) -> list[IgnorePattern]:
+    patterns = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip()
+        if line and not line.startswith("#"):
+            patterns.append(IgnorePattern(line))
+    return patterns
+
+def _read_gitignore(dir_path: str) -> list[IgnorePattern]:
+    try:
+        with open(os.path.join(dir_path, ".gitignore"), "r", encoding="utf-8") as f:
+            return parse_ignore_lines(f)
+    except (OSError, UnicodeDecodeError):
+        return []
+
+def _prefix(dir_path: str) -> str:
+    # Walked paths are built by joining onto their parent, so a prefix slice gives the relative path
+    return dir_path if dir_path.endswith(os.sep) else dir_path + os.sep
+
+def _is_ignored(rule_sets: list[tuple[str, list[IgnorePattern]]], path: str, name: str, is_dir: bool) -> bool:
+    """
+    Evaluate every active pattern set from the root down; the last match wins.
+    """
+    ignored = False
+    for prefix, patterns in rule_sets:
+        rel_path = path[len(prefix):].replace(os.sep, "/")
+        for pattern in patterns:
+            if pattern.negate == ignored and pattern.matches(rel_path, name, is_dir):
+                ignored = not pattern.negate
+    return ignored
+
+def is_ignored_path(patterns: list[IgnorePattern], rel_path: str) -> bool:
+    """
+    Whether the "/"-separated file `rel_path` or one of its parent directories matches `patterns`,
+    for paths that are not walked on disk (such as archive members).
+    """
+    parts = rel_path.strip("/").split("/")
+    rule_sets = [("", patterns)]
+    for depth in range(1, len(parts) + 1):
+        is_dir = depth < len(parts)
+        if _is_ignored(rule_sets, "/".join(parts[:depth]), parts[depth - 1], is_dir):
+            return True
+    return False
+
+def iter_supported_files(
+    path: str,
+    extensions: tuple[str, ...] = SUPPORTED_EXTENSIONS,
+    options: TraversalOptions | None = None,
+) -> Iterator[str]:
+    """
+    Lazily yield supported files under `path` (or `path` itself if it is a file).
+    Within a directory, files come first and then subdirectories, each in name order.
+    Symlinked directories are not followed.
+    """
+    options = options if options is not None else TraversalOptions()
+
+    if os.path.isfile(path):
+        if path.endswith(extensions):
+            yield path
+        return
+    if not os.path.isdir(path):
+        return
+
+    root_patterns = parse_ignore_lines(list(options.default_excludes) + list(options.exclude))
+    stack = [(path, [(_prefix(path), root_patterns)] if root_patterns else [])]
+    while stack:
+        dir_path, rule_sets = stack.pop()
+        if options.use_gitignore:
+            gitignore = _read_gitignore(dir_path)
+            if gitignore:
+                rule_sets = rule_sets + [(_prefix(dir_path), gitignore)]
+
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if not is_dir and not entry.name.endswith(extensions):
+                    continue
+                if rule_sets and _is_ignored(rule_sets, entry.path, entry.name, is_dir):
+                    continue
+                if is_dir:
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    if options.max_file_size is not None and entry.stat().st_size > options.max_file_size:
+                        continue
+                    yield entry.path
+            except OSError:
+                continue  # broken symlink or entry removed while walking
+
+        for subdir in reversed(subdirs):
+            stack.append((subdir, rule_sets))
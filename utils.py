@@ -1,57 +1,296 @@
-from compliance_checker import (apply_python_compliance_rules,
-                                apply_java_compliance_rules,
-                                apply_xml_compliance_rules)
 import os
+import sys
+from functools import partial
+from io import StringIO
+from itertools import groupby, islice
 
-def print_violations(violations: list[dict]):
+from backends import get_backend
+from budget import TIMEOUT_ID, FileTimeout, time_limit, timeout_violation
+from cache import MemoryResultCache, get_cache, make_cache_key, make_file_cache_key
+from source_context import SourceContext, as_source_context
+from pipeline import iter_prefetched
+from traversal import SUPPORTED_EXTENSIONS, TraversalOptions, iter_supported_files
+
+SORT_KEYS = {
+    "line": lambda v: (v.get("line", 0), v["id"]),
+    "rule": lambda v: (v["id"], v.get("line", 0)),
+}
+
+def sort_within_files(violations, sort_by: str):
+    """
+    Sort each file's run of violations by `sort_by` ("line" or "rule").
+    Only one file's violations are held at a time, so the input must already be
+    grouped by file (as check_files produces it).
+    """
+    key = SORT_KEYS[sort_by]
+    for _, group in groupby(violations, key=lambda v: v.get("file")):
+        yield from sorted(group, key=key)
+
+def write_text_report(violations, sink) -> int:
+    """
+    Write violations to `sink` as text, with a header line per file.
+    Duplicates are dropped within a file; the seen set is reset for each file,
+    so memory stays bounded by the largest single file. Returns the rows written.
+    """
+    written = 0
+    current_file = None
     seen = set()
     for v in violations:
+        file_path = v.get("file")
+        if written == 0 or file_path != current_file:
+            current_file = file_path
+            seen = set()
+            if file_path is not None:
+                sink.write(f"{file_path}\n")
         key = (v["id"], v["message"], v.get("line", 0))
         if key in seen:
             continue
         seen.add(key)
         line_info = f"Line {v.get('line', '?')}"
-        print(f"- {v['id']} ({line_info}): {v['message']}")
-        
-def apply_compliance_rules_with_count(code: str, filetype: str = "py") -> tuple[list[dict], int]:
-    if filetype == "py":
-        violations = apply_python_compliance_rules(code)
-        function_count = code.count("def ")
-    elif filetype == "java":
-        violations = apply_java_compliance_rules(code)
-        function_count = code.count("void ") + code.count("public ") + code.count("private ")
-    elif filetype == "xml":
-        violations = apply_xml_compliance_rules(code)
-        function_count = 1
+        sink.write(f"- {v['id']} ({line_info}): {v['message']}\n")
+        written += 1
+    return written
+
+def print_violations(violations, file=None):
+    write_text_report(violations, file if file is not None else sys.stdout)
+
+
+def apply_compliance_rules_with_count(code: str | SourceContext, filetype: str = "py") -> tuple[list[dict], int]:
+    """
+    Run the backend for `filetype` (imported on first use) and return (violations, function_count).
+    """
+    ctx = as_source_context(code, filetype)
+    backend = get_backend(filetype)
+    if backend is None:
+        return [{"id": "UNSUPPORTED", "message": f"Unsupported file type: {filetype}", "line": 0}], 0
+    return backend(ctx)
+
+def _apply_rules(ctx: SourceContext, filetype: str, timeout: float | None) -> tuple[list[dict], int]:
+    if timeout is None:
+        return apply_compliance_rules_with_count(ctx, filetype)
+    try:
+        with time_limit(timeout):
+            return apply_compliance_rules_with_count(ctx, filetype)
+    except FileTimeout:
+        return [timeout_violation(timeout)], 0
+
+def _timed_out(result: tuple[list[dict], int]) -> bool:
+    violations = result[0]
+    return len(violations) == 1 and violations[0]["id"] == TIMEOUT_ID
+
+def check_file(
+    file_path: str,
+    cache_dir: str | None = None,
+    memory_cache: MemoryResultCache | None = None,
+    raw: bytes | None = None,
+    timeout: float | None = None,
+) -> tuple[list[dict], int]:
+    """
+    Read and check a single file. Violations are tagged with the file path.
+    When `cache_dir` is given, results for unchanged content are served from the cache.
+    A `memory_cache` (used by the server) is consulted first, by file stat and then content.
+    `raw` is the file's content if a reader already fetched it.
+    With `timeout`, rule evaluation that runs longer yields a single TIMEOUT violation, which is not cached.
+    """
+    _, ext = os.path.splitext(file_path)
+    filetype = ext[1:]  # e.g. "py", "java", "xml"
+    ctx = SourceContext(raw=raw, path=file_path, filetype=filetype)
+
+    stat_key = None
+    if memory_cache is not None and raw is None:
+        # Stat before reading: a save mid-check must not map the new stat to the old content's result
+        stat_key = memory_cache.stat_key(file_path)
+    result = memory_cache.get_by_stat(file_path, stat_key) if memory_cache is not None else None
+    if result is None and cache_dir is None and memory_cache is None:
+        result = _apply_rules(ctx, filetype, timeout)
+    elif result is None:
+        if filetype == "xml":
+            # XML is streamed from disk in chunks, so large documents never sit in memory
+            key = make_file_cache_key(file_path, filetype)
+        else:
+            key = make_cache_key(ctx.raw, filetype)
+        if memory_cache is not None:
+            result = memory_cache.get(key)
+        if result is None and cache_dir is not None:
+            result = get_cache(cache_dir).get(key)
+        if result is None:
+            result = _apply_rules(ctx, filetype, timeout)
+            # An incomplete (timed out) result is never cached
+            if cache_dir is not None and not _timed_out(result):
+                get_cache(cache_dir).put(key, *result)
+        if memory_cache is not None and not _timed_out(result):
+            memory_cache.put(key, *result, file_path=file_path, stat_key=stat_key)
+
+    violations, function_count = result
+    for v in violations:
+        v["file"] = file_path
+    return violations, function_count
+
+def check_source(
+    virtual_path: str,
+    language: str | None,
+    content: str | bytes | memoryview,
+    memory_cache: MemoryResultCache | None = None,
+    cache_dir: str | None = None,
+    timeout: float | None = None,
+) -> tuple[list[dict], int]:
+    """
+    Check in-memory `content` as if it were the file `virtual_path`; nothing is read from disk.
+    `language` is "py", "java" or "xml", or None to infer it from the path's extension.
+    `cache_dir` and `timeout` work as in check_file; results are keyed by content.
+    """
+    filetype = language or os.path.splitext(virtual_path)[1][1:]
+    if isinstance(content, str):
+        ctx = SourceContext(text=content, path=virtual_path, filetype=filetype)
+    else:
+        ctx = SourceContext(raw=bytes(content), path=virtual_path, filetype=filetype)
+
+    if memory_cache is None and cache_dir is None:
+        violations, function_count = _apply_rules(ctx, filetype, timeout)
     else:
-        violations = [{"id": "UNSUPPORTED", "message": f"Unsupported file type: {filetype}", "line": 0}]
-        function_count = 0
+        key = make_cache_key(ctx.raw, filetype)
+        result = memory_cache.get(key) if memory_cache is not None else None
+        if result is None and cache_dir is not None:
+            result = get_cache(cache_dir).get(key)
+        if result is None:
+            result = _apply_rules(ctx, filetype, timeout)
+            if not _timed_out(result):
+                if cache_dir is not None:
+                    get_cache(cache_dir).put(key, *result)
+                if memory_cache is not None:
+                    memory_cache.put(key, *result)
+        violations, function_count = result
 
+    for v in violations:
+        v["file"] = virtual_path
     return violations, function_count
 
-def gather_supported_files(path: str, extensions: tuple[str, ...] = (".py", ".java", ".xml")) -> list[str]:
-    files = []
-    if os.path.isfile(path) and path.endswith(extensions):
-        files.append(path)
-    elif os.path.isdir(path):
-        for root, _, filenames in os.walk(path):
-            for fname in filenames:
-                if fname.endswith(extensions):
-                    files.append(os.path.join(root, fname))
-    return files
-    
-def generate_markdown_report(violations: list[dict], py_files, total_functions: int) -> str:
-    md = f"# Internal Guidelines Compliance Report\n\n"
-    md += f"**Files checked:** {len(py_files)}\n\n"
-    md += f"**Functions checked:** {total_functions}\n\n"
-    md += f"**Violations found:** {len(violations)}\n\n"
-    
-    if not violations:
-        md += "✅ All checks passed. No violations found.\n"
-        return md
-
-    md += "| File | Line | Violation |\n"
-    md += "|------|------|-----------|\n"
+def _check_source_item(item, cache_dir: str | None = None, timeout: float | None = None) -> tuple[list[dict], int]:
+    return check_source(*item, cache_dir=cache_dir, timeout=timeout)
+
+def iter_check_sources(
+    items,
+    jobs: int = 1,
+    batch_size: int = 256,
+    memory_cache: MemoryResultCache | None = None,
+    cache_dir: str | None = None,
+    file_timeout: float | None = None,
+):
+    """
+    Yield (virtual_path, violations, function_count) for each (virtual_path, language, content)
+    item, in order. Items are consumed `batch_size` at a time; with jobs > 1 each batch is
+    spread across a process pool. `memory_cache` is only consulted in serial mode.
+    """
+    jobs = resolve_jobs(jobs)
+    items = iter(items)
+    if jobs == 1:
+        for virtual_path, language, content in items:
+            yield virtual_path, *check_source(virtual_path, language, content, memory_cache, cache_dir, file_timeout)
+        return
+
+    check = partial(_check_source_item, cache_dir=cache_dir, timeout=file_timeout)
+    from concurrent.futures import ProcessPoolExecutor  # deferred: only needed with --jobs
+
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        while batch := [
+            (path, language, content if isinstance(content, (str, bytes)) else bytes(content))
+            for path, language, content in islice(items, batch_size)
+        ]:
+            chunksize = max(1, len(batch) // (jobs * 4))
+            for (virtual_path, _, _), result in zip(batch, pool.map(check, batch, chunksize=chunksize)):
+                yield virtual_path, *result
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def resolve_jobs(jobs: int | None) -> int:
+    """
+    Normalize a --jobs value: 0 or None means one worker per CPU.
+    """
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+def check_files(
+    files,
+    jobs: int = 1,
+    cache_dir: str | None = None,
+    memory_cache: MemoryResultCache | None = None,
+    readers: int = 0,
+    file_timeout: float | None = None,
+):
+    """
+    Yield (file_path, violations, function_count) for each file, in the same order as `files`.
+    `files` may be a lazy iterable; in serial mode each file is checked as soon as it is yielded.
+    With jobs > 1 the files are spread across a process pool in chunks.
+    With readers > 0 (serial mode), that many threads prefetch file contents ahead of the checker.
+    An in-process `memory_cache` is only consulted in serial mode.
+    Closing the generator early cancels the files that have not been checked yet.
+    """
+    jobs = resolve_jobs(jobs)
+    if jobs == 1 and readers > 0:
+        for file_path, raw in iter_prefetched(files, readers):
+            yield file_path, *check_file(file_path, cache_dir, memory_cache, raw, file_timeout)
+        return
+    if jobs == 1:
+        for file_path in files:
+            yield file_path, *check_file(file_path, cache_dir, memory_cache, timeout=file_timeout)
+        return
+
+    files = list(files)
+    if len(files) < 2:
+        for file_path in files:
+            yield file_path, *check_file(file_path, cache_dir, memory_cache, timeout=file_timeout)
+        return
+
+    chunksize = max(1, len(files) // (jobs * 4))
+    from concurrent.futures import ProcessPoolExecutor  # deferred: only needed with --jobs
+
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        # Executor.map returns results in submission order, so the merged
+        # report is identical to a serial run.
+        check = partial(check_file, cache_dir=cache_dir, timeout=file_timeout)
+        results = pool.map(check, files, chunksize=chunksize)
+        for file_path, (violations, function_count) in zip(files, results):
+            yield file_path, violations, function_count
+    finally:
+        # On an early exit, drop the chunks that have not started
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def gather_supported_files(
+    path: str,
+    extensions: tuple[str, ...] = SUPPORTED_EXTENSIONS,
+    options: TraversalOptions | None = None,
+) -> list[str]:
+    return list(iter_supported_files(path, extensions, options))
+
+def write_markdown_header(sink, files_checked: int, total_functions: int, violation_count: int) -> None:
+    sink.write("# Internal Guidelines Compliance Report\n\n")
+    sink.write(f"**Files checked:** {files_checked}\n\n")
+    sink.write(f"**Functions checked:** {total_functions}\n\n")
+    sink.write(f"**Violations found:** {violation_count}\n\n")
+    if not violation_count:
+        sink.write("✅ All checks passed. No violations found.\n")
+        return
+    sink.write("| File | Line | Violation |\n")
+    sink.write("|------|------|-----------|\n")
+
+def write_markdown_rows(violations, sink) -> int:
+    """
+    Write one Markdown table row per violation. Returns the rows written.
+    """
+    written = 0
     for v in violations:
-        md += f"| {v.get('file', 'N/A')} | {v['line']} | {v['message']} |\n"
-    return md
\ No newline at end of file
+        sink.write(f"| {v.get('file', 'N/A')} | {v['line']} | {v['message']} |\n")
+        written += 1
+    return written
+
+def write_markdown_report(violations: list[dict], files_checked: int, total_functions: int, sink) -> None:
+    write_markdown_header(sink, files_checked, total_functions, len(violations))
+    write_markdown_rows(violations, sink)
+
+def generate_markdown_report(violations: list[dict], py_files, total_functions: int) -> str:
+    buffer = StringIO()
+    write_markdown_report(violations, len(py_files), total_functions, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,171 @@
+"""
+File name: violation_store.py
+
+Description: Compact, column-oriented storage for violations.
+Rule IDs, file paths and messages are interned into small tables and each
+violation is four integers in typed arrays, so a violation costs a few bytes
+instead of a dict, and a message repeated across thousands of lines is stored
+once. Violation dicts are only built when the store is iterated or serialized.
+"""
+
+import json
+from array import array
+
+FIELDS = ("id", "message", "line", "file")
+_FIELD_SET = frozenset(FIELDS)
+
+class _Interner:
+    """
+    Append-only table mapping each distinct value to a small integer.
+    """
+    __slots__ = ("values", "index")
+
+    def __init__(self):
+        self.values: list = []
+        self.index: dict = {}
+
+    def add(self, value) -> int:
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+class ViolationStore:
+    """
+    Column store of violations in insertion order. Stores derived by filter() and
+    group_by() share the interned tables of the store they came from.
+    """
+
+    def __init__(self, violations=None, _tables=None):
+        self._rules, self._messages, self._files = _tables or (_Interner(), _Interner(), _Interner())
+        self._rule_col = array("I")
+        self._message_col = array("I")
+        self._line_col = array("q")
+        self._file_col = array("I")
+        self._extras: dict[int, dict] = {}  # keys beyond FIELDS, by row
+        if violations is not None:
+            self.extend(violations)
+
+    def append(self, rule_id: str, message: str, line: int = 0, file: str | None = None, extras: dict | None = None) -> None:
+        if extras:
+            self._extras[len(self._rule_col)] = extras
+        self._rule_col.append(self._rules.add(rule_id))
+        self._message_col.append(self._messages.add(message))
+        self._line_col.append(line)
+        self._file_col.append(self._files.add(file))
+
+    def extend(self, violations, file: str | None = None) -> None:
+        """
+        Add violation dicts, tagging them with `file` when given (otherwise their own "file" key).
+        """
+        for v in violations:
+            extras = {k: val for k, val in v.items() if k not in FIELDS} if not v.keys() <= _FIELD_SET else None
+            self.append(v["id"], v["message"], v.get("line", 0), file if file is not None else v.get("file"), extras)
+
+    def __len__(self) -> int:
+        return len(self._rule_col)
+
+    def rows(self):
+        """
+        Yield (rule_id, message, line, file) tuples without building dicts.
+        """
+        rules, messages, files = self._rules.values, self._messages.values, self._files.values
+        for r, m, line, f in zip(self._rule_col, self._message_col, self._line_col, self._file_col):
+            yield rules[r], messages[m], line, files[f]
+
+    def _dict(self, i: int, rule_id: str, message: str, line: int, file: str | None) -> dict:
+        v = {"id": rule_id, "message": message, "line": line}
+        if file is not None:
+            v["file"] = file
+        if i in self._extras:
+            v.update(self._extras[i])
+        return v
+
+    def __iter__(self):
+        for i, row in enumerate(self.rows()):
+            yield self._dict(i, *row)
+
+    def __getitem__(self, i: int) -> dict:
+        if i < 0:
+            i += len(self)
+        return self._dict(
+            i,
+            self._rules.values[self._rule_col[i]],
+            self._messages.values[self._message_col[i]],
+            self._line_col[i],
+            self._files.values[self._file_col[i]],
+        )
+
+    def to_dicts(self) -> list[dict]:
+        return list(self)
+
+    def _take(self, indices) -> "ViolationStore":
+        store = ViolationStore(_tables=(self._rules, self._messages, self._files))
+        for i in indices:
+            store._rule_col.append(self._rule_col[i])
+            store._message_col.append(self._message_col[i])
+            store._line_col.append(self._line_col[i])
+            store._file_col.append(self._file_col[i])
+            if i in self._extras:
+                store._extras[len(store) - 1] = self._extras[i]
+        return store
+
+    def _column(self, field: str) -> tuple[array, list]:
+        if field == "id":
+            return self._rule_col, self._rules.values
+        if field == "file":
+            return self._file_col, self._files.values
+        raise ValueError(f"Cannot group or count by {field!r}; use 'id' or 'file'")
+
+    def filter(self, rule_ids=None, files=None, predicate=None) -> "ViolationStore":
+        """
+        Violations whose rule is in `rule_ids` and file is in `files` (either may be None for any),
+        and for which `predicate(rule_id, message, line, file)` is true if given.
+        Rule and file tests compare interned integers.
+        """
+        rule_keep = None if rule_ids is None else {self._rules.index[r] for r in rule_ids if r in self._rules.index}
+        file_keep = None if files is None else {self._files.index[f] for f in files if f in self._files.index}
+        rule_col, file_col = self._rule_col, self._file_col
+        indices = [
+            i for i, row in enumerate(self.rows())
+            if (rule_keep is None or rule_col[i] in rule_keep)
+            and (file_keep is None or file_col[i] in file_keep)
+            and (predicate is None or predicate(*row))
+        ]
+        return self._take(indices)
+
+    def group_by(self, field: str = "file") -> dict:
+        """
+        {rule id or file: ViolationStore}, in order of first appearance.
+        """
+        column, values = self._column(field)
+        groups: dict[int, list[int]] = {}
+        for i, key in enumerate(column):
+            groups.setdefault(key, []).append(i)
+        return {values[key]: self._take(indices) for key, indices in groups.items()}
+
+    def counts(self, field: str = "id") -> dict:
+        """
+        {rule id or file: number of violations}, in order of first appearance.
+        """
+        column, values = self._column(field)
+        counts: dict[int, int] = {}
+        for key in column:
+            counts[key] = counts.get(key, 0) + 1
+        return {values[key]: n for key, n in counts.items()}
+
+    def write_json(self, sink, indent: int = 2) -> None:
+        """
+        Write the violations as a JSON array, byte-identical to json.dump(list(store), sink, indent=indent),
+        building one dict at a time.
+        """
+        if not len(self):
+            sink.write("[]")
+            return
+        pad = " " * indent
+        sink.write("[")
+        for i, v in enumerate(self):
+            sink.write("\n" if i == 0 else ",\n")
+            sink.write(pad + json.dumps(v, indent=indent).replace("\n", "\n" + pad))
+        sink.write("\n]")
@@ -0,0 +1,103 @@
+"""
+File name: watcher.py
+
+Description: Watch mode for developer workstations.
+After one full scan, the watched tree is polled with os.stat and only files that
+were added or modified are re-checked. An in-memory index keeps the current
+violations of every file, so each poll reports just the changed diagnostics.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+from traversal import TraversalOptions
+from utils import check_file, gather_supported_files, write_text_report
+
+class ComplianceWatcher:
+    """
+    Incremental per-file violation index for one path.
+    """
+
+    def __init__(self, path: str, cache_dir: str | None = None, traversal: TraversalOptions | None = None):
+        self.path = path
+        self.cache_dir = cache_dir
+        self.traversal = traversal
+        self.stats: dict[str, tuple[int, int]] = {}
+        self.violations: dict[str, list[dict]] = {}
+
+    def _current_stats(self) -> dict[str, tuple[int, int]]:
+        stats = {}
+        for file_path in gather_supported_files(self.path, options=self.traversal):
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue  # removed between listing and stat
+            stats[file_path] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    def poll(self) -> dict[str, list[dict] | None]:
+        """
+        Re-check files added or modified since the last poll (every file on the first call).
+        Returns {file: violations} for changed files, with None for removed files.
+        """
+        current = self._current_stats()
+        changes = {}
+
+        for file_path in self.stats.keys() - current.keys():
+            del self.violations[file_path]
+            changes[file_path] = None
+
+        for file_path, stat_key in current.items():
+            if self.stats.get(file_path) == stat_key:
+                continue
+            try:
+                violations, _ = check_file(file_path, self.cache_dir)
+            except (OSError, UnicodeDecodeError) as e:
+                violations = [{"id": "READ_ERROR", "message": f"Could not read file: {e}", "line": 0, "file": file_path}]
+            self.violations[file_path] = violations
+            changes[file_path] = violations
+
+        self.stats = current
+        return changes
+
+    def violation_count(self) -> int:
+        return sum(len(violations) for violations in self.violations.values())
+
+def write_changes(changes: dict[str, list[dict] | None], sink) -> None:
+    for file_path in sorted(changes):
+        violations = changes[file_path]
+        if violations is None:
+            sink.write(f"{file_path}\n- removed\n")
+        elif not write_text_report(violations, sink):
+            sink.write(f"{file_path}\n✅ No violations.\n")
+
+def watch_compliance(
+    path: str,
+    interval: float = 1.0,
+    cache_dir: str | None = None,
+    sink=None,
+    traversal: TraversalOptions | None = None,
+) -> None:
+    """
+    Run a full scan of `path`, then re-check and report changed files every `interval` seconds until interrupted.
+    """
+    sink = sink if sink is not None else sys.stdout
+    watcher = ComplianceWatcher(path, cache_dir, traversal)
+    write_changes(watcher.poll(), sink)
+
+    try:
+        while True:
+            sink.write(
+                f"[{datetime.now():%H:%M:%S}] {watcher.violation_count()} violations in "
+                f"{len(watcher.violations)} files. Watching for changes...\n"
+            )
+            sink.flush()
+            changes = {}
+            while not changes:
+                time.sleep(interval)
+                changes = watcher.poll()
+            write_changes(changes, sink)
+    except KeyboardInterrupt:
+        pass
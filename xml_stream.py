@@ -0,0 +1,124 @@
+"""
+File name: xml_stream.py
+
+Description: Streaming XML scanner for the XML rules.
+The document is fed to an expat pull parser chunk by chunk, so only the open
+element path and a bounded text buffer per open element are kept in memory.
+Rules receive start/end element events with real line numbers, plus each raw
+source line for formatting checks.
+"""
+
+from typing import Iterable
+from xml.parsers import expat
+
+CHUNK_SIZE = 64 * 1024
+MAX_TEXT_LENGTH = 4096  # element text kept per open element; longer text is truncated
+
+class XmlRule:
+    """
+    Base class for streaming XML rules. A new instance is created per document.
+    `path` is the list of local element names from the root to the current element.
+    """
+    id = ""
+    description = ""
+    triggers: tuple[bytes, ...] | None = None  # see prefilter.py
+
+    def start(self, path: list[str], attrs: dict, line: int) -> list[tuple[int, str]]:
+        return []
+
+    def end(self, path: list[str], text: str, line: int) -> list[tuple[int, str]]:
+        return []
+
+    def check_line(self, lineno: int, line: str) -> list[tuple[int, str]]:
+        return []
+
+    def finish(self) -> list[tuple[int, str]]:
+        return []
+
+def local_name(name: str) -> str:
+    # expat reports namespaced names as "uri}local" with namespace_separator="}"
+    return name.rpartition("}")[2]
+
+def _overrides(rule, method: str) -> bool:
+    return getattr(type(rule), method) is not getattr(XmlRule, method, None)
+
+def scan_xml(chunks: Iterable[str], rules: list[XmlRule]) -> list[list[tuple[int, str]]]:
+    """
+    Stream `chunks` of one XML document through `rules` in a single pass.
+    Returns the (line, message) results of each rule, in the order of `rules`.
+    Raises xml.parsers.expat.ExpatError if the document is not well-formed.
+    """
+    results = [[] for _ in rules]
+    # Only pay for element events and line splitting when some rule overrides them
+    element_rules = [
+        (rule, rule_results) for rule, rule_results in zip(rules, results)
+        if _overrides(rule, "start") or _overrides(rule, "end")
+    ]
+    line_rules = [(rule, rule_results) for rule, rule_results in zip(rules, results) if _overrides(rule, "check_line")]
+    parser = expat.ParserCreate(namespace_separator="}")
+    path = []
+    texts = []  # one [parts, length] buffer per open element
+
+    def start_element(name, attrs):
+        path.append(local_name(name))
+        texts.append([[], 0])
+        line = parser.CurrentLineNumber
+        for rule, rule_results in element_rules:
+            rule_results.extend(rule.start(path, attrs, line))
+
+    def end_element(name):
+        parts, _ = texts.pop()
+        text = "".join(parts)
+        line = parser.CurrentLineNumber
+        for rule, rule_results in element_rules:
+            rule_results.extend(rule.end(path, text, line))
+        path.pop()
+
+    def character_data(data):
+        if not texts:
+            return
+        buffer = texts[-1]
+        if buffer[1] < MAX_TEXT_LENGTH:
+            data = data[:MAX_TEXT_LENGTH - buffer[1]]
+            buffer[0].append(data)
+            buffer[1] += len(data)
+
+    if element_rules:
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = character_data
+
+    lineno = 0
+    pending = ""
+    for chunk in chunks:
+        parser.Parse(chunk, False)
+        if not line_rules:
+            continue
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            lineno += 1
+            for rule, rule_results in line_rules:
+                rule_results.extend(rule.check_line(lineno, line))
+    parser.Parse("", True)
+
+    if pending:
+        lineno += 1
+        for rule, rule_results in line_rules:
+            rule_results.extend(rule.check_line(lineno, pending))
+
+    for rule, rule_results in zip(rules, results):
+        rule_results.extend(rule.finish())
+    return results
+
+def iter_text_chunks(text: str, chunk_size: int = CHUNK_SIZE):
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+def iter_file_chunks(file_path: str, chunk_size: int = CHUNK_SIZE):
+    with open(file_path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk